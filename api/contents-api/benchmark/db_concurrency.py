@@ -0,0 +1,80 @@
+"""contents-api handler 의 DB 호출 방식별 동시성 benchmark.
+
+blocking repository(time.sleep 으로 MySQL round-trip 을 흉내)를 event loop 위에서 바로 부르는 경우와
+DBExecutor 로 넘기는 경우를 같은 동시 요청 수로 비교한다.
+
+    cd api/contents-api
+    poetry run python -m benchmark.db_concurrency --requests 200 --concurrency 50 --query-ms 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from contents.service.db_executor import DBExecutor
+
+
+class FakeRepository:
+    def __init__(self, query_seconds: float):
+        self.query_seconds = query_seconds
+
+    def get(self, **kwargs):
+        time.sleep(self.query_seconds)
+        return kwargs
+
+
+async def blocking_handler(repository: FakeRepository, db_executor: DBExecutor):
+    repository.get(case_id=1, user_id=1)
+    repository.get(session_id=1)
+
+
+async def offloaded_handler(repository: FakeRepository, db_executor: DBExecutor):
+    await db_executor.run(repository.get, case_id=1, user_id=1)
+    await db_executor.run(repository.get, session_id=1)
+
+
+async def measure(handler, repository, db_executor, requests: int, concurrency: int):
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_request():
+        async with slots:
+            await handler(repository, db_executor)
+        # 모든 요청이 동시에 도착했다고 보고, 도착 시점부터 응답까지의 latency 를 잰다.
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one_request() for _ in range(requests)])
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "total_s": elapsed,
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-ms", type=float, default=20)
+    parser.add_argument("--workers", type=int, default=10)
+    args = parser.parse_args()
+
+    repository = FakeRepository(args.query_ms / 1000)
+    db_executor = DBExecutor(max_workers=args.workers)
+    for name, handler in [("blocking", blocking_handler), ("db_executor", offloaded_handler)]:
+        result = asyncio.run(
+            measure(handler, repository, db_executor, args.requests, args.concurrency)
+        )
+        print(
+            f"{name:12s} total={result['total_s']:.2f}s rps={result['rps']:.1f} "
+            f"p50={result['p50_ms']:.1f}ms p99={result['p99_ms']:.1f}ms"
+        )
+    db_executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
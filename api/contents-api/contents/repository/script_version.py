@@ -0,0 +1,80 @@
+import json
+import os
+import re
+from datetime import datetime, timezone
+
+from botocore.exceptions import ClientError
+
+from object.exception import UploadFailed
+from object.repository.script import ScriptRepository
+
+SCRIPT_VERSION_PATTERN = re.compile(r"script_v(\d+)\.json$")
+MANIFEST_NAME = "script_versions.json"
+
+
+class ScriptVersionRepository:
+    """session 별 script 버전 manifest({env}/{case_id}/{session_id}/script_versions.json)를 읽고 쓴다.
+
+    last_version 은 한 번 발급하면 줄어들지 않으므로 현재 source_script_url 이 무엇이든 같은 object 이름을 다시 쓰지 않는다.
+    manifest 갱신은 session row lock 안에서만 한다.
+    """
+
+    def __init__(self, script_repository: ScriptRepository):
+        self.script_repository = script_repository
+
+    def prefix(self, case_id: int, session_id: int) -> str:
+        env = os.getenv("PHASE", "LOCAL")
+        return f"{env}/{case_id}/{session_id}"
+
+    def object_name(self, case_id: int, session_id: int, version: int) -> str:
+        return f"{self.prefix(case_id, session_id)}/script_v{version}.json"
+
+    def load(self, case_id: int, session_id: int) -> dict:
+        manifest_name = f"{self.prefix(case_id, session_id)}/{MANIFEST_NAME}"
+        try:
+            body = self.script_repository.get_json(manifest_name)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("NoSuchKey", "404"):
+                raise
+            body = None
+        if body:
+            return json.loads(body.read())
+        return self._seed(case_id, session_id)
+
+    def save(self, case_id: int, session_id: int, manifest: dict):
+        manifest_name = f"{self.prefix(case_id, session_id)}/{MANIFEST_NAME}"
+        if not self.script_repository.upload_json(json.dumps(manifest).encode("utf-8"), manifest_name):
+            raise UploadFailed(manifest_name)
+
+    def add_version(self, manifest: dict, version: int, script_url: str) -> dict:
+        manifest["versions"] = sorted(
+            [entry for entry in manifest["versions"] if entry["version"] != version]
+            + [{
+                "version": version,
+                "script_url": script_url,
+                "uploaded_at": datetime.now(timezone.utc).isoformat(),
+            }],
+            key=lambda entry: entry["version"],
+        )
+        manifest["last_version"] = max(manifest["last_version"], version)
+        return manifest
+
+    def _seed(self, case_id: int, session_id: int) -> dict:
+        # manifest 가 없는 기존 session 은 실제로 있는 script_v{n}.json object 로 시작한다.
+        # (예전 번호는 영상 object 까지 센 KeyCount 로 정해져서 중간이 비어 있을 수 있다)
+        object_list = self.script_repository.get_object_list(f"{self.prefix(case_id, session_id)}/")
+        versions = []
+        for item in object_list.get("Contents", []):
+            match = SCRIPT_VERSION_PATTERN.search(item["Key"])
+            if match:
+                uploaded_at = item.get("LastModified")
+                versions.append({
+                    "version": int(match.group(1)),
+                    "script_url": item["Key"],
+                    "uploaded_at": uploaded_at.isoformat() if uploaded_at else None,
+                })
+        versions.sort(key=lambda entry: entry["version"])
+        return {
+            "last_version": versions[-1]["version"] if versions else 0,
+            "versions": versions,
+        }
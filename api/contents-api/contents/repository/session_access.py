@@ -0,0 +1,67 @@
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, select, update
+
+from core.db.connection import ConnectionManager
+from core.model.entity.case import CaseEntity
+from core.model.entity.session import SessionEntity
+
+class SessionAccessRepository:
+    """case 소유권 확인과 session 조회/갱신을 한 번의 query 로 처리한다."""
+
+    def __init__(self, connection_manager: ConnectionManager):
+        self.connection_manager = connection_manager
+
+    def get_authorized(
+        self, case_id: int, session_id: int, user_id: int, db_session=None
+    ) -> Tuple[bool, Optional[SessionEntity]]:
+        # 사용자가 소유한 case 에 session 을 outer join 해서
+        # (case 존재 여부, session) 을 함께 돌려준다.
+        stmt = (
+            select(CaseEntity.id, SessionEntity)
+            .outerjoin(
+                SessionEntity,
+                and_(SessionEntity.case_id == CaseEntity.id, SessionEntity.id == session_id),
+            )
+            .where(CaseEntity.id == case_id, CaseEntity.user_id == user_id)
+        )
+        session = db_session or self.connection_manager.make_session()
+        try:
+            row = session.execute(stmt).first()
+        finally:
+            if db_session is None:
+                session.close()
+        if row is None:
+            return False, None
+        return True, row[1]
+
+    def update_fields(self, case_id: int, session_id: int, db_session=None, **values) -> bool:
+        # get + update 대신 UPDATE 한 번으로 갱신한다.
+        stmt = (
+            update(SessionEntity)
+            .where(SessionEntity.id == session_id, SessionEntity.case_id == case_id)
+            .values(**values)
+        )
+        session = db_session or self.connection_manager.make_session()
+        try:
+            result = session.execute(stmt)
+            if db_session is None:
+                session.commit()
+        except Exception:
+            if db_session is None:
+                session.rollback()
+            raise
+        finally:
+            if db_session is None:
+                session.close()
+        return result.rowcount > 0
+
+    def lock_session(self, case_id: int, session_id: int, db_session) -> bool:
+        # session row 를 SELECT ... FOR UPDATE 로 잠근다.
+        # 같은 session 의 script 버전 발급은 db_session 이 commit/rollback 될 때까지 기다린다.
+        stmt = (
+            select(SessionEntity.id)
+            .where(SessionEntity.id == session_id, SessionEntity.case_id == case_id)
+            .with_for_update()
+        )
+        return db_session.execute(stmt).first() is not None
@@ -0,0 +1,16 @@
+from dependency_injector.wiring import inject, Provide
+
+from fastapi import APIRouter, Depends
+
+from contents.container import Container
+from contents.service.cache import ContentCache
+
+router = APIRouter()
+
+
+@router.get("/cache", tags=["Get"])
+@inject
+async def get_cache(
+    content_cache: ContentCache = Depends(Provide[Container.content_cache]),
+):
+    return content_cache.stats()
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, UploadFile, File
 from fastapi.security import OAuth2PasswordBearer
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, JSONResponse, RedirectResponse
 from dependency_injector.wiring import inject, Provide
 
 from contents.container import Container
@@ -24,6 +24,16 @@ async def download_script(
     security_service: SecurityService = Depends(Provide[Container.security_service]),
 ):
     payload = security_service.verify_token(token)
+
+    # presigned url 로 S3 에서 직접 받게 해서 API pod 를 거치지 않게 한다.
+    if script_manager_service.download_mode != "proxy":
+        download_url = await script_manager_service.get_download_url(
+            case_id=case_id, session_id=session_id, user_id=payload.get("user_id")
+        )
+        if script_manager_service.download_mode == "redirect":
+            return RedirectResponse(download_url, status_code=307)
+        return JSONResponse(status_code=200, content={"url": download_url})
+
     script = await script_manager_service.download_script(
         case_id=case_id, session_id=session_id, user_id=payload.get("user_id")
     )
@@ -51,3 +61,27 @@ async def upload_script(
         session_id=session_id,
     )
     return {"msg": "script upload success!"}
+
+
+# 3. script version history
+@router.get("/case/{case_id}/session/{session_id}/script/versions", tags=["script"])
+@inject
+async def get_script_versions(
+    case_id: int,
+    session_id: int,
+    page: int = 1,
+    size: int = 20,
+    token: str = Depends(oauth2_scheme),
+    script_manager_service: ScriptManagerService = Depends(
+        Provide[Container.script_manager_service]
+    ),
+    security_service: SecurityService = Depends(Provide[Container.security_service]),
+):
+    payload = security_service.verify_token(token)
+    return await script_manager_service.get_script_versions(
+        case_id=case_id,
+        session_id=session_id,
+        user_id=payload.get("user_id"),
+        page=page,
+        size=size,
+    )
@@ -1,11 +1,12 @@
 from io import BytesIO
-from fastapi import APIRouter, Depends, File, UploadFile, BackgroundTasks
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi import APIRouter, Depends, File, UploadFile, BackgroundTasks, Header
+from fastapi.responses import StreamingResponse, JSONResponse, RedirectResponse, Response
 from fastapi.security import OAuth2PasswordBearer
 from dependency_injector.wiring import inject, Provide
 
 from contents.container import Container
 from contents.service.video import VideoManagerService
+from object.exception import RangeNotSatisfiable
 from core.service.security import SecurityService
 
 router = APIRouter()
@@ -18,6 +19,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/api/signin")
 async def download_video(
     case_id: int,
     session_id: int,
+    range: str = Header(None),
     token: str = Depends(oauth2_scheme),
     video_manager_service: VideoManagerService = Depends(
         Provide[Container.video_manager_service]
@@ -25,8 +27,41 @@ async def download_video(
     security_service: SecurityService = Depends(Provide[Container.security_service]),
 ):
     payload = security_service.verify_token(token)
-    streaming_body = await video_manager_service.download_video(case_id=case_id, session_id=session_id, user_id=payload.get("user_id"))
-    return StreamingResponse(streaming_body, media_type="video/mp4")
+
+    # 대용량 전송은 presigned url 로 S3 에서 직접 받게 해서 API pod 를 거치지 않게 한다.
+    if video_manager_service.download_mode != "proxy":
+        download_url = await video_manager_service.get_download_url(
+            case_id=case_id, session_id=session_id, user_id=payload.get("user_id")
+        )
+        if video_manager_service.download_mode == "redirect":
+            return RedirectResponse(download_url, status_code=307)
+        return JSONResponse(status_code=200, content={"url": download_url})
+
+    try:
+        video = await video_manager_service.download_video(
+            case_id=case_id,
+            session_id=session_id,
+            user_id=payload.get("user_id"),
+            range_header=range,
+        )
+    except RangeNotSatisfiable as e:
+        return Response(
+            status_code=416,
+            headers={"Content-Range": f"bytes */{e.object_size}", "Accept-Ranges": "bytes"},
+        )
+
+    # Range 요청이면 S3 의 Content-Range 를 그대로 넘겨 206 으로 응답한다.
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(video["ContentLength"])}
+    status_code = 200
+    if video.get("ContentRange"):
+        headers["Content-Range"] = video["ContentRange"]
+        status_code = 206
+    return StreamingResponse(
+        video["Body"].iter_chunks(chunk_size=video_manager_service.stream_chunk_size),
+        status_code=status_code,
+        media_type="video/mp4",
+        headers=headers,
+    )
 
 
 # 2. origin video upload (s3로 바로 upload -> JSON response 201)
@@ -45,6 +80,17 @@ async def upload_video(
 ):
     payload = security_service.verify_token(token)
 
+    if video_manager_service.upload_mode == "stream":
+        # 요청 안에서 multipart 로 흘려 올린다. (UploadFile 은 응답 후 닫히므로 background 로 넘기지 않는다)
+        await video_manager_service.upload_video_stream(
+            case_id=case_id,
+            session_id=session_id,
+            user_id=payload.get("user_id"),
+            file=file,
+            filename=file.filename,
+        )
+        return JSONResponse(status_code=201, content={"msg": "s3 upload success!"})
+
     file_contents = await file.read()
     file_obj = BytesIO(file_contents)  # 메모리에 파일을 저장하는 BytesIO 객체 생성
 
@@ -59,7 +105,27 @@ async def upload_video(
 
     return JSONResponse(status_code=201, content={"msg": "s3 upload start!"})
 
-# 3. presigned url 생성 (s3에 파일 업로드할 수 있는 url 생성)
+# 3. streaming upload 진행 상황 조회
+@router.get("/case/{case_id}/session/{session_id}/video/upload-progress", tags=["video"])
+@inject
+async def get_upload_progress(
+    case_id: int,
+    session_id: int,
+    token: str = Depends(oauth2_scheme),
+    video_manager_service: VideoManagerService = Depends(
+        Provide[Container.video_manager_service]
+    ),
+    security_service: SecurityService = Depends(Provide[Container.security_service]),
+):
+    payload = security_service.verify_token(token)
+    progress = await video_manager_service.get_upload_progress(
+        case_id=case_id, session_id=session_id, user_id=payload.get("user_id")
+    )
+    if progress is None:
+        return JSONResponse(status_code=404, content={"msg": "no upload in progress"})
+    return JSONResponse(status_code=200, content=progress)
+
+# 4. presigned url 생성 (s3에 파일 업로드할 수 있는 url 생성)
 @router.get("/case/{case_id}/session/{session_id}/video/presigned-url")
 @inject
 async def get_presigned_url(
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+
+class AuthorizedSession(NamedTuple):
+    id: int
+    case_id: int
+    user_id: int
+    origin_video_url: Optional[str]
+    encoding_video_url: Optional[str]
+    source_script_url: Optional[str]
+
+
+class TTLCache:
+    """항목별 만료 시간이 있는 in-process LRU cache."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hit_count = 0
+        self.miss_count = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[0] <= time.monotonic():
+                if item is not None:
+                    del self._items[key]
+                self.miss_count += 1
+                return None
+            self._items.move_to_end(key)
+            self.hit_count += 1
+            return item[1]
+
+    def set(self, key, value, ttl_seconds: float = None):
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl_seconds, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._items),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_count": self.hit_count,
+                "miss_count": self.miss_count,
+            }
+
+
+class ContentCache:
+    """검증된 token payload 와 (case_id, session_id) 별 권한 확인된 session 정보를 짧게 보관한다."""
+
+    def __init__(
+        self,
+        token_max_size: int = 10000,
+        token_ttl_seconds: float = 300,
+        session_max_size: int = 10000,
+        session_ttl_seconds: float = 30,
+    ):
+        self.tokens = TTLCache(token_max_size, token_ttl_seconds)
+        self.sessions = TTLCache(session_max_size, session_ttl_seconds)
+
+    def get_session(
+        self, case_id: int, session_id: int, user_id: int, required_url: str = None
+    ) -> Optional[AuthorizedSession]:
+        session = self.sessions.get((case_id, session_id))
+        # 다른 사용자의 요청은 cache 로 답하지 않고 DB 에서 다시 확인한다.
+        if session is None or session.user_id != user_id:
+            return None
+        # encoding_video_url / source_script_url 은 script-api 가 채우므로 여기서 invalidate 할 수 없다.
+        # 필요한 url 이 아직 비어 있던 때의 항목이면 cache 를 믿지 않고 DB 에서 다시 읽는다.
+        if required_url is not None and not getattr(session, required_url):
+            return None
+        return session
+
+    def set_session(self, session: AuthorizedSession):
+        self.sessions.set((session.case_id, session.id), session)
+
+    def invalidate_session(self, case_id: int, session_id: int):
+        self.sessions.invalidate((case_id, session_id))
+
+    def stats(self) -> dict:
+        return {"tokens": self.tokens.stats(), "sessions": self.sessions.stats()}
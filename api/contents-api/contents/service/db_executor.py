@@ -0,0 +1,11 @@
+from object.executor import BoundedExecutor
+
+
+class DBExecutor(BoundedExecutor):
+    """동기 SQLAlchemy repository 호출을 전용 thread pool 에서 실행한다.
+
+    max_workers 는 DB connection pool 크기(pool_size + max_overflow) 이하로 맞춘다.
+    """
+
+    def __init__(self, max_workers: int = 10):
+        super().__init__(max_workers, thread_name_prefix="db-executor")
@@ -1,86 +1,198 @@
 import io
-import os
-from functools import wraps
-from object.repository.script import ScriptRepository
+from object.repository.async_script import AsyncScriptRepository
 from object.exception import UploadFailed, DownloadFailed
 from core.db.connection import ConnectionManager
 from core.repository.session import SessionRepository
 from core.repository.case import CaseRepository
 from core.db.transaction import transaction_scope
 from core.model.domain.state_type import StateTypeEnum
+from contents.service.db_executor import DBExecutor
+from contents.repository.session_access import SessionAccessRepository
+from contents.repository.script_version import ScriptVersionRepository
+from contents.service.cache import AuthorizedSession, ContentCache
 from contents.exception import CaseNotFound, SessionNotFound, ScriptNotFound
 
 
 class ScriptManagerService:
     def __init__(
         self,
-        script_repository: ScriptRepository,
+        script_repository: AsyncScriptRepository,
         session_repository: SessionRepository,
         case_repository: CaseRepository,
         connection_manager: ConnectionManager,
+        db_executor: DBExecutor,
+        session_access_repository: SessionAccessRepository,
+        content_cache: ContentCache = None,
+        script_version_repository: ScriptVersionRepository = None,
+        download_mode: str = "proxy",
+        presigned_url_expires: int = 300,
     ):
         self.connection_manager = connection_manager
+        self.db_executor = db_executor
         self.script_repository = script_repository
         self.session_repository = session_repository
         self.case_repository = case_repository
+        self.session_access_repository = session_access_repository
+        self.content_cache = content_cache
+        # proxy: API 가 S3 body 를 스트리밍, redirect: presigned url 로 307, url: presigned url 을 JSON 으로 반환
+        self.download_mode = download_mode
+        self.presigned_url_expires = presigned_url_expires
+        self.script_version_repository = script_version_repository or ScriptVersionRepository(
+            script_repository.repository
+        )
 
-    def check_case_exists(func):
-        @wraps(func)
-        async def wrapper(self, *args, **kwargs):
-            case_id = kwargs.get("case_id")
-            user_id = kwargs.get("user_id")
-            case = self.case_repository.get(case_id=case_id, user_id=user_id)
-            if not case:
-                raise CaseNotFound(case_id)
-            return await func(self, *args, **kwargs)
-
-        return wrapper
+    async def get_authorized_session(
+        self, case_id: int, session_id: int, user_id: int, required_url: str = None
+    ):
+        if self.content_cache is not None:
+            cached = self.content_cache.get_session(case_id, session_id, user_id, required_url)
+            if cached is not None:
+                return cached
 
-    async def get_script_url(self, session_id):
-        session = self.session_repository.get(session_id)
-        if not session:
+        # case 소유권 확인과 session 조회를 query 한 번으로 처리한다.
+        case_exists, session = await self.db_executor.run(
+            self.session_access_repository.get_authorized,
+            case_id=case_id,
+            session_id=session_id,
+            user_id=user_id,
+        )
+        if not case_exists:
+            raise CaseNotFound(case_id)
+        if session is None:
             raise SessionNotFound(session_id)
-        return session.source_script_url
 
-    async def update_script_url(self, session_id, script_url):
-        db_session = self.connection_manager.make_session()
-        with transaction_scope(db_session) as tx_session:
-            session = self.session_repository.get(
-                session_id=session_id, db_session=tx_session
-            )
-            session.source_script_url = script_url
-            session.script_state_id = int(StateTypeEnum.DONE)
-            res = self.session_repository.update(
-                session_id=session_id,
-                session=session,
-                db_session=tx_session,
-            )
-            if not res:
-                raise SessionNotFound(session_id)
+        # 실패한 조회는 cache 하지 않고, 성공한 결과만 필요한 필드로 짧게 보관한다.
+        session = AuthorizedSession(
+            id=session.id,
+            case_id=case_id,
+            user_id=user_id,
+            origin_video_url=session.origin_video_url,
+            encoding_video_url=session.encoding_video_url,
+            source_script_url=session.source_script_url,
+        )
+        if self.content_cache is not None:
+            self.content_cache.set_session(session)
+        return session
+
+    async def update_script_url(self, session_id, script_url, case_id: int):
+        res = await self.db_executor.run(
+            self.session_access_repository.update_fields,
+            case_id=case_id,
+            session_id=session_id,
+            source_script_url=script_url,
+            script_state_id=int(StateTypeEnum.DONE),
+        )
+        if self.content_cache is not None:
+            self.content_cache.invalidate_session(case_id, session_id)
+        if not res:
+            raise SessionNotFound(session_id)
         return script_url
 
-    @check_case_exists
     async def download_script(self, case_id: int, session_id: int, user_id: int):
-        script_url = await self.get_script_url(session_id)
+        session = await self.get_authorized_session(
+            case_id, session_id, user_id, required_url="source_script_url"
+        )
+        script_url = session.source_script_url
         if not script_url:
             raise ScriptNotFound(session_id)
 
-        script_body = self.script_repository.get_json(script_url)
+        script_body = await self.script_repository.get_json(script_url)
         if not script_body:
             raise DownloadFailed(script_url)
-        return io.BytesIO(script_body.read())
+        return io.BytesIO(await self.script_repository.run(script_body.read))
+
+    async def get_download_url(self, case_id: int, session_id: int, user_id: int):
+        session = await self.get_authorized_session(
+            case_id, session_id, user_id, required_url="source_script_url"
+        )
+        script_url = session.source_script_url
+        if not script_url:
+            raise ScriptNotFound(session_id)
+        url_result = await self.script_repository.get_presigned_download_url(
+            script_url, expires_in=self.presigned_url_expires
+        )
+        if not url_result:
+            raise DownloadFailed(script_url)
+        return url_result
 
-    @check_case_exists
     async def upload_script(
         self, script: bytes, user_id: int, case_id: int, session_id: int
     ):
-        env = os.getenv("PHASE", "LOCAL")
-        file_path = f"{env}/{case_id}/{session_id}"
-        key_count = self.script_repository.get_object_list(file_path)["KeyCount"]
-        object_name = f"{file_path}/script_v{key_count+1}.json"
+        await self.get_authorized_session(case_id, session_id, user_id)
 
-        script_url = self.script_repository.upload_json(script, object_name)
-        if not script_url:
-            raise UploadFailed(object_name)
+        # 버전 번호는 짧은 transaction 으로 먼저 예약하고, script 업로드는 lock 밖에서 한다.
+        version = await self.db_executor.run(
+            self._reserve_script_version, case_id=case_id, session_id=session_id
+        )
+        object_name = self.script_version_repository.object_name(case_id, session_id, version)
+        try:
+            script_url = await self.script_repository.upload_json(script, object_name)
+            if not script_url:
+                raise UploadFailed(object_name)
+
+            await self.db_executor.run(
+                self._complete_script_version,
+                case_id=case_id,
+                session_id=session_id,
+                version=version,
+                script_url=script_url,
+            )
+        finally:
+            if self.content_cache is not None:
+                self.content_cache.invalidate_session(case_id, session_id)
+        return script_url
+
+    async def get_script_versions(
+        self, case_id: int, session_id: int, user_id: int, page: int = 1, size: int = 20
+    ):
+        # 버전 목록은 업로드가 끝난 버전만 기록된 manifest 로 만든다.
+        await self.get_authorized_session(case_id, session_id, user_id)
+        manifest = await self.db_executor.run(
+            self.script_version_repository.load, case_id=case_id, session_id=session_id
+        )
+        page = max(page, 1)
+        size = min(max(size, 1), 100)
+        versions = list(reversed(manifest["versions"]))
+        return {
+            "total": len(versions),
+            "page": page,
+            "size": size,
+            "versions": [
+                {"version": entry["version"], "script_url": entry["script_url"]}
+                for entry in versions[(page - 1) * size:page * size]
+            ],
+        }
 
-        await self.update_script_url(session_id, script_url)
+    def _reserve_script_version(self, case_id: int, session_id: int) -> int:
+        # session row lock 안에서 manifest 의 last_version 을 올려 다음 버전을 발급한다.
+        # 업로드가 실패해도 발급한 번호는 다시 쓰지 않는다.
+        db_session = self.connection_manager.make_session()
+        with transaction_scope(db_session) as tx_session:
+            if not self.session_access_repository.lock_session(
+                case_id=case_id, session_id=session_id, db_session=tx_session
+            ):
+                raise SessionNotFound(session_id)
+            manifest = self.script_version_repository.load(case_id, session_id)
+            manifest["last_version"] += 1
+            self.script_version_repository.save(case_id, session_id, manifest)
+        return manifest["last_version"]
+
+    def _complete_script_version(self, case_id: int, session_id: int, version: int, script_url: str):
+        # 업로드가 끝난 버전을 manifest 에 기록하고, 더 새 버전이 먼저 끝나지 않았으면 현재 script 로 바꾼다.
+        db_session = self.connection_manager.make_session()
+        with transaction_scope(db_session) as tx_session:
+            if not self.session_access_repository.lock_session(
+                case_id=case_id, session_id=session_id, db_session=tx_session
+            ):
+                raise SessionNotFound(session_id)
+            manifest = self.script_version_repository.load(case_id, session_id)
+            manifest = self.script_version_repository.add_version(manifest, version, script_url)
+            self.script_version_repository.save(case_id, session_id, manifest)
+            if version == manifest["versions"][-1]["version"]:
+                self.session_access_repository.update_fields(
+                    case_id=case_id,
+                    session_id=session_id,
+                    db_session=tx_session,
+                    source_script_url=script_url,
+                    script_state_id=int(StateTypeEnum.DONE),
+                )
@@ -0,0 +1,32 @@
+import time
+
+from core.service.security import SecurityService
+from contents.service.cache import ContentCache
+
+
+class CachedSecurityService(SecurityService):
+    """verify_token 결과를 token 만료 시각 이내에서 짧게 cache 한다."""
+
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str,
+        expires_delta: int,
+        content_cache: ContentCache,
+    ):
+        super().__init__(
+            secret_key=secret_key, algorithm=algorithm, expires_delta=expires_delta
+        )
+        self.content_cache = content_cache
+
+    def verify_token(self, token: str):
+        payload = self.content_cache.tokens.get(token)
+        if payload is not None:
+            return payload
+
+        # 유효하지 않은 token 은 예외가 그대로 올라가고 cache 되지 않는다.
+        payload = super().verify_token(token)
+        exp = payload.get("exp") if isinstance(payload, dict) else None
+        ttl_seconds = exp - time.time() if exp else None
+        self.content_cache.tokens.set(token, payload, ttl_seconds=ttl_seconds)
+        return payload
@@ -1,46 +1,95 @@
+import asyncio
 import os
-from functools import wraps
+import re
 from typing import IO
-from object.repository.video import VideoRepository
+from object.repository.async_video import AsyncVideoRepository
 from object.exception import UploadFailed, DownloadFailed
 from core.db.connection import ConnectionManager
 from core.repository.session import SessionRepository
 from core.repository.case import CaseRepository
-from core.db.transaction import transaction_scope
 from core.model.domain.state_type import StateTypeEnum
+from contents.service.db_executor import DBExecutor
+from contents.repository.session_access import SessionAccessRepository
+from contents.service.cache import AuthorizedSession, ContentCache, TTLCache
 from contents.exception import CaseNotFound, SessionNotFound, VideoNotFound
 
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+MIN_PART_SIZE = 5 * 1024 * 1024  # S3 multipart 의 마지막 part 를 제외한 최소 크기
+
 
 class VideoManagerService:
     def __init__(
         self,
-        video_repository: VideoRepository,
+        video_repository: AsyncVideoRepository,
         session_repository: SessionRepository,
         case_repository: CaseRepository,
         connection_manager: ConnectionManager,
+        db_executor: DBExecutor,
+        session_access_repository: SessionAccessRepository,
+        stream_chunk_size: int = 1024 * 1024,
+        max_range_size: int = 8 * 1024 * 1024,
+        download_mode: str = "proxy",
+        presigned_url_expires: int = 300,
+        upload_mode: str = "buffer",
+        multipart_part_size: int = 8 * 1024 * 1024,
+        multipart_concurrency: int = 4,
+        content_cache: ContentCache = None,
+        upload_progress_ttl_seconds: float = 600,
+        upload_progress_max_size: int = 10000,
     ):
         self.connection_manager = connection_manager
+        self.db_executor = db_executor
+        self.stream_chunk_size = stream_chunk_size
+        # "bytes=N-" 처럼 끝이 열린 range 는 max_range_size 만큼만 잘라서 응답한다.
+        self.max_range_size = max_range_size
+        # proxy: API 가 S3 body 를 스트리밍, redirect: presigned url 로 307, url: presigned url 을 JSON 으로 반환
+        self.download_mode = download_mode
+        self.presigned_url_expires = presigned_url_expires
+        # buffer: 업로드 파일을 메모리에 올려 background 로 업로드, stream: multipart 로 바로 흘려 업로드
+        self.upload_mode = upload_mode
+        self.multipart_part_size = max(multipart_part_size, MIN_PART_SIZE)
+        self.multipart_concurrency = multipart_concurrency
+        # 진행 상황은 업로드를 받은 worker 프로세스에만 있다. 끝난(done/failed) 항목은 ttl 이 지나면 사라지고,
+        # 진행 중인 항목은 part 를 올릴 때마다 ttl 을 다시 늘린다.
+        self.upload_progress = TTLCache(upload_progress_max_size, upload_progress_ttl_seconds)
         self.video_repository = video_repository
         self.session_repository = session_repository
         self.case_repository = case_repository
+        self.session_access_repository = session_access_repository
+        self.content_cache = content_cache
 
-    def check_case_exists(func):
-        @wraps(func)
-        async def wrapper(self, *args, **kwargs):
-            case_id = kwargs.get("case_id")
-            user_id = kwargs.get("user_id")
-            case = self.case_repository.get(case_id=case_id, user_id=user_id)
-            if not case:
-                raise CaseNotFound(case_id)
-            return await func(self, *args, **kwargs)
-
-        return wrapper
+    async def get_authorized_session(
+        self, case_id: int, session_id: int, user_id: int, required_url: str = None
+    ):
+        if self.content_cache is not None:
+            cached = self.content_cache.get_session(case_id, session_id, user_id, required_url)
+            if cached is not None:
+                return cached
 
-    async def get_encoded_video_url(self, session_id: int):
-        session = self.session_repository.get(session_id)
-        if not session:
+        # case 소유권 확인과 session 조회를 query 한 번으로 처리한다.
+        case_exists, session = await self.db_executor.run(
+            self.session_access_repository.get_authorized,
+            case_id=case_id,
+            session_id=session_id,
+            user_id=user_id,
+        )
+        if not case_exists:
+            raise CaseNotFound(case_id)
+        if session is None:
             raise SessionNotFound(session_id)
-        return session.encoding_video_url
+
+        # 실패한 조회는 cache 하지 않고, 성공한 결과만 필요한 필드로 짧게 보관한다.
+        session = AuthorizedSession(
+            id=session.id,
+            case_id=case_id,
+            user_id=user_id,
+            origin_video_url=session.origin_video_url,
+            encoding_video_url=session.encoding_video_url,
+            source_script_url=session.source_script_url,
+        )
+        if self.content_cache is not None:
+            self.content_cache.set_session(session)
+        return session
 
     def get_origin_video_url(self, session_id: int):
         session = self.session_repository.get(session_id)
@@ -54,35 +103,67 @@ class VideoManagerService:
             raise SessionNotFound(session_id)
         return session.source_video_url
 
-    async def update_origin_video_url(self, session_id, origin_video_url: str):
-        db_session = self.connection_manager.make_session()
-
-        with transaction_scope(db_session) as tx_session:
-            session = self.session_repository.get(
-                session_id=session_id, db_session=tx_session
-            )
-            session.origin_video_url = origin_video_url
-            session.encoding_state_id = int(StateTypeEnum.READY)
-            res = self.session_repository.update(
-                session_id=session_id,
-                session=session,
-                db_session=tx_session,
-            )
-            if not res:
-                raise SessionNotFound(session_id)
+    async def update_origin_video_url(self, session_id, origin_video_url: str, case_id: int):
+        res = await self.db_executor.run(
+            self.session_access_repository.update_fields,
+            case_id=case_id,
+            session_id=session_id,
+            origin_video_url=origin_video_url,
+            encoding_state_id=int(StateTypeEnum.READY),
+        )
+        if self.content_cache is not None:
+            self.content_cache.invalidate_session(case_id, session_id)
+        if not res:
+            raise SessionNotFound(session_id)
         return origin_video_url
 
-    @check_case_exists
-    async def download_video(self, case_id: int, session_id: int, user_id: int):
-        encoded_video_url = await self.get_encoded_video_url(session_id)
+    def normalize_range(self, range_header: str = None):
+        # 단일 byte range 만 S3 로 그대로 넘기고, 해석할 수 없는 값은 전체 응답으로 처리한다.
+        # 파일 크기를 넘는 range 는 S3 가 InvalidRange 로 거절하고 RangeNotSatisfiable(416) 이 된다.
+        if not range_header:
+            return None
+        match = RANGE_PATTERN.match(range_header.strip())
+        if not match:
+            return None
+        start, end = match.groups()
+        if not start and not end:
+            return None
+        if start and end and int(start) > int(end):
+            return None
+        if start and not end:
+            end = str(int(start) + self.max_range_size - 1)
+        return f"bytes={start}-{end}"
+
+    async def download_video(
+        self, case_id: int, session_id: int, user_id: int, range_header: str = None
+    ):
+        session = await self.get_authorized_session(
+            case_id, session_id, user_id, required_url="encoding_video_url"
+        )
+        encoded_video_url = session.encoding_video_url
         if not encoded_video_url:
             raise VideoNotFound(session_id)
-        video = self.video_repository.get_object(encoded_video_url)
+        video = await self.video_repository.get_object(
+            encoded_video_url, byte_range=self.normalize_range(range_header)
+        )
         if not video:
             raise DownloadFailed(encoded_video_url)
-        return video["Body"]
+        return video
+
+    async def get_download_url(self, case_id: int, session_id: int, user_id: int):
+        session = await self.get_authorized_session(
+            case_id, session_id, user_id, required_url="encoding_video_url"
+        )
+        encoded_video_url = session.encoding_video_url
+        if not encoded_video_url:
+            raise VideoNotFound(session_id)
+        url_result = await self.video_repository.get_presigned_download_url(
+            encoded_video_url, expires_in=self.presigned_url_expires
+        )
+        if not url_result:
+            raise DownloadFailed(encoded_video_url)
+        return url_result
 
-    @check_case_exists
     async def upload_video_obj(
         self,
         case_id: int,
@@ -91,24 +172,100 @@ class VideoManagerService:
         file_obj: IO[bytes],
         filename: str,
     ):
+        await self.get_authorized_session(case_id, session_id, user_id)
         env = os.getenv("PHASE", "LOCAL")
         file_path = f"{env}/{case_id}/{session_id}/"
-        url_result = self.video_repository.upload_obj(file_obj, file_path + filename)
+        url_result = await self.video_repository.upload_obj(file_obj, file_path + filename)
         if not url_result:
             raise UploadFailed(filename)
-        updated_res = await self.update_origin_video_url(session_id, url_result)
+        updated_res = await self.update_origin_video_url(session_id, url_result, case_id=case_id)
         return updated_res
 
-    @check_case_exists
+    async def upload_video_stream(
+        self,
+        case_id: int,
+        session_id: int,
+        user_id: int,
+        file,
+        filename: str,
+    ):
+        await self.get_authorized_session(case_id, session_id, user_id)
+        # part 를 읽는 즉시 S3 multipart 로 올려서 메모리에는 최대 multipart_concurrency 개의 part 만 남는다.
+        env = os.getenv("PHASE", "LOCAL")
+        object_name = f"{env}/{case_id}/{session_id}/{filename}"
+        body = await file.read(self.multipart_part_size)
+        if not body:
+            # 빈 파일은 0 byte part 하나짜리 multipart upload 를 만들지 않고 거절한다.
+            raise UploadFailed(filename)
+        upload_id = await self.video_repository.create_multipart_upload(object_name)
+        if not upload_id:
+            raise UploadFailed(filename)
+
+        progress_key = (case_id, session_id)
+        progress = {"filename": filename, "uploaded_bytes": 0, "uploaded_parts": 0, "state": "uploading"}
+        self.upload_progress.set(progress_key, progress)
+        slots = asyncio.Semaphore(self.multipart_concurrency)
+        parts = []
+
+        async def upload_part(part_number: int, body: bytes):
+            try:
+                etag = await self.video_repository.upload_part(
+                    object_name, upload_id, part_number, body
+                )
+                if not etag:
+                    raise UploadFailed(filename)
+                parts.append({"PartNumber": part_number, "ETag": etag})
+                progress["uploaded_bytes"] += len(body)
+                progress["uploaded_parts"] += 1
+                self.upload_progress.set(progress_key, progress)
+            finally:
+                slots.release()
+
+        tasks = []
+        try:
+            part_number = 1
+            while body:
+                await slots.acquire()
+                tasks.append(asyncio.create_task(upload_part(part_number, body)))
+                if len(body) < self.multipart_part_size:
+                    break
+                part_number += 1
+                body = await file.read(self.multipart_part_size)
+            await asyncio.gather(*tasks)
+
+            parts.sort(key=lambda part: part["PartNumber"])
+            url_result = await self.video_repository.complete_multipart_upload(
+                object_name, upload_id, parts
+            )
+            if not url_result:
+                raise UploadFailed(filename)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await self.video_repository.abort_multipart_upload(object_name, upload_id)
+            progress["state"] = "failed"
+            self.upload_progress.set(progress_key, progress)
+            raise
+
+        progress["state"] = "done"
+        self.upload_progress.set(progress_key, progress)
+        print(f"[VideoManagerService] multipart upload done '{object_name}' ({progress['uploaded_bytes']} bytes)")
+        return await self.update_origin_video_url(session_id, url_result, case_id=case_id)
+
+    async def get_upload_progress(self, case_id: int, session_id: int, user_id: int):
+        await self.get_authorized_session(case_id, session_id, user_id)
+        return self.upload_progress.get((case_id, session_id))
+
     async def get_presigned_url(
         self,
         case_id: int,
         session_id: int,
         user_id: int,
     ):
+        await self.get_authorized_session(case_id, session_id, user_id)
         env = os.getenv("PHASE", "LOCAL")
         file_path = f"{env}/{case_id}/{session_id}/video.mp4"
-        url_result = self.video_repository.get_presigned_url(file_path)
+        url_result = await self.video_repository.get_presigned_url(file_path)
 
         if not url_result:
             raise UploadFailed(session_id)
@@ -0,0 +1,68 @@
+import io
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from object.repository.script import ScriptRepository
+from contents.repository.script_version import MANIFEST_NAME, ScriptVersionRepository
+
+
+class TestScriptVersionRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.script_repo = MagicMock(spec=ScriptRepository)
+        self.repository = ScriptVersionRepository(self.script_repo)
+        patcher = patch.dict("os.environ", {"PHASE": "TEST"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_load_manifest(self):
+        manifest = {"last_version": 3, "versions": [{"version": 2, "script_url": "a", "uploaded_at": None}]}
+        self.script_repo.get_json.return_value = io.BytesIO(json.dumps(manifest).encode())
+
+        self.assertEqual(self.repository.load(1, 2), manifest)
+        self.script_repo.get_json.assert_called_once_with(f"TEST/1/2/{MANIFEST_NAME}")
+        self.script_repo.get_object_list.assert_not_called()
+
+    def test_load_seeds_from_existing_objects(self):
+        # 예전 번호는 영상 object 까지 세서 중간이 비어 있다.
+        self.script_repo.get_json.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchKey"}}, "GetObject"
+        )
+        self.script_repo.get_object_list.return_value = {
+            "Contents": [
+                {"Key": "TEST/1/2/origin.mp4"},
+                {"Key": "TEST/1/2/script_v4.json"},
+                {"Key": "TEST/1/2/script_v2.json"},
+            ]
+        }
+
+        manifest = self.repository.load(1, 2)
+
+        self.script_repo.get_object_list.assert_called_once_with("TEST/1/2/")
+        self.assertEqual(manifest["last_version"], 4)
+        self.assertEqual([entry["version"] for entry in manifest["versions"]], [2, 4])
+
+    def test_load_raises_other_errors(self):
+        self.script_repo.get_json.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "GetObject"
+        )
+        with self.assertRaises(ClientError):
+            self.repository.load(1, 2)
+
+    def test_add_version_never_lowers_last_version(self):
+        manifest = {"last_version": 5, "versions": [{"version": 5, "script_url": "v5", "uploaded_at": None}]}
+
+        manifest = self.repository.add_version(manifest, 4, "v4")
+
+        self.assertEqual(manifest["last_version"], 5)
+        self.assertEqual([entry["version"] for entry in manifest["versions"]], [4, 5])
+
+    def test_save(self):
+        self.script_repo.upload_json.return_value = "url"
+        self.repository.save(1, 2, {"last_version": 1, "versions": []})
+        body, name = self.script_repo.upload_json.call_args.args
+        self.assertEqual(name, f"TEST/1/2/{MANIFEST_NAME}")
+        self.assertEqual(json.loads(body), {"last_version": 1, "versions": []})
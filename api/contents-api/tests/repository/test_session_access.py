@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import MagicMock
+
+from contents.repository.session_access import SessionAccessRepository
+
+
+class TestSessionAccessRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.connection_manager = MagicMock()
+        self.session = self.connection_manager.make_session.return_value
+        self.repository = SessionAccessRepository(self.connection_manager)
+
+    def test_get_authorized_query(self):
+        self.session.execute.return_value.first.return_value = None
+
+        self.repository.get_authorized(1, 2, 3)
+
+        # case 소유권과 session 을 outer join 한 query 한 번으로 조회한다.
+        self.session.execute.assert_called_once()
+        stmt = str(self.session.execute.call_args.args[0]).upper()
+        self.assertIn("LEFT OUTER JOIN", stmt)
+        self.assertIn("USER_ID", stmt.split("WHERE")[1])
+        self.session.close.assert_called_once()
+
+    def test_get_authorized(self):
+        entity = MagicMock()
+        self.session.execute.return_value.first.return_value = (1, entity)
+
+        self.assertEqual(self.repository.get_authorized(1, 2, 3), (True, entity))
+
+    def test_get_authorized_without_session(self):
+        self.session.execute.return_value.first.return_value = (1, None)
+
+        self.assertEqual(self.repository.get_authorized(1, 2, 3), (True, None))
+
+    def test_get_authorized_without_case(self):
+        self.session.execute.return_value.first.return_value = None
+
+        self.assertEqual(self.repository.get_authorized(1, 2, 3), (False, None))
+
+    def test_get_authorized_with_db_session(self):
+        db_session = MagicMock()
+        db_session.execute.return_value.first.return_value = None
+
+        self.repository.get_authorized(1, 2, 3, db_session=db_session)
+
+        db_session.close.assert_not_called()
+        self.connection_manager.make_session.assert_not_called()
+
+    def test_update_fields(self):
+        self.session.execute.return_value.rowcount = 1
+
+        self.assertTrue(self.repository.update_fields(1, 2, origin_video_url="video.mp4"))
+
+        stmt = str(self.session.execute.call_args.args[0]).upper()
+        self.assertTrue(stmt.startswith("UPDATE"))
+        self.assertIn("CASE_ID", stmt.split("WHERE")[1])
+        self.session.commit.assert_called_once()
+        self.session.close.assert_called_once()
+
+    def test_update_fields_no_row(self):
+        self.session.execute.return_value.rowcount = 0
+
+        self.assertFalse(self.repository.update_fields(1, 2, origin_video_url="video.mp4"))
+
+    def test_update_fields_rollback(self):
+        self.session.execute.side_effect = RuntimeError("db error")
+
+        with self.assertRaises(RuntimeError):
+            self.repository.update_fields(1, 2, origin_video_url="video.mp4")
+        self.session.rollback.assert_called_once()
+        self.session.close.assert_called_once()
+
+    def test_update_fields_with_db_session(self):
+        db_session = MagicMock()
+        db_session.execute.return_value.rowcount = 1
+
+        self.assertTrue(self.repository.update_fields(1, 2, db_session=db_session, source_script_url="a"))
+        db_session.commit.assert_not_called()
+        db_session.close.assert_not_called()
+
+    def test_lock_session(self):
+        db_session = MagicMock()
+        db_session.execute.return_value.first.return_value = (2,)
+
+        self.assertTrue(self.repository.lock_session(1, 2, db_session))
+        self.assertIn("FOR UPDATE", str(db_session.execute.call_args.args[0]).upper())
+
+        db_session.execute.return_value.first.return_value = None
+        self.assertFalse(self.repository.lock_session(1, 2, db_session))
+
+
+if __name__ == "__main__":
+    unittest.main()
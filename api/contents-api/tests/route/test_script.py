@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from contents.route.script import download_script
+
+
+class TestDownloadScriptRoute(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.script_manager_service = MagicMock()
+        self.script_manager_service.get_download_url = AsyncMock(return_value="https://s3/script?signature")
+        self.script_manager_service.download_script = AsyncMock()
+        self.security_service = MagicMock()
+        self.security_service.verify_token.return_value = {"user_id": 3}
+
+    async def download(self):
+        return await download_script(
+            case_id=1,
+            session_id=2,
+            token="token",
+            script_manager_service=self.script_manager_service,
+            security_service=self.security_service,
+        )
+
+    async def test_redirect(self):
+        self.script_manager_service.download_mode = "redirect"
+
+        response = await self.download()
+
+        self.assertEqual(response.status_code, 307)
+        self.assertEqual(response.headers["location"], "https://s3/script?signature")
+        self.script_manager_service.get_download_url.assert_awaited_once_with(case_id=1, session_id=2, user_id=3)
+        self.script_manager_service.download_script.assert_not_called()
+
+    async def test_url(self):
+        self.script_manager_service.download_mode = "url"
+
+        response = await self.download()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, b'{"url":"https://s3/script?signature"}')
+
+    async def test_proxy(self):
+        self.script_manager_service.download_mode = "proxy"
+
+        await self.download()
+
+        self.script_manager_service.get_download_url.assert_not_called()
+        self.script_manager_service.download_script.assert_awaited_once_with(case_id=1, session_id=2, user_id=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
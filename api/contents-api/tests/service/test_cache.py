@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import patch
+
+from contents.service.cache import AuthorizedSession, ContentCache, TTLCache
+
+
+def make_session(user_id: int = 3) -> AuthorizedSession:
+    return AuthorizedSession(
+        id=2, case_id=1, user_id=user_id, origin_video_url="origin.mp4",
+        encoding_video_url="encoded.mp4", source_script_url=None,
+    )
+
+
+class TestTTLCache(unittest.TestCase):
+
+    @patch("contents.service.cache.time.monotonic")
+    def test_expire(self, monotonic):
+        cache = TTLCache(max_size=10, ttl_seconds=30)
+        monotonic.return_value = 1000.0
+        cache.set("key", "value")
+
+        monotonic.return_value = 1029.0
+        self.assertEqual(cache.get("key"), "value")
+        monotonic.return_value = 1030.0
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats()["size"], 0)
+        self.assertEqual(cache.stats()["hit_count"], 1)
+        self.assertEqual(cache.stats()["miss_count"], 1)
+
+    @patch("contents.service.cache.time.monotonic")
+    def test_ttl_seconds_is_bounded(self, monotonic):
+        cache = TTLCache(max_size=10, ttl_seconds=30)
+        monotonic.return_value = 1000.0
+        cache.set("short", "value", ttl_seconds=5)
+        cache.set("long", "value", ttl_seconds=300)
+        cache.set("expired", "value", ttl_seconds=-1)
+
+        monotonic.return_value = 1006.0
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get("long"), "value")
+        monotonic.return_value = 1031.0
+        self.assertIsNone(cache.get("long"))
+        self.assertIsNone(cache.get("expired"))
+
+    def test_lru_eviction(self):
+        cache = TTLCache(max_size=2, ttl_seconds=30)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        # a 를 읽으면 최근 항목이 되어 b 가 먼저 밀려난다.
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats()["size"], 2)
+
+    def test_invalidate(self):
+        cache = TTLCache(max_size=2, ttl_seconds=30)
+        cache.set("a", 1)
+        cache.invalidate("a")
+        cache.invalidate("missing")
+        self.assertIsNone(cache.get("a"))
+
+
+class TestContentCache(unittest.TestCase):
+
+    def test_get_session(self):
+        cache = ContentCache()
+        session = make_session()
+        cache.set_session(session)
+
+        self.assertEqual(cache.get_session(1, 2, 3), session)
+        self.assertIsNone(cache.get_session(1, 99, 3))
+
+    def test_get_session_other_user(self):
+        cache = ContentCache()
+        cache.set_session(make_session(user_id=3))
+
+        self.assertIsNone(cache.get_session(1, 2, 4))
+        # 다른 사용자의 조회가 원래 사용자의 cache 를 지우지는 않는다.
+        self.assertIsNotNone(cache.get_session(1, 2, 3))
+
+    def test_get_session_required_url(self):
+        cache = ContentCache()
+        cache.set_session(make_session()._replace(source_script_url=None))
+
+        # 아직 비어 있는 url 이 필요한 요청은 cache 로 답하지 않는다.
+        self.assertIsNone(cache.get_session(1, 2, 3, required_url="source_script_url"))
+        self.assertIsNotNone(cache.get_session(1, 2, 3, required_url="encoding_video_url"))
+        self.assertIsNotNone(cache.get_session(1, 2, 3))
+
+    def test_invalidate_session(self):
+        cache = ContentCache()
+        cache.set_session(make_session())
+        cache.invalidate_session(1, 2)
+
+        self.assertIsNone(cache.get_session(1, 2, 3))
+        self.assertEqual(cache.stats()["sessions"]["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
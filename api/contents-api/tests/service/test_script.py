@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from object.exception import DownloadFailed
+from object.repository.async_script import AsyncScriptRepository
+from contents.exception import ScriptNotFound
+from contents.service.cache import AuthorizedSession
+from contents.service.script import ScriptManagerService
+
+
+def make_session(source_script_url="LOCAL/1/2/script_v1.json") -> AuthorizedSession:
+    return AuthorizedSession(
+        id=2, case_id=1, user_id=3, origin_video_url="origin.mp4",
+        encoding_video_url="encoded.mp4", source_script_url=source_script_url,
+    )
+
+
+class TestScriptManagerServiceDownload(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.script_repo = MagicMock(spec=AsyncScriptRepository)
+        self.script_service = ScriptManagerService(
+            script_repository=self.script_repo,
+            session_repository=MagicMock(),
+            case_repository=MagicMock(),
+            connection_manager=MagicMock(),
+            db_executor=MagicMock(),
+            session_access_repository=MagicMock(),
+            script_version_repository=MagicMock(),
+            download_mode="redirect",
+            presigned_url_expires=60,
+        )
+        self.script_service.get_authorized_session = AsyncMock(return_value=make_session())
+
+    async def test_get_download_url(self):
+        self.script_repo.get_presigned_download_url = AsyncMock(return_value="https://s3/script?signature")
+
+        url = await self.script_service.get_download_url(1, 2, 3)
+
+        self.assertEqual(url, "https://s3/script?signature")
+        self.script_repo.get_presigned_download_url.assert_awaited_once_with(
+            "LOCAL/1/2/script_v1.json", expires_in=60
+        )
+
+    async def test_get_download_url_without_script(self):
+        self.script_service.get_authorized_session = AsyncMock(return_value=make_session(None))
+        self.script_repo.get_presigned_download_url = AsyncMock()
+
+        with self.assertRaises(ScriptNotFound):
+            await self.script_service.get_download_url(1, 2, 3)
+        self.script_repo.get_presigned_download_url.assert_not_called()
+
+    async def test_get_download_url_failed(self):
+        self.script_repo.get_presigned_download_url = AsyncMock(return_value=None)
+
+        with self.assertRaises(DownloadFailed):
+            await self.script_service.get_download_url(1, 2, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch
+
+from core.service.security import SecurityService
+from contents.service.cache import ContentCache
+from contents.service.security import CachedSecurityService
+
+
+class TestCachedSecurityService(unittest.TestCase):
+
+    def setUp(self):
+        self.content_cache = ContentCache(token_ttl_seconds=300)
+        self.security_service = CachedSecurityService(
+            secret_key="secret", algorithm="HS256", expires_delta=60,
+            content_cache=self.content_cache,
+        )
+
+    @patch.object(SecurityService, "verify_token")
+    def test_verify_token_cached(self, verify_token):
+        verify_token.return_value = {"sub": "user"}
+
+        self.assertEqual(self.security_service.verify_token("token"), {"sub": "user"})
+        self.assertEqual(self.security_service.verify_token("token"), {"sub": "user"})
+        verify_token.assert_called_once_with("token")
+
+    @patch("contents.service.cache.time.monotonic")
+    @patch("contents.service.security.time.time")
+    @patch.object(SecurityService, "verify_token")
+    def test_ttl_bounded_by_exp(self, verify_token, now, monotonic):
+        now.return_value = 1000.0
+        monotonic.return_value = 5000.0
+        verify_token.return_value = {"sub": "user", "exp": 1010}
+
+        self.security_service.verify_token("token")
+
+        monotonic.return_value = 5009.0
+        self.assertIsNotNone(self.content_cache.tokens.get("token"))
+        # cache ttl(300초)보다 token 만료(10초 뒤)가 먼저다.
+        monotonic.return_value = 5010.0
+        self.assertIsNone(self.content_cache.tokens.get("token"))
+
+    @patch("contents.service.security.time.time")
+    @patch.object(SecurityService, "verify_token")
+    def test_expired_token_not_cached(self, verify_token, now):
+        now.return_value = 1000.0
+        verify_token.return_value = {"sub": "user", "exp": 900}
+
+        self.security_service.verify_token("token")
+
+        self.assertEqual(self.content_cache.tokens.stats()["size"], 0)
+
+    @patch.object(SecurityService, "verify_token")
+    def test_invalid_token_not_cached(self, verify_token):
+        verify_token.side_effect = ValueError("invalid token")
+
+        with self.assertRaises(ValueError):
+            self.security_service.verify_token("token")
+        with self.assertRaises(ValueError):
+            self.security_service.verify_token("token")
+
+        self.assertEqual(verify_token.call_count, 2)
+        self.assertEqual(self.content_cache.tokens.stats()["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
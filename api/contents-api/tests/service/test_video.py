@@ -0,0 +1,151 @@
+import io
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from object.exception import RangeNotSatisfiable, UploadFailed
+from object.repository.async_video import AsyncVideoRepository
+from contents.service.cache import AuthorizedSession, ContentCache
+from contents.service.video import VideoManagerService
+
+
+class TestVideoManagerService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.video_repo = MagicMock(spec=AsyncVideoRepository)
+        self.video_service = VideoManagerService(
+            video_repository=self.video_repo,
+            session_repository=MagicMock(),
+            case_repository=MagicMock(),
+            connection_manager=MagicMock(),
+            db_executor=MagicMock(),
+            session_access_repository=MagicMock(),
+            max_range_size=1024,
+            multipart_part_size=5 * 1024 * 1024,
+            upload_progress_ttl_seconds=60,
+        )
+        self.video_service.get_authorized_session = AsyncMock()
+        self.video_service.update_origin_video_url = AsyncMock(return_value="object_name")
+
+    def test_normalize_range(self):
+        normalize_range = self.video_service.normalize_range
+        self.assertEqual(normalize_range("bytes=0-99"), "bytes=0-99")
+        self.assertEqual(normalize_range(" bytes=100-199 "), "bytes=100-199")
+        # 끝이 열린 range 는 max_range_size 만큼만 준다.
+        self.assertEqual(normalize_range("bytes=0-"), "bytes=0-1023")
+        self.assertEqual(normalize_range("bytes=2048-"), "bytes=2048-3071")
+        # suffix range 는 S3 로 그대로 넘긴다.
+        self.assertEqual(normalize_range("bytes=-500"), "bytes=-500")
+
+    def test_normalize_range_malformed(self):
+        normalize_range = self.video_service.normalize_range
+        self.assertIsNone(normalize_range(None))
+        self.assertIsNone(normalize_range(""))
+        self.assertIsNone(normalize_range("bytes=-"))
+        self.assertIsNone(normalize_range("bytes=abc-def"))
+        self.assertIsNone(normalize_range("bytes=0-99,200-299"))
+        self.assertIsNone(normalize_range("items=0-99"))
+        self.assertIsNone(normalize_range("bytes=200-100"))
+
+    async def test_download_video_range_not_satisfiable(self):
+        self.video_service.get_authorized_session = AsyncMock(return_value=AuthorizedSession(
+            id=2, case_id=1, user_id=3, origin_video_url="origin.mp4",
+            encoding_video_url="encoded.mp4", source_script_url=None,
+        ))
+        self.video_repo.get_object = AsyncMock(side_effect=RangeNotSatisfiable("encoded.mp4", 1000))
+
+        with self.assertRaises(RangeNotSatisfiable) as context:
+            await self.video_service.download_video(1, 2, 3, range_header="bytes=5000-")
+
+        self.video_repo.get_object.assert_awaited_once_with("encoded.mp4", byte_range="bytes=5000-6023")
+        self.assertEqual(context.exception.object_size, 1000)
+
+
+class FakeUploadFile:
+    def __init__(self, data: bytes):
+        self.file = io.BytesIO(data)
+
+    async def read(self, size: int) -> bytes:
+        return self.file.read(size)
+
+
+class TestVideoManagerServiceUpload(TestVideoManagerService):
+
+    async def test_upload_video_stream(self):
+        self.video_repo.create_multipart_upload = AsyncMock(return_value="upload_id")
+        self.video_repo.upload_part = AsyncMock(side_effect=lambda *args: f"etag{args[2]}")
+        self.video_repo.complete_multipart_upload = AsyncMock(return_value="object_name")
+        data = b"a" * (5 * 1024 * 1024) + b"b" * 10
+
+        await self.video_service.upload_video_stream(1, 2, 3, FakeUploadFile(data), "video.mp4")
+
+        self.assertEqual(self.video_repo.upload_part.await_count, 2)
+        parts = self.video_repo.complete_multipart_upload.await_args.args[2]
+        self.assertEqual(parts, [{"PartNumber": 1, "ETag": "etag1"}, {"PartNumber": 2, "ETag": "etag2"}])
+        progress = self.video_service.upload_progress.get((1, 2))
+        self.assertEqual(progress["state"], "done")
+        self.assertEqual(progress["uploaded_bytes"], len(data))
+
+    async def test_upload_video_stream_rejects_empty_file(self):
+        self.video_repo.create_multipart_upload = AsyncMock()
+
+        with self.assertRaises(UploadFailed):
+            await self.video_service.upload_video_stream(1, 2, 3, FakeUploadFile(b""), "video.mp4")
+
+        self.video_repo.create_multipart_upload.assert_not_called()
+
+    async def test_upload_progress_expires(self):
+        self.video_repo.create_multipart_upload = AsyncMock(return_value="upload_id")
+        self.video_repo.upload_part = AsyncMock(return_value="etag")
+        self.video_repo.complete_multipart_upload = AsyncMock(return_value="object_name")
+
+        with patch("contents.service.cache.time.monotonic", return_value=1000.0):
+            await self.video_service.upload_video_stream(1, 2, 3, FakeUploadFile(b"data"), "video.mp4")
+            self.assertIsNotNone(self.video_service.upload_progress.get((1, 2)))
+        with patch("contents.service.cache.time.monotonic", return_value=1061.0):
+            self.assertIsNone(self.video_service.upload_progress.get((1, 2)))
+        self.assertEqual(self.video_service.upload_progress.stats()["size"], 0)
+
+
+class TestVideoManagerServiceSessionCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.video_repo = MagicMock(spec=AsyncVideoRepository)
+        self.db_executor = MagicMock()
+        self.db_executor.run = AsyncMock()
+        self.content_cache = ContentCache()
+        self.video_service = VideoManagerService(
+            video_repository=self.video_repo,
+            session_repository=MagicMock(),
+            case_repository=MagicMock(),
+            connection_manager=MagicMock(),
+            db_executor=self.db_executor,
+            session_access_repository=MagicMock(),
+            content_cache=self.content_cache,
+        )
+
+    def session_entity(self, encoding_video_url=None):
+        return MagicMock(id=2, origin_video_url="origin.mp4",
+                         encoding_video_url=encoding_video_url, source_script_url=None)
+
+    async def test_download_after_encoding_finished(self):
+        # 인코딩 전에 cache 된 session 은 encoding_video_url 이 비어 있다.
+        self.db_executor.run.return_value = (True, self.session_entity())
+        await self.video_service.get_upload_progress(case_id=1, session_id=2, user_id=3)
+        self.db_executor.run.return_value = (True, self.session_entity("encoded.mp4"))
+        self.video_repo.get_object = AsyncMock(return_value={"Body": "body"})
+
+        video = await self.video_service.download_video(1, 2, 3)
+
+        self.assertEqual(video, {"Body": "body"})
+        self.video_repo.get_object.assert_awaited_once_with("encoded.mp4", byte_range=None)
+        self.assertEqual(self.db_executor.run.await_count, 2)
+
+    async def test_progress_and_presigned_use_cached_session(self):
+        self.db_executor.run.return_value = (True, self.session_entity())
+        self.video_repo.get_presigned_url = AsyncMock(return_value="https://s3/upload")
+
+        await self.video_service.get_upload_progress(case_id=1, session_id=2, user_id=3)
+        await self.video_service.get_upload_progress(case_id=1, session_id=2, user_id=3)
+        await self.video_service.get_presigned_url(case_id=1, session_id=2, user_id=3)
+
+        self.assertEqual(self.db_executor.run.await_count, 1)
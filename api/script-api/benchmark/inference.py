@@ -0,0 +1,124 @@
+"""inference profile 별 정확도 / 속도 benchmark.
+
+reference clip 을 profile 마다 새 프로세스에서 전사하고, 정답 transcript 대비 CER 과
+모델 로딩 시간, 전사 시간, real-time factor, 화자 embedding 시간을 비교한다.
+
+    cd api/script-api
+    PHASE=LOCAL poetry run python -m benchmark.inference --audio ref.wav --reference ref.txt \
+        --profiles default cpu_int8
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from queue import Empty
+
+from dependency_injector import providers
+
+
+def wait_result(process, queue):
+    # child 는 queue 에 넣은 결과가 다 읽힐 때까지 끝나지 않으므로 join 보다 get 을 먼저 한다.
+    # 결과를 넣지 못하고 죽었으면 None 을 돌려준다.
+    while True:
+        try:
+            return queue.get(timeout=1)
+        except Empty:
+            if not process.is_alive():
+                try:
+                    return queue.get(timeout=1)
+                except Empty:
+                    return None
+
+
+def edit_distance(source: str, target: str) -> int:
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i]
+        for j, target_char in enumerate(target, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (source_char != target_char)))
+        previous = current
+    return previous[-1]
+
+
+def character_error_rate(hypothesis: str, reference: str) -> float:
+    # 띄어쓰기 차이는 무시하고 글자 단위로 비교한다.
+    hypothesis = "".join(hypothesis.split())
+    reference = "".join(reference.split())
+    return edit_distance(hypothesis, reference) / max(len(reference), 1)
+
+
+def run_profile(profile_name: str, inference_config: dict, audio_path: str, reference: str, queue):
+    from script.service.audio import AudioExtractor, SAMPLE_RATE
+    from script.service.inference_profile import InferenceProfile
+    from script.service.model_backend import LocalModelBackend
+    import numpy as np
+
+    profile = InferenceProfile.from_config({**inference_config, "profile": profile_name})
+    audio = AudioExtractor().load_audio(audio_path)
+
+    started = time.perf_counter()
+    backend = LocalModelBackend(profile=profile)
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    segments = backend.transcribe(audio)
+    transcribe_seconds = time.perf_counter() - started
+
+    waveforms = [audio[int(seg["start"] * SAMPLE_RATE):int(seg["end"] * SAMPLE_RATE)] for seg in segments]
+    waveforms = [waveform for waveform in waveforms if len(waveform)]
+    embed_seconds = 0.0
+    if waveforms:
+        lengths = np.array([len(waveform) for waveform in waveforms], dtype=np.float32)
+        wavs = np.zeros((len(waveforms), int(lengths.max())), dtype=np.float32)
+        for idx, waveform in enumerate(waveforms):
+            wavs[idx, :len(waveform)] = waveform
+        started = time.perf_counter()
+        backend.embed(wavs, lengths / lengths.max())
+        embed_seconds = time.perf_counter() - started
+
+    hypothesis = " ".join(seg["text"] for seg in segments)
+    queue.put({
+        "profile": profile_name,
+        "load": load_seconds,
+        "transcribe": transcribe_seconds,
+        "rtf": transcribe_seconds / max(len(audio) / SAMPLE_RATE, 1e-6),
+        "embed": embed_seconds,
+        "cer": character_error_rate(hypothesis, reference) if reference else None,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--audio", required=True)
+    parser.add_argument("--reference", help="정답 transcript (text 파일)")
+    parser.add_argument("--profiles", nargs="+", default=["default", "cpu_int8"])
+    args = parser.parse_args()
+
+    config = providers.Configuration()
+    config.from_yaml(f"./script/config-{os.getenv('PHASE', 'LOCAL')}.yaml")
+    inference_config = config.inference() or {}
+    reference = ""
+    if args.reference:
+        with open(args.reference, encoding="UTF-8") as f:
+            reference = f.read()
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    print(f"{'profile':<12}{'load(s)':>9}{'stt(s)':>9}{'RTF':>7}{'embed(s)':>10}{'CER':>8}")
+    for profile_name in args.profiles:
+        process = context.Process(target=run_profile,
+                                  args=(profile_name, inference_config, args.audio, reference, queue))
+        process.start()
+        result = wait_result(process, queue)
+        process.join()
+        if result is None or process.exitcode != 0:
+            print(f"{profile_name:<12} failed (exit code {process.exitcode})")
+            continue
+        cer = "-" if result["cer"] is None else f"{result['cer']:.3f}"
+        print(f"{result['profile']:<12}{result['load']:>9.1f}{result['transcribe']:>9.1f}"
+              f"{result['rtf']:>7.2f}{result['embed']:>10.2f}{cer:>8}")
+
+
+if __name__ == "__main__":
+    main()
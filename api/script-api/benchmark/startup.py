@@ -0,0 +1,70 @@
+"""script-api 시작 시간 benchmark.
+
+1) 무거운 module 을 각각 새 python 프로세스에서 import 해서 import 시간을 잰다.
+2) LocalModelBackend 를 lazy 로 만든 뒤 ModelWarmup(eager) 으로 component 별 로딩 시간을 잰다.
+
+    cd api/script-api
+    PHASE=LOCAL poetry run python -m benchmark.startup
+    PHASE=LOCAL poetry run python -m benchmark.startup --skip-models
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+MODULES = [
+    "script.container",
+    "numpy",
+    "torch",
+    "torchaudio",
+    "transformers",
+    "whisperx",
+    "speechbrain.inference.speaker",
+    "langchain_openai",
+    "moviepy.editor",
+    "pydub",
+]
+
+
+def measure_import(module: str) -> float:
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"import {module}; "
+        "print(time.perf_counter() - started)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure_models() -> dict:
+    from script.service.model_backend import LocalModelBackend
+    from script.service.warmup import ModelWarmup
+
+    started = time.perf_counter()
+    backend = LocalModelBackend(lazy=True)
+    construct_seconds = time.perf_counter() - started
+
+    warmup = ModelWarmup(mode="eager")
+    warmup.start(backend)
+    return {"construct_seconds": round(construct_seconds, 3), **warmup.progress()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skip-models", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'module':<32}{'import(s)':>10}")
+    for module in MODULES:
+        seconds = measure_import(module)
+        print(f"{module:<32}{'failed' if seconds is None else f'{seconds:.2f}':>10}")
+
+    if not args.skip_models:
+        print(json.dumps(measure_models(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
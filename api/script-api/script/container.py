@@ -4,16 +4,27 @@ from core.repository.session import SessionRepository
 from core.db.connection import ConnectionManager
 from core.repository.state_type import StateTypeRepository
 from core.service.security import SecurityService
+from script.repository.session_claim import SessionClaimRepository
 from script.service.llm_service import LLMService
+from script.service.llm_cache import LLMResponseCache
 from script.service.nonverbal import NonVerbalService
 from script.service.preprocessing import PreprocessingService
+from script.service.audio import AudioExtractor
+from script.scheduler.dispatcher import JobDispatcher
 from object.storage.client import ClientManager
 from object.repository.video import VideoRepository
 from object.repository.script import ScriptRepository
 from object.service.script import ScriptService
 from object.service.video import VideoService
+from object.service.encoder import EncodingProfile, make_encoder, make_fallback_encoder
 from script.service.script import ScriptGenerateService
 from script.service.stt import SttService
+from script.service.vad import make_vad_segmenter
+from script.service.parallel_stt import ParallelTranscriber
+from script.service.model_backend import make_model_backend
+from script.service.warmup import ModelWarmup
+from script.service.inference_profile import InferenceProfile
+from script.service.transcription_cache import TranscriptionCache
 
 
 class Container(containers.DeclarativeContainer):
@@ -27,6 +38,13 @@ class Container(containers.DeclarativeContainer):
         aws_access_key_id=config.aws.access_key,
         aws_secret_access_key=config.aws.secret_key,
         region_name=config.aws.region,
+        multipart_threshold=config.aws.transfer.multipart_threshold,
+        multipart_chunksize=config.aws.transfer.multipart_chunksize,
+        max_concurrency=config.aws.transfer.max_concurrency,
+        max_pool_connections=config.aws.transfer.max_pool_connections,
+        max_attempts=config.aws.transfer.max_attempts,
+        retry_mode=config.aws.transfer.retry_mode,
+        per_thread_client=config.aws.transfer.per_thread_client,
     )
 
     video_repository = providers.Singleton(
@@ -41,9 +59,31 @@ class Container(containers.DeclarativeContainer):
         client_manager=client_manager,
     )
 
+    encoding_profile = providers.Singleton(
+        EncodingProfile,
+        fps=config.encoding.fps,
+        codec=config.encoding.codec,
+        bitrate=config.encoding.bitrate,
+        audio_codec=config.encoding.audio_codec,
+        audio_bitrate=config.encoding.audio_bitrate,
+        preset=config.encoding.preset,
+    )
+
+    video_encoder = providers.Singleton(
+        make_encoder,
+        backend=config.encoding.backend,
+        profile=encoding_profile,
+    )
+
     video_service = providers.Singleton(
         VideoService,
         video_repository=video_repository,
+        encoder=video_encoder,
+        fallback_encoder=providers.Singleton(
+            make_fallback_encoder, encoder=video_encoder, profile=encoding_profile
+        ),
+        pipeline=config.encoding.pipeline,
+        part_size=config.encoding.part_size,
     )
 
     script_service = providers.Singleton(
@@ -74,12 +114,29 @@ class Container(containers.DeclarativeContainer):
         StateTypeRepository, connection_manager=connection_manager
     )
 
+    session_claim_repository = providers.Singleton(
+        SessionClaimRepository, connection_manager=connection_manager
+    )
+
     # service
+    llm_response_cache = providers.Singleton(
+        LLMResponseCache,
+        external_volume_path=config.external_volume.path,
+        ttl_seconds=config.open_ai.cache.ttl_seconds,
+        max_entries=config.open_ai.cache.max_entries,
+    )
+
     llm_service = providers.Singleton(
         LLMService,
         model_name=config.open_ai.model,
         token=config.open_ai.token,
-        temperature=config.open_ai.temperature
+        temperature=config.open_ai.temperature,
+        response_cache=llm_response_cache,
+        backend=config.open_ai.backend,
+        stub_responses=config.open_ai.stub_responses,
+        max_concurrency=config.open_ai.max_concurrency,
+        tokens_per_minute=config.open_ai.tokens_per_minute,
+        max_retries=config.open_ai.max_retries,
     )
 
     non_verbal_service = providers.Singleton(
@@ -88,6 +145,24 @@ class Container(containers.DeclarativeContainer):
     )
 
 
+    job_dispatcher = providers.Singleton(JobDispatcher)
+
+    audio_extractor = providers.Singleton(
+        AudioExtractor,
+        window_seconds=config.preprocessing.window_seconds,
+    )
+
+    vad_segmenter = providers.Singleton(
+        make_vad_segmenter,
+        enabled=config.preprocessing.vad.enabled,
+        min_energy_db=config.preprocessing.vad.min_energy_db,
+        noise_margin_db=config.preprocessing.vad.noise_margin_db,
+        min_silence_seconds=config.preprocessing.vad.min_silence_seconds,
+        max_gap_seconds=config.preprocessing.vad.max_gap_seconds,
+        min_speech_ratio=config.preprocessing.vad.min_speech_ratio,
+        max_window_seconds=config.preprocessing.window_seconds,
+    )
+
     preprocessing_service = providers.Singleton(
         PreprocessingService,
         connection_manager=connection_manager,
@@ -95,11 +170,55 @@ class Container(containers.DeclarativeContainer):
         video_service=video_service,
         video_split_output_path=config.preprocessing.video_split_output_path,
         encoding_video_output=config.preprocessing.encoding_video_output,
+        audio_extractor=audio_extractor,
+        job_dispatcher=job_dispatcher,
+        vad_segmenter=vad_segmenter,
+        session_claim_repository=session_claim_repository,
+    )
+
+    transcription_cache = providers.Singleton(
+        TranscriptionCache,
+        external_volume_path=config.external_volume.path,
+        max_size_mb=config.stt_cache.max_size_mb,
+    )
+
+    inference_profile = providers.Singleton(
+        InferenceProfile.from_config,
+        config.inference,
+    )
+
+    parallel_transcriber = providers.Singleton(
+        ParallelTranscriber,
+        workers=config.stt.parallel.workers,
+        threads_per_worker=config.stt.parallel.threads_per_worker,
+        batch_size=config.stt.parallel.batch_size,
+        profile=inference_profile,
+    )
+
+    model_backend = providers.Singleton(
+        make_model_backend,
+        mode=config.model_server.mode,
+        socket_path=config.model_server.socket_path,
+        authkey=config.model_server.authkey,
+        align_model_cache_size=config.stt.align_model_cache_size,
+        profile=inference_profile,
+    )
+
+    model_warmup = providers.Singleton(
+        ModelWarmup,
+        mode=config.warmup.mode,
+        max_attempts=config.warmup.max_attempts,
+        retry_seconds=config.warmup.retry_seconds,
     )
 
     stt_service = providers.Singleton(
         SttService,
-        llm_service=llm_service
+        llm_service=llm_service,
+        model_backend=model_backend,
+        audio_extractor=audio_extractor,
+        verification_batch_size=config.stt.verification_batch_size,
+        transcription_cache=transcription_cache,
+        transcriber=parallel_transcriber,
     )
 
     script_generate_service = providers.Singleton(
@@ -112,4 +231,6 @@ class Container(containers.DeclarativeContainer):
         external_volume_path=config.external_volume.path,
         stt_service=stt_service,
         non_verbal_service=non_verbal_service,
+        audio_mode=config.preprocessing.audio_mode,
+        session_claim_repository=session_claim_repository,
     )
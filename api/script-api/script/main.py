@@ -21,6 +21,8 @@ container = Container()
 container.config.from_yaml(f"./script/config-{os.getenv('PHASE','LOCAL')}.yaml")
 
 container.wire(packages=["script.route", "script.scheduler"])
+# 모델은 background 로 올리고 진행 상태는 /readiness 로 확인한다.
+container.model_warmup().start(container.model_backend())
 origins = [
     "http://localhost",
     "http://localhost:3000",
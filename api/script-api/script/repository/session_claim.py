@@ -0,0 +1,36 @@
+from sqlalchemy import update
+
+from core.db.connection import ConnectionManager
+from core.model.entity.session import SessionEntity
+
+
+class SessionClaimRepository:
+    """조건부 UPDATE 로 session 의 작업 상태를 선점한다.
+
+    여러 worker 프로세스/pod 가 같은 READY session 을 골라도 state 가 아직 from_state 인 row 를
+    바꾼 한 곳(rowcount == 1)만 claim 에 성공한다.
+    """
+
+    def __init__(self, connection_manager: ConnectionManager):
+        self.connection_manager = connection_manager
+
+    def claim(self, session_id: int, state_field: str, from_state: int, to_state: int, db_session=None) -> bool:
+        column = getattr(SessionEntity, state_field)
+        stmt = (
+            update(SessionEntity)
+            .where(SessionEntity.id == session_id, column == from_state)
+            .values({state_field: to_state})
+        )
+        session = db_session or self.connection_manager.make_session()
+        try:
+            result = session.execute(stmt)
+            if db_session is None:
+                session.commit()
+        except Exception:
+            if db_session is None:
+                session.rollback()
+            raise
+        finally:
+            if db_session is None:
+                session.close()
+        return result.rowcount == 1
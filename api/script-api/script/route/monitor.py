@@ -1,6 +1,13 @@
-from dependency_injector.wiring import inject
+from dependency_injector.wiring import inject, Provide
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from script.container import Container
+from script.service.stt import SttService
+from script.service.transcription_cache import TranscriptionCache
+from script.service.llm_cache import LLMResponseCache
+from script.service.warmup import ModelWarmup
 
 router = APIRouter()
 
@@ -13,5 +20,25 @@ async def get_liveness():
 
 @router.post("/readiness", tags=["Get"])
 @inject
-async def get_readiness():
-    return "OK"
+async def get_readiness(model_warmup: ModelWarmup = Depends(Provide[Container.model_warmup])):
+    # 모델 warm-up 이 끝나기 전에는 503 과 함께 component 별 진행 상태를 돌려준다.
+    progress = model_warmup.progress()
+    return JSONResponse(status_code=200 if progress["ready"] else 503, content=progress)
+
+
+@router.get("/models", tags=["Get"])
+@inject
+async def get_models(stt_service: SttService = Depends(Provide[Container.stt_service])):
+    return stt_service.model_backend.stats()
+
+
+@router.get("/cache", tags=["Get"])
+@inject
+async def get_cache(
+    transcription_cache: TranscriptionCache = Depends(Provide[Container.transcription_cache]),
+    llm_response_cache: LLMResponseCache = Depends(Provide[Container.llm_response_cache]),
+):
+    return {
+        "transcription_cache": transcription_cache.stats(),
+        "llm_response_cache": llm_response_cache.stats(),
+    }
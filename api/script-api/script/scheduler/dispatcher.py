@@ -0,0 +1,47 @@
+import threading
+import traceback
+
+SCRIPT_STAGE = "script"
+ENCODING_STAGE = "encoding"
+
+
+class JobDispatcher:
+    """stage 별 job 을 notify 즉시 실행하는 in-process job queue.
+
+    stage 마다 dispatcher thread 하나가 돌고, 실행 중에 들어온 notify 는 합쳐서 한 번 더 실행한다.
+    """
+
+    def __init__(self):
+        self._handlers = {}
+        self._events = {}
+        self._threads = {}
+
+    def register(self, stage: str, handler):
+        self._handlers[stage] = handler
+        self._events[stage] = threading.Event()
+
+    def notify(self, stage: str):
+        event = self._events.get(stage)
+        if event is None:
+            print(f"[JobDispatcher] no handler for stage [{stage}]")
+            return
+        event.set()
+
+    def start(self):
+        for stage in self._handlers:
+            if stage in self._threads:
+                continue
+            thread = threading.Thread(target=self._loop, args=(stage,),
+                                      name=f"job-dispatcher-{stage}", daemon=True)
+            self._threads[stage] = thread
+            thread.start()
+
+    def _loop(self, stage: str):
+        event = self._events[stage]
+        while True:
+            event.wait()
+            event.clear()
+            try:
+                self._handlers[stage]()
+            except Exception:
+                traceback.print_exc()
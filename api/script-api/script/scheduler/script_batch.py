@@ -1,24 +1,67 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from apscheduler.schedulers.background import BackgroundScheduler
 from script.container import Container
 from dependency_injector.wiring import inject, Provide
 
+from script.scheduler.dispatcher import JobDispatcher, SCRIPT_STAGE, ENCODING_STAGE
 from script.service.preprocessing import PreprocessingService
 from script.service.script import ScriptGenerateService
 
 sched = BackgroundScheduler(timezone='Asia/Seoul')
 
+_worker_pools = {}
+_worker_pools_lock = threading.Lock()
+
+
+def get_worker_pool(stage: str, workers: int) -> ThreadPoolExecutor:
+    # stage 마다 thread pool 하나를 프로세스가 끝날 때까지 쓴다.
+    # poll 마다 thread 를 새로 만들면 per_thread_client 의 S3 client 와 connection pool 도 매번 새로 만들어진다.
+    with _worker_pools_lock:
+        pool = _worker_pools.get(stage)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{stage}-worker")
+            _worker_pools[stage] = pool
+        return pool
+
+
+def drain(job, executor: ThreadPoolExecutor, workers: int):
+    # 각 worker 는 READY 세션이 없을 때까지 계속 claim 해서 처리한다.
+    def worker():
+        while job():
+            pass
+
+    futures = [executor.submit(worker) for _ in range(workers)]
+    for future in futures:
+        future.result()
+
 
-@sched.scheduled_job('cron', second='0', id='script')
 @inject
-def script_job(script_generate_service: ScriptGenerateService = Provide[Container.script_generate_service]):
+def script_job(script_generate_service: ScriptGenerateService = Provide[Container.script_generate_service],
+               workers: int = Provide[Container.config.scheduler.script_workers]):
     print("script start")
-    script_generate_service.run_from_db()
+    drain(script_generate_service.run_from_db, get_worker_pool(SCRIPT_STAGE, workers), workers)
 
-@sched.scheduled_job('cron', second='0', id='encoding')
 @inject
-def encoding_job(preprocessing_service: PreprocessingService = Provide[Container.preprocessing_service]):
+def encoding_job(preprocessing_service: PreprocessingService = Provide[Container.preprocessing_service],
+                 workers: int = Provide[Container.config.scheduler.encoding_workers]):
     print("encoding start")
-    preprocessing_service.download_and_upload_encode_video()
+    drain(preprocessing_service.download_and_upload_encode_video, get_worker_pool(ENCODING_STAGE, workers), workers)
+
+@inject
+def start_stt(job_dispatcher: JobDispatcher = Provide[Container.job_dispatcher],
+              script_sweep_seconds: int = Provide[Container.config.scheduler.script_sweep_seconds],
+              encoding_poll_seconds: int = Provide[Container.config.scheduler.encoding_poll_seconds]):
+    # 인코딩이 끝나면 PreprocessingService 가 바로 script stage 를 notify 한다.
+    # script sweep 은 재시작/누락 복구용 fallback 이다.
+    job_dispatcher.register(SCRIPT_STAGE, script_job)
+    job_dispatcher.register(ENCODING_STAGE, encoding_job)
+    job_dispatcher.start()
 
-def start_stt():
+    sched.add_job(job_dispatcher.notify, 'interval', args=[SCRIPT_STAGE],
+                  seconds=script_sweep_seconds, id='script')
+    sched.add_job(job_dispatcher.notify, 'interval', args=[ENCODING_STAGE],
+                  seconds=encoding_poll_seconds, id='encoding')
     sched.start()
+    job_dispatcher.notify(SCRIPT_STAGE)
@@ -0,0 +1,94 @@
+import os
+import subprocess
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+class AudioWindow(NamedTuple):
+    offset: float  # 원본 오디오 기준 window 시작 시각(초)
+    audio: np.ndarray  # 16kHz mono float32 PCM
+
+
+class AudioExtractor:
+    """ffmpeg 으로 영상의 오디오 트랙을 한 번만 decode 해서 16kHz mono PCM 으로 추출하고 window 로 나눈다."""
+
+    def __init__(self, window_seconds: int = 120, sample_rate: int = SAMPLE_RATE,
+                 read_block_seconds: int = 10):
+        self.window_seconds = window_seconds
+        self.sample_rate = sample_rate
+        self.read_block_seconds = read_block_seconds
+
+    def extract_to_raw(self, video_path, output_path) -> np.memmap:
+        # float32 raw 파일로 흘려 쓰고 memmap 으로 열어 전체 오디오를 RAM 에 올리지 않는다.
+        output_path = Path(output_path)
+        os.makedirs(output_path.parent, exist_ok=True)
+        block_bytes = self.read_block_seconds * self.sample_rate * 2
+        process = self._open_ffmpeg(video_path)
+        try:
+            with open(output_path, "wb") as f:
+                while True:
+                    data = self._read_exactly(process.stdout, block_bytes)
+                    if not data:
+                        break
+                    (np.frombuffer(data, np.int16).astype(np.float32) / 32768.0).tofile(f)
+            self._wait_ffmpeg(process, video_path)
+        finally:
+            self._kill_ffmpeg(process)
+        return self.load_raw(output_path)
+
+    def load_audio(self, audio_path) -> np.ndarray:
+        # 짧은 오디오 파일(_part_N.mp3 등)을 16kHz mono float32 로 한 번에 decode 한다.
+        process = self._open_ffmpeg(audio_path)
+        try:
+            data = process.stdout.read()
+            self._wait_ffmpeg(process, audio_path)
+        finally:
+            self._kill_ffmpeg(process)
+        return np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+
+    def load_raw(self, raw_path) -> np.memmap:
+        if os.path.getsize(raw_path) == 0:
+            return np.zeros(0, dtype=np.float32)
+        return np.memmap(raw_path, dtype=np.float32, mode="r")
+
+    def iter_windows(self, audio: np.ndarray) -> Iterator[AudioWindow]:
+        window_samples = self.window_seconds * self.sample_rate
+        for start in range(0, len(audio), window_samples):
+            yield AudioWindow(offset=start / self.sample_rate,
+                              audio=audio[start:start + window_samples])
+
+    def _open_ffmpeg(self, video_path) -> subprocess.Popen:
+        cmd = [
+            "ffmpeg", "-nostdin", "-threads", "0",
+            "-i", str(video_path),
+            "-vn", "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le",
+            "-ar", str(self.sample_rate), "-",
+        ]
+        return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def _wait_ffmpeg(self, process: subprocess.Popen, video_path):
+        if process.wait() != 0:
+            raise RuntimeError(f"Cannot extract audio: '{video_path}'. ffmpeg exit code {process.returncode}")
+
+    def _kill_ffmpeg(self, process: subprocess.Popen):
+        # 추출이 중간에 실패하면 ffmpeg 도 함께 정리한다.
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+    @staticmethod
+    def _read_exactly(stream, size: int) -> bytes:
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            data = stream.read(remaining)
+            if not data:
+                break
+            chunks.append(data)
+            remaining -= len(data)
+        return b"".join(chunks)
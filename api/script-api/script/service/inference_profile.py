@@ -0,0 +1,37 @@
+from typing import NamedTuple
+
+# 배포 환경별 추론 설정. config 의 inference.profiles 로 덮어쓰거나 추가할 수 있다.
+DEFAULT_PROFILES = {
+    # GPU 면 float16, CPU 면 float32 (기존 동작)
+    "default": {"compute_type": "auto", "quantize_speaker_models": False},
+    # CPU 노드용: whisper 는 CTranslate2 int8, speechbrain 모델은 Linear layer 를 dynamic int8 quantization
+    "cpu_int8": {"compute_type": "int8", "quantize_speaker_models": True},
+}
+
+
+class InferenceProfile(NamedTuple):
+    name: str = "default"
+    compute_type: str = "auto"  # auto | float16 | float32 | int8 | int8_float16
+    quantize_speaker_models: bool = False
+    batch_size: int = 16
+    torch_threads: int = 0  # 0 이면 torch 기본값
+    whisper_threads: int = 4  # CTranslate2 CPU thread 수
+
+    @classmethod
+    def from_config(cls, config: dict = None) -> "InferenceProfile":
+        config = config or {}
+        name = config.get("profile", "default")
+        profiles = {**DEFAULT_PROFILES, **(config.get("profiles") or {})}
+        if name not in profiles:
+            raise ValueError(f"Unknown inference profile: '{name}'")
+        values = {key: value for key, value in profiles[name].items() if key in cls._fields}
+        return cls(name=name, **values)
+
+    def resolve_compute_type(self, device: str) -> str:
+        if self.compute_type != "auto":
+            return self.compute_type
+        return "float16" if device == "cuda" else "float32"
+
+    def signature(self) -> dict:
+        # 결과에 영향을 주는 설정만 cache key 에 넣는다. (thread 수 제외)
+        return {"profile": self.name, "quantize_speaker_models": self.quantize_speaker_models}
@@ -0,0 +1,68 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class LLMResponseCache:
+    """LLM 응답(raw text)을 SQLite 에 저장하는 TTL / 개수 제한 cache."""
+
+    def __init__(self, external_volume_path: str, ttl_seconds: int = 7 * 24 * 3600,
+                 max_entries: int = 10000):
+        os.makedirs(external_volume_path, exist_ok=True)
+        self.path = os.path.join(external_volume_path, "llm_cache.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hit_count = 0
+        self.miss_count = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_response ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_response_accessed_at ON llm_response (accessed_at)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response FROM llm_response WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is None:
+                self.miss_count += 1
+                return None
+            self._conn.execute("UPDATE llm_response SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hit_count += 1
+            return row[0]
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response (key, response, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            self._conn.execute("DELETE FROM llm_response WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                "DELETE FROM llm_response WHERE key IN ("
+                "SELECT key FROM llm_response ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM llm_response").fetchone()[0]
+            return {
+                "hit_count": self.hit_count,
+                "miss_count": self.miss_count,
+                "size": size,
+                "max_entries": self.max_entries,
+            }
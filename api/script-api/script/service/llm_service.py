@@ -1,29 +1,265 @@
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from openai import RateLimitError
+
 from langchain.output_parsers import PydanticOutputParser
 from langchain_openai import ChatOpenAI
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
 from langchain_core.prompts import PromptTemplate
-from typing import TypeVar, Type
+from typing import List, TypeVar, Type
+
+from script.service.llm_cache import LLMResponseCache
+
 T = TypeVar("T")
 
 
+class RateLimiter:
+    """LLMService 전체(sync / async, 모든 thread 와 event loop)가 함께 쓰는 동시 요청 수 / 분당 token 예산.
+
+    lock 은 threading.Lock 이고 기다리는 쪽이 time.sleep / asyncio.sleep 으로 다시 시도하므로
+    asyncio.run 으로 event loop 가 새로 만들어져도 예산이 초기화되지 않는다.
+    """
+
+    def __init__(self, max_concurrency: int, tokens_per_minute: int, poll_seconds: float = 0.05):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.poll_seconds = poll_seconds
+        self.active = 0
+        self.used_tokens = deque()  # (timestamp, tokens)
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: int) -> float:
+        # 자리가 나면 0 을, 아니면 다시 시도할 때까지 기다릴 시간(초)을 돌려준다.
+        tokens = min(tokens, self.tokens_per_minute)
+        with self._lock:
+            now = time.monotonic()
+            while self.used_tokens and self.used_tokens[0][0] <= now - 60:
+                self.used_tokens.popleft()
+            if self.active >= self.max_concurrency:
+                return self.poll_seconds
+            if sum(used for _, used in self.used_tokens) + tokens > self.tokens_per_minute:
+                return max(self.poll_seconds, self.used_tokens[0][0] + 60 - now)
+            self.active += 1
+            self.used_tokens.append((now, tokens))
+            return 0
+
+    def acquire(self, tokens: int):
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int):
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+
+
 class LLMService:
 
-    def __init__(self, model_name: str, token: str, temperature: float = 0.5):
+    def __init__(self, model_name: str, token: str, temperature: float = 0.5,
+                 response_cache: LLMResponseCache = None, backend: str = "openai",
+                 stub_responses: List[str] = None, max_concurrency: int = 8,
+                 tokens_per_minute: int = 30000, max_retries: int = 5):
         self.model_name = model_name
-        self.model = ChatOpenAI(openai_api_key=token)
-        self.model.model_name = self.model_name
+        if backend == "stub":
+            # 로컬 테스트용: OpenAI 호출 없이 정해진 응답을 순서대로 돌려준다.
+            self.model = FakeListChatModel(responses=stub_responses or ["{}"])
+        else:
+            self.model = ChatOpenAI(openai_api_key=token, temperature=temperature)
+            self.model.model_name = self.model_name
         self.temperature = temperature
+        self.response_cache = response_cache
+
+        self._parsers = {}
+        self._templates = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        self.max_retries = max_retries
+        self.rate_limiter = RateLimiter(max_concurrency, tokens_per_minute)
 
     def run(
             self, system_prompt: str, prompt: str, variables: dict, class_type: Type[T]
     ):
-        parser = PydanticOutputParser(pydantic_object=class_type)
-        prompt_template = PromptTemplate(
-            template=system_prompt + prompt + "\n{format_instructions}\n",
-            input_variables=list(variables.keys()),
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
+        parser, prompt_template = self._get_prompt_template(system_prompt, prompt, variables, class_type)
+        rendered_prompt = prompt_template.format(**variables)
+        cache_key = self._cache_key(rendered_prompt, parser)
 
         # And a query intended to prompt a language model to populate the data structure.
         prompt_and_model = prompt_template | self.model
-        output = prompt_and_model.invoke(variables)
-        return parser.invoke(output)
+        output = self._invoke_once(cache_key, rendered_prompt, lambda: prompt_and_model.invoke(variables))
+        return parser.parse(output)
+
+    async def arun(
+            self, system_prompt: str, prompt: str, variables: dict, class_type: Type[T]
+    ):
+        parser, prompt_template = self._get_prompt_template(system_prompt, prompt, variables, class_type)
+        rendered_prompt = prompt_template.format(**variables)
+        cache_key = self._cache_key(rendered_prompt, parser)
+
+        prompt_and_model = prompt_template | self.model
+        output = await self._ainvoke_once(
+            cache_key, rendered_prompt, lambda: prompt_and_model.ainvoke(variables)
+        )
+        return parser.parse(output)
+
+    async def arun_batch(
+            self, system_prompt: str, prompt: str, variables_list: List[dict], class_type: Type[T]
+    ) -> List[T]:
+        # 결과는 variables_list 순서 그대로 돌려준다.
+        return await asyncio.gather(*[
+            self.arun(system_prompt, prompt, variables, class_type) for variables in variables_list
+        ])
+
+    def run_batch(
+            self, system_prompt: str, prompt: str, variables_list: List[dict], class_type: Type[T]
+    ) -> List[T]:
+        coroutine = self.arun_batch(system_prompt, prompt, variables_list, class_type)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # 이미 event loop 가 돌고 있는 thread 에서 부르면 별도 thread 의 event loop 에서 실행한다.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-batch") as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    def _get_prompt_template(self, system_prompt: str, prompt: str, variables: dict, class_type: Type[T]):
+        # parser / template 은 class_type, prompt 별로 한 번만 만든다.
+        template_key = (class_type, system_prompt, prompt, tuple(variables.keys()))
+        with self._lock:
+            parser = self._parsers.get(class_type)
+            if parser is None:
+                parser = PydanticOutputParser(pydantic_object=class_type)
+                self._parsers[class_type] = parser
+
+            prompt_template = self._templates.get(template_key)
+            if prompt_template is None:
+                prompt_template = PromptTemplate(
+                    template=system_prompt + prompt + "\n{format_instructions}\n",
+                    input_variables=list(variables.keys()),
+                    partial_variables={"format_instructions": parser.get_format_instructions()},
+                )
+                self._templates[template_key] = prompt_template
+        return parser, prompt_template
+
+    def _cache_key(self, rendered_prompt: str, parser: PydanticOutputParser) -> str:
+        # format instructions 에 output schema 가 포함되어 있어 schema 가 바뀌면 key 도 바뀐다.
+        payload = json.dumps({
+            "model": self.model_name,
+            "temperature": self.temperature,
+            "prompt": rendered_prompt,
+            "schema": parser.get_format_instructions(),
+        }, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _invoke_once(self, cache_key: str, rendered_prompt: str, invoke) -> str:
+        if self.response_cache is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # 같은 요청이 동시에 들어오면 먼저 들어온 요청의 결과를 같이 기다린다.
+        future, is_owner = self._join_inflight(cache_key)
+        if not is_owner:
+            return future.result()
+
+        try:
+            self.rate_limiter.acquire(self._estimate_tokens(rendered_prompt))
+            try:
+                output = self._invoke_with_retry(invoke)
+            finally:
+                self.rate_limiter.release()
+            return self._complete(cache_key, future, output)
+        except Exception as e:
+            self._fail(cache_key, future, e)
+            raise
+
+    async def _ainvoke_once(self, cache_key: str, rendered_prompt: str, ainvoke) -> str:
+        if self.response_cache is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # in-flight future 는 thread / event loop 와 상관없이 공유하므로 sync run 과도 합쳐진다.
+        future, is_owner = self._join_inflight(cache_key)
+        if not is_owner:
+            return await asyncio.wrap_future(future)
+
+        try:
+            await self.rate_limiter.aacquire(self._estimate_tokens(rendered_prompt))
+            try:
+                output = await self._ainvoke_with_retry(ainvoke)
+            finally:
+                self.rate_limiter.release()
+            return self._complete(cache_key, future, output)
+        except Exception as e:
+            self._fail(cache_key, future, e)
+            raise
+
+    def _join_inflight(self, cache_key: str):
+        with self._lock:
+            future = self._inflight.get(cache_key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[cache_key] = future
+            return future, True
+
+    def _complete(self, cache_key: str, future: Future, output: str) -> str:
+        if self.response_cache is not None:
+            self.response_cache.put(cache_key, output)
+        with self._lock:
+            self._inflight.pop(cache_key, None)
+        future.set_result(output)
+        return output
+
+    def _fail(self, cache_key: str, future: Future, error: Exception):
+        with self._lock:
+            self._inflight.pop(cache_key, None)
+        if not future.done():
+            future.set_exception(error)
+
+    @staticmethod
+    def _estimate_tokens(rendered_prompt: str) -> int:
+        # 한국어 prompt 기준 대략 2글자당 1 token 으로 추정한다.
+        return len(rendered_prompt) // 2 + 1
+
+    def _invoke_with_retry(self, invoke) -> str:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return invoke().content
+            except RateLimitError:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                time.sleep(delay)
+
+    async def _ainvoke_with_retry(self, ainvoke) -> str:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return (await ainvoke()).content
+            except RateLimitError:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                await asyncio.sleep(delay)
+
+    def _retry_delay(self, attempt: int) -> float:
+        delay = min(60, 2 ** attempt) + random.random()
+        print(f"[LLMService] rate limited, retry {attempt + 1}/{self.max_retries} after {delay:.1f}s")
+        return delay
@@ -0,0 +1,264 @@
+import threading
+import time
+from multiprocessing.connection import Client
+from typing import List
+
+import numpy as np
+
+from script.service.inference_profile import InferenceProfile
+
+
+class LocalModelBackend:
+    """현재 프로세스에 whisperx / ECAPA / WavLM 모델을 올려서 바로 추론한다.
+
+    입출력은 numpy array 와 dict 로만 주고받아서 model server 로 그대로 넘길 수 있다.
+    lazy 이면 torch 등 무거운 import 와 모델 로딩을 처음 쓸 때(또는 warm-up 때)로 미룬다.
+    """
+
+    mode = "local"
+
+    def __init__(self, model_name: str = "large-v2", language: str = "ko",
+                 align_model_cache_size: int = 2, lazy: bool = False,
+                 profile: InferenceProfile = None):
+        self.model_name = model_name
+        self.language = language
+        self.profile = profile or InferenceProfile()
+        self.batch_size = self.profile.batch_size  # reduce if low on GPU mem
+        self.align_model_cache_size = align_model_cache_size
+        self.device = None
+        self.compute_type = None
+        self.models = {}
+        self.load_seconds = {}
+        self._load_lock = threading.RLock()
+        if not lazy:
+            for _, load in self.warmup_components():
+                load()
+
+    @property
+    def model(self):
+        return self._get("whisper")
+
+    @property
+    def verification(self):
+        return self._get("verification")
+
+    @property
+    def sed_model(self):
+        return self._get("emotion")
+
+    @property
+    def align_models(self):
+        return self._get("align")
+
+    def warmup_components(self) -> list:
+        # (component 이름, 로딩 함수) - warm-up 진행 상태를 component 단위로 보여준다.
+        return [
+            ("whisper", lambda: self._get("whisper")),
+            ("align", lambda: self._get("align").get(language_code=self.language, device=self.device)),
+            ("verification", lambda: self._get("verification")),
+            ("emotion", lambda: self._get("emotion")),
+        ]
+
+    def signature(self) -> dict:
+        # transcription cache key 에 들어가는 모델 설정
+        self._init_runtime()
+        return {"whisper": self.model_name, "compute_type": self.compute_type, "language": self.language,
+                **self.profile.signature()}
+
+    def transcribe(self, audio: np.ndarray) -> List[dict]:
+        import whisperx
+
+        result = self.model.transcribe(audio, language=self.language, batch_size=self.batch_size)
+        model_a, metadata = self.align_models.get(language_code=result["language"], device=self.device)
+        stt_result = whisperx.align(result["segments"],
+                                    model_a,
+                                    metadata,
+                                    audio,
+                                    self.device,
+                                    return_char_alignments=False)
+        return [{"text": seg["text"], "start": float(seg["start"]), "end": float(seg["end"])}
+                for seg in stt_result["segments"]]
+
+    def embed(self, wavs: np.ndarray, relative_lengths: np.ndarray) -> np.ndarray:
+        # (batch, samples) 16kHz waveform -> (batch, dim) ECAPA embedding
+        import torch
+
+        verification = self.verification
+        with torch.no_grad():
+            embeddings = verification.encode_batch(
+                torch.from_numpy(wavs), torch.from_numpy(relative_lengths), normalize=False)
+        return embeddings.squeeze(1).cpu().numpy()
+
+    def similarity(self, embeddings: np.ndarray, target_embedding: np.ndarray) -> np.ndarray:
+        import torch
+
+        scores = self.verification.similarity(
+            torch.from_numpy(embeddings), torch.from_numpy(target_embedding)[None])
+        return scores.reshape(-1).cpu().numpy()
+
+    def emotion(self, audio_path: str) -> dict:
+        return self.sed_model.diarize_file(audio_path)
+
+    def stats(self) -> dict:
+        align_models = self.models.get("align")
+        return {
+            "mode": self.mode,
+            "device": self.device,
+            "profile": self.profile._asdict(),
+            "loaded": sorted(self.models),
+            "load_seconds": {name: round(seconds, 2) for name, seconds in self.load_seconds.items()},
+            "align_models": align_models.stats() if align_models is not None else None,
+        }
+
+    def _init_runtime(self):
+        if self.device is not None:
+            return
+        import torch
+
+        if self.profile.torch_threads > 0:
+            torch.set_num_threads(self.profile.torch_threads)
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        # device 를 마지막에 채워서 다른 thread 가 반쯤 초기화된 상태를 보지 않게 한다.
+        self.compute_type = self.profile.resolve_compute_type(device)
+        self.device = device
+
+    def _get(self, name: str):
+        model = self.models.get(name)
+        if model is not None:
+            return model
+        with self._load_lock:
+            if name not in self.models:
+                self._init_runtime()
+                started = time.perf_counter()
+                self.models[name] = getattr(self, f"_load_{name}")()
+                self.load_seconds[name] = time.perf_counter() - started
+                print(f"[LocalModelBackend] load {name} ({self.load_seconds[name]:.1f}s)")
+            return self.models[name]
+
+    def _load_whisper(self):
+        import whisperx
+
+        return whisperx.load_model(self.model_name, self.device, compute_type=self.compute_type,
+                                   language=self.language, threads=self.profile.whisper_threads)
+
+    def _load_align(self):
+        from script.service.model_registry import AlignModelRegistry
+
+        return AlignModelRegistry(max_size=self.align_model_cache_size)
+
+    def _load_verification(self):
+        from speechbrain.inference.speaker import SpeakerRecognition
+
+        return self._quantize(SpeakerRecognition.from_hparams(source="speechbrain/spkrec-ecapa-voxceleb",
+                                                              savedir="pretrained_models/spkrec-ecapa-voxceleb",
+                                                              run_opts={"device": self.device}))
+
+    def _load_emotion(self):
+        from speechbrain.inference.diarization import Speech_Emotion_Diarization
+
+        return self._quantize(Speech_Emotion_Diarization.from_hparams(
+            source="speechbrain/emotion-diarization-wavlm-large", savedir="./tempdir",
+            run_opts={"device": self.device}))
+
+    def _quantize(self, pretrained):
+        # dynamic quantization 은 CPU 에서만 동작하고 Linear layer 만 int8 로 바꾼다.
+        if not self.profile.quantize_speaker_models or self.device != "cpu":
+            return pretrained
+        import torch
+
+        torch.ao.quantization.quantize_dynamic(pretrained.mods, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        return pretrained
+
+
+class RemoteModelBackend:
+    """model server 프로세스(script.service.model_server)에 Unix socket 으로 추론을 요청한다.
+
+    모델은 server 하나에만 올라가므로 API / scheduler worker 가 늘어나도 weight 는 한 벌만 메모리에 있다.
+    연결은 thread 별로 하나씩 유지한다.
+    """
+
+    mode = "remote"
+
+    def __init__(self, socket_path: str, authkey: str, connect_timeout: float = 300):
+        self.socket_path = socket_path
+        self.authkey = authkey.encode("utf-8")
+        self.connect_timeout = connect_timeout
+        self._local = threading.local()
+        self._signature = None
+
+    def warmup_components(self) -> list:
+        # server 가 모델을 다 올리고 socket 을 열 때까지 기다린다.
+        return [("model_server", self.signature)]
+
+    def signature(self) -> dict:
+        if self._signature is None:
+            self._signature = self._call("signature")
+        return self._signature
+
+    def transcribe(self, audio: np.ndarray) -> List[dict]:
+        return self._call("transcribe", np.ascontiguousarray(audio, dtype=np.float32))
+
+    def embed(self, wavs: np.ndarray, relative_lengths: np.ndarray) -> np.ndarray:
+        return self._call("embed", wavs, relative_lengths)
+
+    def similarity(self, embeddings: np.ndarray, target_embedding: np.ndarray) -> np.ndarray:
+        return self._call("similarity", embeddings, target_embedding)
+
+    def emotion(self, audio_path: str) -> dict:
+        return self._call("emotion", audio_path)
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "socket_path": self.socket_path, "server": self._call("stats")}
+
+    def _call(self, method: str, *args):
+        # server 가 재시작되어 연결이 끊겼으면 한 번 다시 연결해서 보낸다.
+        for attempt in range(2):
+            connection = self._get_connection()
+            try:
+                connection.send((method, args))
+                status, result = connection.recv()
+                break
+            except (EOFError, OSError):
+                self._close_connection()
+                if attempt == 1:
+                    raise
+        if status == "error":
+            raise RuntimeError(f"[RemoteModelBackend] {method} failed: {result}")
+        return result
+
+    def _get_connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+
+        # server 가 모델을 올리는 동안에는 socket 이 없으므로 connect_timeout 까지 기다린다.
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            try:
+                connection = Client(self.socket_path, family="AF_UNIX", authkey=self.authkey)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(1)
+        self._local.connection = connection
+        return connection
+
+    def _close_connection(self):
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except OSError:
+                pass
+
+
+def make_model_backend(mode: str = "local", socket_path: str = None, authkey: str = None,
+                       align_model_cache_size: int = 2, lazy: bool = True,
+                       profile: InferenceProfile = None):
+    if mode == "remote":
+        return RemoteModelBackend(socket_path=socket_path, authkey=authkey)
+    if mode != "local":
+        raise ValueError(f"Unknown model backend mode: '{mode}'")
+    return LocalModelBackend(align_model_cache_size=align_model_cache_size, lazy=lazy, profile=profile)
@@ -0,0 +1,43 @@
+import threading
+from collections import OrderedDict
+
+import whisperx
+
+
+class AlignModelRegistry:
+    """(language, device) 별 whisperx alignment model 을 lazy 하게 로드하고 LRU 로 유지한다."""
+
+    def __init__(self, max_size: int = 2):
+        self.max_size = max_size
+        self.models = OrderedDict()
+        self.load_count = 0
+        self.hit_count = 0
+        self._lock = threading.Lock()
+
+    def get(self, language_code: str, device: str):
+        key = (language_code, device)
+        with self._lock:
+            if key in self.models:
+                self.models.move_to_end(key)
+                self.hit_count += 1
+                return self.models[key]
+
+            model_a, metadata = whisperx.load_align_model(language_code=language_code, device=device)
+            self.load_count += 1
+            print(f"[AlignModelRegistry] load align model language:[{language_code}] device:[{device}]")
+
+            self.models[key] = (model_a, metadata)
+            while len(self.models) > self.max_size:
+                evicted, _ = self.models.popitem(last=False)
+                print(f"[AlignModelRegistry] evict align model {evicted}")
+            return model_a, metadata
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self.models),
+                "max_size": self.max_size,
+                "load_count": self.load_count,
+                "hit_count": self.hit_count,
+                "models": [f"{language}:{device}" for language, device in self.models.keys()],
+            }
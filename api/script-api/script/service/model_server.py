@@ -0,0 +1,90 @@
+"""SttService 용 model server.
+
+whisperx / ECAPA / WavLM 모델을 이 프로세스 하나에만 올리고 Unix socket 으로 추론 요청을 받는다.
+script-api 설정에서 model_server.mode 를 remote 로 두면 SttService 가 이 server 로 요청을 보낸다.
+
+    cd api/script-api
+    PHASE=LOCAL poetry run python -m script.service.model_server
+"""
+import os
+import threading
+import traceback
+from multiprocessing.connection import Client, Listener
+
+from dependency_injector import providers
+
+from script.service.inference_profile import InferenceProfile
+from script.service.model_backend import LocalModelBackend
+
+METHODS = ("signature", "transcribe", "embed", "similarity", "emotion", "stats")
+
+
+class ModelServer:
+    def __init__(self, backend: LocalModelBackend, socket_path: str, authkey: str):
+        self.backend = backend
+        self.socket_path = socket_path
+        self.authkey = authkey.encode("utf-8")
+        self.request_count = 0
+        self._closed = False
+        # 모델 하나를 여러 요청이 동시에 쓰지 않도록 추론은 한 번에 하나씩 처리한다.
+        self._lock = threading.Lock()
+
+    def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        with Listener(self.socket_path, family="AF_UNIX", authkey=self.authkey) as listener:
+            print(f"[ModelServer] listening on {self.socket_path}")
+            while not self._closed:
+                try:
+                    connection = listener.accept()
+                except Exception as e:
+                    print(f"[ModelServer] cannot accept connection: {e}")
+                    continue
+                if self._closed:
+                    connection.close()
+                    break
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def shutdown(self):
+        # accept 에서 기다리는 serve_forever 를 연결 하나로 깨워서 끝낸다. (socket 파일은 listener 가 정리한다)
+        # 이미 연결된 요청은 각자의 thread 에서 마저 처리된다.
+        self._closed = True
+        try:
+            Client(self.socket_path, family="AF_UNIX", authkey=self.authkey).close()
+        except OSError:
+            pass
+
+    def _handle(self, connection):
+        with connection:
+            while True:
+                try:
+                    method, args = connection.recv()
+                except (EOFError, OSError):
+                    return
+                connection.send(self._dispatch(method, args))
+
+    def _dispatch(self, method: str, args: tuple):
+        if method not in METHODS:
+            return "error", f"unknown method '{method}'"
+        try:
+            if method == "stats":
+                return "ok", {**self.backend.stats(), "request_count": self.request_count}
+            with self._lock:
+                self.request_count += 1
+                return "ok", getattr(self.backend, method)(*args)
+        except Exception as e:
+            traceback.print_exc()
+            return "error", repr(e)
+
+
+def main():
+    config = providers.Configuration()
+    config.from_yaml(f"./script/config-{os.getenv('PHASE', 'LOCAL')}.yaml")
+    backend = LocalModelBackend(align_model_cache_size=config.stt.align_model_cache_size(),
+                                profile=InferenceProfile.from_config(config.inference()))
+    ModelServer(backend, config.model_server.socket_path(), config.model_server.authkey()).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from script.service.inference_profile import InferenceProfile
+
+# worker 프로세스마다 한 번만 올리는 whisperx 모델 / align 모델 registry
+_worker = {}
+
+# chunk 경계에서 잘린 발화를 이어 붙이는 최대 간격(초)
+MERGE_MAX_GAP = 0.5
+
+
+def _init_worker(model_name: str, compute_type: str, language: str, batch_size: int,
+                 threads_per_worker: int, align_model_cache_size: int):
+    import torch
+    import whisperx
+    from script.service.model_registry import AlignModelRegistry
+
+    # worker 끼리 core 를 나눠 쓰도록 worker 당 thread 수를 제한한다.
+    torch.set_num_threads(threads_per_worker)
+    os.environ["OMP_NUM_THREADS"] = str(threads_per_worker)
+    _worker["model"] = whisperx.load_model(
+        model_name, "cpu", compute_type=compute_type, language=language,
+        threads=threads_per_worker,
+    )
+    _worker["align_models"] = AlignModelRegistry(max_size=align_model_cache_size)
+    _worker["language"] = language
+    _worker["batch_size"] = batch_size
+
+
+def _transcribe_chunk(source) -> List[dict]:
+    import whisperx
+
+    # source 는 오디오 파일 경로 또는 16kHz mono float32 array
+    audio = whisperx.load_audio(source) if isinstance(source, str) else source
+    result = _worker["model"].transcribe(audio, language=_worker["language"],
+                                         batch_size=_worker["batch_size"])
+    model_a, metadata = _worker["align_models"].get(language_code=result["language"], device="cpu")
+    aligned = whisperx.align(result["segments"], model_a, metadata, audio, "cpu",
+                             return_char_alignments=False)
+    # 프로세스 경계를 넘기므로 필요한 필드만 남긴다.
+    return [{"text": seg["text"], "start": float(seg["start"]), "end": float(seg["end"])}
+            for seg in aligned["segments"]]
+
+
+class ParallelTranscriber:
+    """chunk(2분 window / _part_N.mp3) 를 process pool 로 나눠 whisperx 전사한다. 결과는 입력 순서를 유지한다.
+
+    worker 는 각자 whisperx 모델을 올리므로 model_server.mode: remote 와 같이 쓸 수 없다. (SttService 에서 막는다)
+    """
+
+    def __init__(self, workers: int = 2, threads_per_worker: int = 2, batch_size: int = 4,
+                 model_name: str = "large-v2", compute_type: str = "float32",
+                 language: str = "ko", align_model_cache_size: int = 1,
+                 profile: InferenceProfile = None):
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.batch_size = batch_size
+        self.model_name = model_name
+        # worker 는 CPU 에서 돌리므로 profile 의 CPU compute_type 을 따른다.
+        self.compute_type = profile.resolve_compute_type("cpu") if profile is not None else compute_type
+        self.language = language
+        self.align_model_cache_size = align_model_cache_size
+        self._executor = None
+
+    def signature(self) -> dict:
+        # 순차(GPU) 경로와 결과가 달라질 수 있는 설정을 transcription cache key 에 넣는다.
+        return {
+            "parallel_workers": self.workers,
+            "parallel_model": self.model_name,
+            "parallel_compute_type": self.compute_type,
+            "parallel_batch_size": self.batch_size,
+            "parallel_language": self.language,
+        }
+
+    def map(self, sources: Iterable) -> Iterator[List[dict]]:
+        return self._get_executor().map(_transcribe_chunk, sources)
+
+    def imap(self, items: Iterable, source: Callable = None, max_in_flight: int = None) -> Iterator[Tuple]:
+        """items 를 필요한 만큼만 꺼내 전사하고 (item, segments) 를 입력 순서대로 돌려준다.
+
+        map 은 입력을 한 번에 모두 pool 로 넘기므로 window 오디오가 전부 메모리에 올라간다.
+        여기서는 worker 수의 두 배까지만 넘겨 두고, 결과를 하나 받을 때마다 다음 item 을 넘긴다.
+        """
+        executor = self._get_executor()
+        max_in_flight = max_in_flight or self.workers * 2
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(_transcribe_chunk, source(item) if source else item)))
+            if len(pending) >= max_in_flight:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # 모델 로딩 비용이 크므로 pool 은 처음 쓸 때 만들고 계속 재사용한다.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.compute_type, self.language, self.batch_size,
+                          self.threads_per_worker, self.align_model_cache_size),
+            )
+        return self._executor
+
+
+def merge_chunk_segments(chunk_segments: List[List[dict]], chunk_embeddings: List[List],
+                         boundaries: List[float], max_gap: float = MERGE_MAX_GAP) -> Tuple[List[dict], List]:
+    """chunk 별 segment(원본 기준 시각) 를 하나로 합친다.
+
+    boundaries[i] 는 i 번째 chunk 의 끝 시각이다.
+    chunk 경계에서 잘린 발화는 앞 chunk 의 마지막 segment 와 다음 chunk 의 첫 segment 로 나뉘므로,
+    앞 segment 가 자기 chunk 끝에 붙어 있고 두 segment 의 간격이 max_gap 이하이면 하나로 합친다.
+    segment 가 없는 chunk 는 건너뛰고 마지막으로 segment 를 낸 chunk 의 경계와 비교한다.
+    합친 segment 의 embedding 은 더 긴 쪽을 쓴다. (길이가 같으면 앞 chunk)
+    """
+    segments = []
+    embeddings = []
+    last_boundary = None  # segments[-1] 을 낸 chunk 의 끝 시각
+    for index, (chunk, chunk_embedding) in enumerate(zip(chunk_segments, chunk_embeddings)):
+        chunk = list(zip(chunk, chunk_embedding))
+        if not chunk:
+            continue
+        if segments:
+            last, first = segments[-1], chunk[0][0]
+            if last["end"] >= last_boundary - max_gap and first["start"] - last["end"] <= max_gap:
+                first_embedding = chunk[0][1]
+                if embeddings[-1] is None or (
+                        first_embedding is not None
+                        and first["end"] - first["start"] > last["end"] - last["start"]):
+                    embeddings[-1] = first_embedding
+                segments[-1] = {
+                    "text": f"{last['text'].rstrip()} {first['text'].lstrip()}",
+                    "start": last["start"],
+                    "end": max(last["end"], first["end"]),
+                }
+                chunk = chunk[1:]
+        for seg, embedding in chunk:
+            segments.append(seg)
+            embeddings.append(embedding)
+        last_boundary = boundaries[index]
+    return segments, embeddings
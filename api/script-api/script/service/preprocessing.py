@@ -2,35 +2,49 @@ import glob
 import os
 import re
 from pathlib import Path
-from typing import List
-
-from moviepy.editor import VideoFileClip
-from pydub import AudioSegment
+from typing import Iterator, List, Optional
 
 import traceback
 
+import numpy as np
+
 #from core.model.domain.session import Session
 from core.model.domain.state_type import StateTypeEnum
 from script.dto.preprocessing import PreprocessingResult
+from script.repository.session_claim import SessionClaimRepository
+from script.service.audio import AudioExtractor, AudioWindow, SAMPLE_RATE
+from script.service.vad import VadSegmenter
+from script.scheduler.dispatcher import JobDispatcher, SCRIPT_STAGE
 from core.repository.session import SessionRepository
 from object.service.video import VideoService
 from core.db.transaction import transaction_scope
 from core.db.connection import ConnectionManager
 
+SPEECH_INDEX_FILE = "speech_index.json"
+
 
 class PreprocessingService:
     def __init__(self, video_split_output_path: str,
                  connection_manager: ConnectionManager,
                  session_repository: SessionRepository,
                  video_service: VideoService,
-                 encoding_video_output: str):
+                 encoding_video_output: str,
+                 audio_extractor: AudioExtractor,
+                 job_dispatcher: JobDispatcher = None,
+                 vad_segmenter: VadSegmenter = None,
+                 session_claim_repository: SessionClaimRepository = None):
         self.connection_manager = connection_manager
+        self.job_dispatcher = job_dispatcher
+        self.audio_extractor = audio_extractor
+        self.vad_segmenter = vad_segmenter
         self.video_split_output_path = video_split_output_path
         self.session_repository = session_repository
         self.video_service = video_service
         self.encoding_video_output = encoding_video_output
         self.encoding_dir = os.path.join(self.encoding_video_output, "encoding")
         self.download_dir = os.path.join(self.encoding_video_output, "download")
+        # 여러 worker 프로세스/pod 가 같은 READY 세션을 가져가지 않도록 조건부 UPDATE 로 claim 한다.
+        self.session_claim_repository = session_claim_repository or SessionClaimRepository(connection_manager)
 
         if not os.path.exists(self.encoding_dir):
             try:
@@ -57,10 +71,43 @@ class PreprocessingService:
         self.__split_to_mp3(mp3_path=mp3_path, output_path=split_mp3_path)
         return PreprocessingResult(split_mp3_path=split_mp3_path)
 
+    def extract_audio(self, file_path: str) -> Path:
+        # 16kHz mono float32 raw 파일로 추출한다. (iter_windows 에서 memmap 으로 읽는다)
+        path = Path(file_path)
+        raw_path = Path(os.path.join(self.video_split_output_path, path.stem, "pcm", f"{path.stem}.f32"))
+        self.audio_extractor.extract_to_raw(path.resolve(), raw_path)
+        return raw_path
+
+    def iter_windows(self, raw_path: Path) -> Iterator[AudioWindow]:
+        audio = self.audio_extractor.load_raw(raw_path)
+        if self.vad_segmenter is None:
+            return self.audio_extractor.iter_windows(audio)
+        # 발화 구간만 쉬는 지점에서 잘라 넘긴다. window offset 은 원본 기준이라 script 시각은 그대로다.
+        regions, windows = self.vad_segmenter.segment(audio)
+        index = self.vad_segmenter.write_index(self.speech_index_path(raw_path), audio, regions, windows)
+        print(f"[PreprocessingService] vad {raw_path.name} : "
+              f"{index['window_seconds']}s / {index['total_seconds']}s in {len(windows)} windows")
+        return self.vad_segmenter.iter_windows(audio, windows)
+
+    @staticmethod
+    def speech_index_path(raw_path: Path) -> Path:
+        return Path(raw_path).with_suffix(".vad.json")
+
+    @staticmethod
+    def load_speech_offsets(split_mp3_path: Path) -> Optional[List[float]]:
+        # split 모드에서 VAD 로 자른 _part_N.mp3 의 원본 기준 시작 시각. 고정 길이로 잘랐으면 None.
+        index_path = Path(split_mp3_path) / SPEECH_INDEX_FILE
+        if not index_path.exists():
+            return None
+        return [start for start, _ in VadSegmenter.read_index(index_path)["windows"]]
+
     def __convert_video_to_mp3(self, video_path: Path, output_path: Path) -> Path:
         output_audio_path = Path(os.path.join(output_path.resolve(),
                                               f"{video_path.stem}.mp3"))
 
+        # moviepy 는 import 가 느려서 split 모드에서 실제로 쓸 때 불러온다.
+        from moviepy.editor import VideoFileClip
+
         video_clip = VideoFileClip(str(video_path.resolve()))
 
         audio_clip = video_clip.audio
@@ -73,25 +120,44 @@ class PreprocessingService:
         return output_audio_path
 
     def __split_to_mp3(self, mp3_path: Path, output_path: Path):
+        from pydub import AudioSegment
+
         audio = AudioSegment.from_mp3(str(mp3_path.resolve()))
-        # 2분(120,000밀리초) 단위로 쪼개기
-        two_minutes = 2 * 60 * 1000
-        chunks = []
+        os.makedirs(output_path, exist_ok=True)
+        # 이전 실행에서 남은 part 파일과 index 가 섞이지 않도록 지운다.
+        for old_path in glob.glob(os.path.join(output_path.resolve(), "*_part_*.mp3")):
+            os.remove(old_path)
+        index_path = Path(output_path) / SPEECH_INDEX_FILE
+        if index_path.exists():
+            os.remove(index_path)
 
-        for i in range(0, len(audio), two_minutes):
-            chunk = audio[i:i + two_minutes]
-            chunks.append(chunk)
+        chunks = []
+        if self.vad_segmenter is not None:
+            # 발화 구간만 쉬는 지점에서 잘라 window 별로 쓰고, window 시작 시각은 speech index 에 남긴다.
+            pcm = audio.set_frame_rate(SAMPLE_RATE).set_channels(1).set_sample_width(2)
+            samples = np.frombuffer(pcm.raw_data, np.int16).astype(np.float32) / 32768.0
+            regions, windows = self.vad_segmenter.segment(samples)
+            self.vad_segmenter.write_index(index_path, samples, regions, windows)
+            for window in windows:
+                chunks.append(audio[int(window.start * 1000):int(window.end * 1000)])
+        else:
+            # 2분(120,000밀리초) 단위로 쪼개기
+            two_minutes = 2 * 60 * 1000
+            for i in range(0, len(audio), two_minutes):
+                chunk = audio[i:i + two_minutes]
+                chunks.append(chunk)
 
-        os.makedirs(output_path, exist_ok=True)
         for i, chunk in enumerate(chunks):
             output_mp3_path = os.path.join(output_path.resolve(), f"{mp3_path.stem}_part_{i + 1}.mp3")
             chunk.export(output_mp3_path, format='mp3')
 
-    def download_and_upload_encode_video(self):
+    def download_and_upload_encode_video(self) -> bool:
+        """READY 세션 하나를 claim 해서 인코딩한다. claim 한 세션이 없으면 False 를 반환한다."""
+        update_session_start_state = False
         try:
-            db_session = self.connection_manager.make_session()
-            update_session_start_state = False
-            with transaction_scope(db_session) as tx_session:
+            with transaction_scope(
+                    self.connection_manager.make_session()
+            ) as tx_session:
                 # 트랜젝션 열고
                 # 한개 처리하는걸 보장한다.
                 session = self.session_repository.get_by_encode_state_id(
@@ -99,14 +165,20 @@ class PreprocessingService:
                     db_session=tx_session,
                 )
                 if session is None:
-                    return
-                session.encoding_state_id = int(StateTypeEnum.START)
-                print(f"[PreprocessingService] session id:[{session.id}] start")
-                update_session_start_state = self.session_repository.update(
+                    return False
+                update_session_start_state = self.session_claim_repository.claim(
                     session_id=session.id,
-                    session=session,
-                    db_session=tx_session
+                    state_field="encoding_state_id",
+                    from_state=int(StateTypeEnum.READY),
+                    to_state=int(StateTypeEnum.START),
+                    db_session=tx_session,
                 )
+                if not update_session_start_state:
+                    # 다른 worker 가 먼저 가져갔다. 남은 READY 세션이 있을 수 있으니 계속 돈다.
+                    print(f"[PreprocessingService] session id:[{session.id}] already claimed")
+                    return True
+                session.encoding_state_id = int(StateTypeEnum.START)
+                print(f"[PreprocessingService] session id:[{session.id}] start")
 
             # 실제작업
             print(f"[PreprocessingService] session id:[{session.id}] upload and encoding")
@@ -133,9 +205,14 @@ class PreprocessingService:
 
             print(f"[PreprocessingService] update result : [{ret}]")
 
+            # script_state_id 가 READY 가 되었으니 polling 을 기다리지 않고 script job 을 바로 깨운다.
+            if self.job_dispatcher is not None:
+                self.job_dispatcher.notify(SCRIPT_STAGE)
+
             print(f"[PreprocessingService] session id:[{session.id}] complete\n"
                   f"object path : {encoding_video_url}\n"
                   f"local path : {download_path}")
+            return True
 
         except Exception as e:
             print(e)
@@ -149,3 +226,4 @@ class PreprocessingService:
                     session=session,
                     db_session=tx_session
                 )
+            return update_session_start_state
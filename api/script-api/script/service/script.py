@@ -12,11 +12,13 @@ from core.model.entity.session import SessionEntity
 from core.repository.session import SessionRepository
 from core.repository.state_type import StateTypeRepository
 from object.service.script import ScriptService
+from script.repository.session_claim import SessionClaimRepository
 from script.service.nonverbal import NonVerbalService
 from script.service.preprocessing import PreprocessingService
 from script.service.stt import SttService
+from script.service.transcription_cache import TranscriptionCache
+from script.util.file import get_files
 import traceback
-from pydub import AudioSegment
 
 
 class ScriptGenerateService:
@@ -30,6 +32,8 @@ class ScriptGenerateService:
             stt_service: SttService,
             non_verbal_service: NonVerbalService,
             external_volume_path: str,
+            audio_mode: str = "split",
+            session_claim_repository: SessionClaimRepository = None,
     ):
         self.connection_manager = connection_manager
         self.session_repository = session_repository
@@ -39,25 +43,31 @@ class ScriptGenerateService:
         self.stt_service = stt_service
         self.external_volume_path = external_volume_path
         self.non_verbal_service = non_verbal_service
+        # split: 2분 단위 mp3 파일로 쪼개서 처리, stream: 16kHz PCM window 를 메모리에서 바로 처리
+        self.audio_mode = audio_mode
+        # 여러 worker 프로세스/pod 가 같은 READY 세션을 가져가지 않도록 조건부 UPDATE 로 claim 한다.
+        self.session_claim_repository = session_claim_repository or SessionClaimRepository(connection_manager)
 
-    def run_from_db(self):
+    def run_from_db(self) -> bool:
+        """READY 세션 하나를 claim 해서 처리한다. claim 한 세션이 없으면 False 를 반환한다."""
         current_time = datetime.datetime.now()
         formatted_time = current_time.strftime("%H:%M:%S")
         print(f"[ScriptService] run from db at {formatted_time}")
         target_session: Session = None
         update_session_start_state = False
         try:
-            db_session = self.connection_manager.make_session()
-            with transaction_scope(db_session) as tx_session:
+            with transaction_scope(
+                    self.connection_manager.make_session()
+            ) as tx_session:
                 target_session: Session = (
                     self.session_repository.get_by_script_state_id(
-                        state_id=StateTypeEnum.READY, db_session=db_session
+                        state_id=StateTypeEnum.READY, db_session=tx_session
                     )
                 )
 
                 if target_session is None:
                     print(f"[ScriptService] no target_session")
-                    return
+                    return False
 
                 if (
                         target_session.source_video_url is None
@@ -66,31 +76,29 @@ class ScriptGenerateService:
                     print(
                         f"[ScriptService] session id:[{target_session.id}] no target_session"
                     )
-                    return
+                    return False
 
                 print(
                     f"[ScriptService] session_id:[{target_session.id}] update target session state"
                 )
-                target_session.script_state_id = int(StateTypeEnum.START)
-                update_session_start_state = self.session_repository.update(
+                update_session_start_state = self.session_claim_repository.claim(
                     session_id=target_session.id,
-                    session=target_session,
+                    state_field="script_state_id",
+                    from_state=int(StateTypeEnum.READY),
+                    to_state=int(StateTypeEnum.START),
                     db_session=tx_session,
                 )
+                if not update_session_start_state:
+                    # 다른 worker 가 먼저 가져갔다. 남은 READY 세션이 있을 수 있으니 계속 돈다.
+                    print(f"[ScriptService] session_id:[{target_session.id}] already claimed")
+                    return True
+                target_session.script_state_id = int(StateTypeEnum.START)
 
             local_video_path = target_session.source_video_url
             print(
                 f"[ScriptService] session_id:[{target_session.id}] start preprocessing video {local_video_path}"
             )
-            preprocessing_result = self.preprocessing_service.split_video(
-                local_video_path
-            )
-            print(
-                f"[ScriptService] session_id:[{target_session.id}] start gen script split path : {preprocessing_result.split_mp3_path}"
-            )
-            scripts = self.stt_service.run(
-                audio_path=str(preprocessing_result.split_mp3_path.resolve())
-            )
+            scripts = self._make_script(target_session.id, local_video_path)
             new_file_name = f"{target_session.id}.json"
             save_file_path = os.path.join(self.external_volume_path, new_file_name)
             os.makedirs(self.external_volume_path, exist_ok=True)
@@ -116,6 +124,7 @@ class ScriptGenerateService:
                     session=target_session,
                     db_session=tx_session,
                 )
+            return True
         except Exception as e:
             print(traceback.format_exc())
             if update_session_start_state:
@@ -127,8 +136,43 @@ class ScriptGenerateService:
                         session=target_session,
                         db_session=tx_session,
                     )
+            return update_session_start_state
+
+    def _make_script(self, session_id: int, local_video_path: str) -> Script:
+        if self.audio_mode == "stream":
+            # 16kHz PCM 을 raw 파일(memmap)로 한 번만 추출하고 그 hash 로 transcription cache 를 조회한다.
+            raw_path = self.preprocessing_service.extract_audio(local_video_path)
+            print(f"[ScriptService] session_id:[{session_id}] start gen script from audio stream {raw_path}")
+            # VAD 를 쓰면 speech index 도 hash 에 넣어서 설정이 바뀌면 다시 전사한다.
+            windows = self.preprocessing_service.iter_windows(raw_path)
+            index_path = self.preprocessing_service.speech_index_path(raw_path)
+            digest_paths = [raw_path]
+            if self.preprocessing_service.vad_segmenter is not None:
+                digest_paths.append(index_path)
+            return self.stt_service.run_windows(
+                windows,
+                audio_digest=TranscriptionCache.hash_files(digest_paths),
+            )
+
+        preprocessing_result = self.preprocessing_service.split_video(
+            local_video_path
+        )
+        print(
+            f"[ScriptService] session_id:[{session_id}] start gen script split path : {preprocessing_result.split_mp3_path}"
+        )
+        # 디렉토리가 아니라 _part_N.mp3 파일들을 순서대로 넘긴다.
+        audio_files = get_files(preprocessing_result.split_mp3_path, "mp3")
+        # VAD 로 잘랐으면 각 part 의 원본 기준 시작 시각으로 script 시각을 맞춘다.
+        offsets = self.preprocessing_service.load_speech_offsets(preprocessing_result.split_mp3_path)
+        return self.stt_service.run_files(
+            audio_files,
+            audio_digest=TranscriptionCache.hash_files(audio_files),
+            offsets=offsets,
+        )
 
     def run(self, path: str) -> Script:
+        from pydub import AudioSegment
+
         # mp4 to wav
         audio = AudioSegment.from_file(path, format="mp4")
         audio_path = self._rename_file_with_temp_and_change_extension(path, "wav")
@@ -1,50 +1,59 @@
-from concurrent.futures import ThreadPoolExecutor
+import hashlib
 from pathlib import Path
-from typing import List
-from speechbrain.inference.speaker import SpeakerRecognition
-import torch
-from transformers import (
-    AutoModelForSpeechSeq2Seq,
-)
-import whisperx
-import os
-import torchaudio
+from typing import Iterable, List
+import numpy as np
 import json
 
 from core.model.domain.script import Script, Record
 from script.model.dto.speaker_detect_result import SpeakerDetectResult
 from script.model.dto.speaker_modify_result import SpeakerModifyResult
+from script.service.audio import AudioExtractor, AudioWindow, SAMPLE_RATE
 from script.service.llm_service import LLMService
-from speechbrain.inference.diarization import Speech_Emotion_Diarization
+from script.service.parallel_stt import MERGE_MAX_GAP, ParallelTranscriber, merge_chunk_segments
+from script.service.transcription_cache import TranscriptionCache
 
+SPEAKER_DETECT_SYSTEM_PROMPT = ("The following is a conversation between child and play-therapist. "
+                                "만약 스피커가 아동의 이름을 말하거나 주어가 선생님이~ 로 말한다면 해당 스피커는 선생님이야"
+                                "your task is to identify the SPEAKER_0 is child")
+SPEAKER_DETECT_PROMPT = "check next script : {script}"
 
-class SttService:
 
-    def __init__(self, llm_service: LLMService):
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        # model_id = "freshpearYoon/v3_free_all_re_4000"  # "openai/whisper-large-v3"
-        self.batch_size = 16  # reduce if low on GPU mem
-        self.compute_type = "float16" if torch.cuda.is_available() else "float32"
-        self.model = whisperx.load_model("large-v2", self.device, compute_type=self.compute_type, language="ko")
-        self.verification = SpeakerRecognition.from_hparams(source="speechbrain/spkrec-ecapa-voxceleb",
-                                                            savedir="pretrained_models/spkrec-ecapa-voxceleb",
-                                                            run_opts={"device": self.device})
+class SttService:
 
-        self.sed_model = Speech_Emotion_Diarization.from_hparams(
-            source="speechbrain/emotion-diarization-wavlm-large", savedir="./tempdir",
-            run_opts={"device": self.device})
+    def __init__(self, llm_service: LLMService, model_backend, audio_extractor: AudioExtractor,
+                 verification_batch_size: int = 32,
+                 transcription_cache: TranscriptionCache = None,
+                 transcriber: ParallelTranscriber = None):
+        # 모델은 model_backend 가 가진다. (local: 이 프로세스, remote: model server 프로세스)
+        self.model_backend = model_backend
+        self.audio_extractor = audio_extractor
 
         self.llm_service = llm_service
+        # 화자 검증 시 한 번에 encode 할 segment 수 (CPU 노드는 줄여서 메모리 사용량 조절)
+        self.verification_batch_size = verification_batch_size
+        self.verification_threshold = 0.60
+        self.transcription_cache = transcription_cache
+        # worker 가 1개 이상이면 chunk 전사를 process pool 로 나눠서 처리한다.
+        self.transcriber = transcriber if transcriber is not None and transcriber.workers > 0 else None
+        if self.transcriber is not None and getattr(model_backend, "mode", "local") == "remote":
+            # worker 가 각자 whisperx 를 올리면 model server 로 모델을 한 벌만 두는 의미가 없어진다.
+            raise ValueError("stt.parallel.workers must be 0 when model_server.mode is 'remote'")
+
+    def run(self, audio_path, audio_digest: str = None) -> Script:
+        cache_key = self._cache_key(audio_digest)
+        cached_script = self._get_cached_script(cache_key)
+        if cached_script is not None:
+            return cached_script
 
-    def run(self, audio_path) -> Script:
         # whisper x 적용
-        script = self.make_script(audio_path)
+        script = self.make_script(audio_path, cache_key)
 
         # speaker check from GPT
         self.adjust_diar(script)
 
         # first-emotion
 
+        self._put_cached_script(cache_key, script)
         return script
 
     def adjust_diar(self, script: Script):
@@ -65,10 +74,8 @@ class SttService:
 
     def speaker_detect(self, scripts):
         return self.llm_service.run(
-            system_prompt="The following is a conversation between child and play-therapist. "
-                          "만약 스피커가 아동의 이름을 말하거나 주어가 선생님이~ 로 말한다면 해당 스피커는 선생님이야"
-                          "your task is to identify the SPEAKER_0 is child",
-            prompt="check next script : {script}",
+            system_prompt=SPEAKER_DETECT_SYSTEM_PROMPT,
+            prompt=SPEAKER_DETECT_PROMPT,
             variables={"script": scripts[0:20]},
             class_type=SpeakerDetectResult
         )
@@ -102,38 +109,123 @@ class SttService:
         return scripts
     '''
 
-    def make_script(self, audio_path) -> Script:
-        audio = whisperx.load_audio(audio_path)
-        result = self.model.transcribe(audio, language="ko", batch_size=self.batch_size)
-        model_a, metadata = whisperx.load_align_model(language_code=result["language"], device=self.device)
-        stt_result = whisperx.align(result["segments"],
-                                    model_a,
-                                    metadata,
-                                    audio,
-                                    self.device,
-                                    return_char_alignments=False)
+    def run_windows(self, windows: Iterable[AudioWindow], audio_digest: str = None) -> Script:
+        # 전처리에서 흘려주는 16kHz PCM window 를 파일 재인코딩 없이 바로 받아 처리한다.
+        cache_key = self._cache_key(audio_digest)
+        cached_script = self._get_cached_script(cache_key)
+        if cached_script is not None:
+            return cached_script
+
+        script = self.make_script_from_windows(windows, cache_key)
+
+        # speaker check from GPT
+        self.adjust_diar(script)
+
+        self._put_cached_script(cache_key, script)
+        return script
+
+    def run_files(self, audio_files: List[Path], audio_digest: str = None,
+                  offsets: List[float] = None) -> Script:
+        # split 모드의 _part_N.mp3 파일들을 순서대로 하나의 Script 로 만든다.
+        cache_key = self._cache_key(audio_digest)
+        cached_script = self._get_cached_script(cache_key)
+        if cached_script is not None:
+            return cached_script
+
+        script = self.make_script_from_files(audio_files, cache_key, offsets)
+
+        # speaker check from GPT
+        self.adjust_diar(script)
+
+        self._put_cached_script(cache_key, script)
+        return script
+
+    def make_script(self, audio_path, cache_key: str = None) -> Script:
+        cached_segments = self._get_cached_segments(cache_key)
+        if cached_segments is not None:
+            return self._make_final_script(**cached_segments)
+
+        audio = self.audio_extractor.load_audio(audio_path)
+        segments = self.model_backend.transcribe(audio)
         # id 적용
-        signal, fs = torchaudio.load(audio_path)
-        target = stt_result["segments"][0]
-        target_signal = self._slice_signal(signal, fs, target['start'], target['end'])
+        embeddings = self._encode_segments_batched(audio, SAMPLE_RATE, segments[:-1])
+        return self._diarize_and_cache(cache_key, segments, embeddings)
+
+    def make_script_from_windows(self, windows: Iterable[AudioWindow], cache_key: str = None) -> Script:
+        cached_segments = self._get_cached_segments(cache_key)
+        if cached_segments is not None:
+            return self._make_final_script(**cached_segments)
+
+        # window 는 하나씩 꺼내 전사하고 embedding 까지 만든 뒤 버린다. (전체 오디오를 RAM 에 올리지 않는다)
+        if self.transcriber is not None:
+            results = self.transcriber.imap(windows, source=lambda window: window.audio)
+        else:
+            results = ((window, self.model_backend.transcribe(window.audio)) for window in windows)
+        chunks = ((window.offset, len(window.audio) / SAMPLE_RATE, window.audio, window_segments)
+                  for window, window_segments in results)
+        return self._merge_and_cache(cache_key, chunks)
+
+    def make_script_from_files(self, audio_files: List[Path], cache_key: str = None,
+                               offsets: List[float] = None) -> Script:
+        cached_segments = self._get_cached_segments(cache_key)
+        if cached_segments is not None:
+            return self._make_final_script(**cached_segments)
+
+        audio_files = [str(audio_file) for audio_file in audio_files]
+        results = self.transcriber.map(audio_files) if self.transcriber is not None else [None] * len(audio_files)
+        # 각 파일의 offset 은 speech index 의 window 시작 시각을 쓰고, 없으면 앞 파일들의 실제 길이 합으로 정한다.
+        if offsets is not None and len(offsets) != len(audio_files):
+            print(f"[SttService] offsets({len(offsets)}) do not match files({len(audio_files)}), ignore offsets")
+            offsets = None
+
+        def iter_chunks():
+            offset = 0.0
+            for index, (audio_file, file_segments) in enumerate(zip(audio_files, results)):
+                audio = self.audio_extractor.load_audio(audio_file)
+                if file_segments is None:
+                    file_segments = self.model_backend.transcribe(audio)
+                duration = len(audio) / SAMPLE_RATE
+                if offsets is not None:
+                    offset = offsets[index]
+                yield offset, duration, audio, file_segments
+                offset += duration
+
+        return self._merge_and_cache(cache_key, iter_chunks())
+
+    def _merge_and_cache(self, cache_key, chunks: Iterable) -> Script:
+        # chunk 의 오디오는 embedding 을 만든 뒤에는 들고 있지 않는다.
+        segment_chunks = []
+        embedding_chunks = []
+        boundaries = []
+        for offset, duration, audio, chunk_segments in chunks:
+            embedding_chunks.append(self._encode_segments_batched(audio, SAMPLE_RATE, chunk_segments))
+            segment_chunks.append([{"text": seg["text"],
+                                    "start": float(seg["start"]) + offset,
+                                    "end": float(seg["end"]) + offset} for seg in chunk_segments])
+            boundaries.append(offset + duration)
+        segments, embeddings = merge_chunk_segments(segment_chunks, embedding_chunks, boundaries)
+        return self._diarize_and_cache(cache_key, segments, embeddings[:-1])
+
+    def _diarize_and_cache(self, cache_key, segments, embeddings) -> Script:
+        # 첫 segment 를 SPEAKER_0 기준으로 두고 나머지를 기준 embedding 과 비교한다. (마지막 segment 는 제외)
+        segments = [{"text": seg["text"], "start": float(seg["start"]), "end": float(seg["end"])}
+                    for seg in segments]
+        target_embedding = embeddings[0] if embeddings else None
+        speakers = ["SPEAKER_0"] + self._verify_speakers(target_embedding, embeddings[1:])
+        if self.transcription_cache is not None and cache_key is not None:
+            self.transcription_cache.put_segments(cache_key, segments, speakers)
+        return self._make_final_script(segments, speakers)
+
+    def _make_final_script(self, segments, speakers) -> Script:
         final_result = Script()
+        if not segments:
+            return final_result
+
+        target = segments[0]
         final_result.scripts.append(
             self._make_script_item(target['text'], target['start'], target['end'], "SPEAKER_0"))
-        for seg in stt_result["segments"][1:-1]:
-            start_time = seg["start"]
-            end_time = seg["end"]
-
-            test_signal = self._slice_signal(signal, fs, start_time, end_time)
-            try:
-                score, prediction = self.verification.verify_batch(target_signal, test_signal, threshold=0.60)
-                if prediction[0][0].cpu():
-                    speaker = "SPEAKER_0"
-                else:
-                    speaker = "SPEAKER_1"
-            except:
-                speaker = "SPEAKER_0"
-
-            final_result.scripts.append(self._make_script_item(seg["text"], start_time, end_time, speaker))
+        for seg, speaker in zip(segments[1:-1], speakers[1:]):
+            final_result.scripts.append(self._make_script_item(seg["text"], seg["start"], seg["end"], speaker))
 
         # json input typeError 막기 위한 임시방편 코드입니다.
         scripts_as_dicts = [record.dict() for record in final_result.scripts]
@@ -144,10 +236,92 @@ class SttService:
             json.dump(scripts_as_dicts, json_file, ensure_ascii=False, indent=4)
         return final_result
 
+    def _cache_key(self, audio_digest: str):
+        if self.transcription_cache is None or audio_digest is None:
+            return None
+        # 모델이나 설정이 바뀌면 다른 key 가 되도록 signature 에 포함한다.
+        # 최종 script 는 화자 판별 prompt 와 temperature 에 따라서도 달라진다.
+        signature = {
+            "version": 5,
+            **self.model_backend.signature(),
+            "verification": "speechbrain/spkrec-ecapa-voxceleb",
+            "verification_threshold": self.verification_threshold,
+            "llm_model": self.llm_service.model_name,
+            "llm_temperature": self.llm_service.temperature,
+            "speaker_detect_prompt": hashlib.sha256(
+                (SPEAKER_DETECT_SYSTEM_PROMPT + SPEAKER_DETECT_PROMPT).encode("utf-8")
+            ).hexdigest(),
+        }
+        if self.transcriber is not None:
+            # 병렬 경로는 CPU compute_type 으로 chunk 를 따로 전사하고 경계에서 합치므로 순차 경로와 key 를 나눈다.
+            signature.update(self.transcriber.signature())
+            signature["window_seconds"] = self.audio_extractor.window_seconds
+            signature["merge_max_gap"] = MERGE_MAX_GAP
+        return self.transcription_cache.make_key(audio_digest, signature)
+
+    def _get_cached_segments(self, cache_key: str):
+        if cache_key is None:
+            return None
+        cached = self.transcription_cache.get_segments(cache_key)
+        if cached is not None:
+            print(f"[SttService] transcription cache hit (segments) [{cache_key}]")
+        return cached
+
+    def _get_cached_script(self, cache_key: str):
+        if cache_key is None:
+            return None
+        cached = self.transcription_cache.get_script(cache_key)
+        if cached is None:
+            return None
+        print(f"[SttService] transcription cache hit (script) [{cache_key}]")
+        return Script(**cached)
+
+    def _put_cached_script(self, cache_key: str, script: Script):
+        if cache_key is not None:
+            self.transcription_cache.put_script(cache_key, script.dict())
+
+    def _verify_speakers(self, target_embedding, embeddings) -> List[str]:
+        # 모든 segment embedding 을 target(첫 segment) embedding 과 한 번의 cosine similarity 로 비교한다.
+        speakers = ["SPEAKER_0"] * len(embeddings)
+        indices = [idx for idx, embedding in enumerate(embeddings) if embedding is not None]
+        if target_embedding is None or not indices:
+            return speakers
+
+        stacked = np.stack([embeddings[idx] for idx in indices])
+        scores = self.model_backend.similarity(stacked, target_embedding)
+        for idx, score in zip(indices, scores.tolist()):
+            if score <= self.verification_threshold:
+                speakers[idx] = "SPEAKER_1"
+        return speakers
+
+    def _encode_segments_batched(self, signal, fs, segments) -> List:
+        # segment 별 embedding, 길이가 0 이거나 encode 에 실패하면 None (기존 동작처럼 SPEAKER_0 처리)
+        embeddings = [None] * len(segments)
+        indices = [idx for idx, seg in enumerate(segments)
+                   if int(seg["end"] * fs) > int(seg["start"] * fs)]
+        for i in range(0, len(indices), self.verification_batch_size):
+            batch_indices = indices[i:i + self.verification_batch_size]
+            try:
+                batch_embeddings = self._encode_segments(signal, fs, [segments[idx] for idx in batch_indices])
+            except Exception:
+                continue
+            for idx, embedding in zip(batch_indices, batch_embeddings):
+                embeddings[idx] = embedding
+        return embeddings
+
+    def _encode_segments(self, signal, fs, segments):
+        # 16kHz mono 오디오에서 segment 구간을 잘라 0 으로 padding 한 batch 로 한 번에 encode 한다.
+        waveforms = [self._slice_signal(signal, fs, seg["start"], seg["end"]) for seg in segments]
+        lengths = np.array([waveform.shape[0] for waveform in waveforms], dtype=np.float32)
+        wavs = np.zeros((len(waveforms), int(lengths.max())), dtype=np.float32)
+        for idx, waveform in enumerate(waveforms):
+            wavs[idx, :waveform.shape[0]] = waveform
+        return self.model_backend.embed(wavs, lengths / lengths.max())
+
     def _slice_signal(self, waveform, sample_rate, start_time, end_time):
         start_sample = int(start_time * sample_rate)
         end_sample = int(end_time * sample_rate)
-        return waveform[:, start_sample:end_sample]
+        return waveform[start_sample:end_sample]
 
     def _compute_time(self, time):
         time = int(time)
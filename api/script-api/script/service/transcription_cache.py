@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+
+class TranscriptionCache:
+    """오디오 content hash 로 stt 결과를 external volume 에 저장해서 같은 입력의 재처리를 건너뛴다.
+
+    key 는 추출된 오디오 hash 와 모델/설정 signature 로 만든다.
+    entry 는 whisperx 정렬 segment + 화자 결과(segments)와 GPT 보정까지 끝난 최종 Script(script) 두 단계다.
+    entry 크기는 시작할 때 한 번 디렉터리를 훑어 만든 index 로 관리해서 put 마다 디렉터리를 다시 훑지 않는다.
+    """
+
+    def __init__(self, external_volume_path: str, max_size_mb: int = 1024):
+        self.cache_dir = os.path.join(external_volume_path, "stt_cache")
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self.hit_count = 0
+        self.miss_count = 0
+        self.evict_count = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # path -> size. 오래 안 쓴 entry 가 앞에 오는 LRU 순서다.
+        self._index = OrderedDict(
+            (path, size) for path, size, _ in sorted(self._entries(), key=lambda entry: entry[2])
+        )
+        self._total_bytes = sum(self._index.values())
+
+    @staticmethod
+    def hash_files(paths: List[Path], block_size: int = 1024 * 1024) -> str:
+        digest = hashlib.sha256()
+        for path in paths:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(block_size), b""):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(audio_digest: str, signature: dict) -> str:
+        payload = json.dumps({"audio": audio_digest, "signature": signature}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_segments(self, key: str) -> Optional[dict]:
+        return self._get(key, "segments")
+
+    def put_segments(self, key: str, segments: List[dict], speakers: List[str]):
+        self._put(key, "segments", {"segments": segments, "speakers": speakers})
+
+    def get_script(self, key: str) -> Optional[dict]:
+        return self._get(key, "script")
+
+    def put_script(self, key: str, script: dict):
+        self._put(key, "script", script)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hit_count": self.hit_count,
+                "miss_count": self.miss_count,
+                "evict_count": self.evict_count,
+                "entry_count": len(self._index),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _path(self, key: str, stage: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{stage}.json")
+
+    def _get(self, key: str, stage: str) -> Optional[dict]:
+        path = self._path(key, stage)
+        with self._lock:
+            try:
+                with open(path, "r", encoding="UTF-8") as f:
+                    value = json.load(f)
+                os.utime(path)  # 재시작 후 index 를 다시 만들 때의 LRU 순서
+                size = os.path.getsize(path)
+            except (OSError, ValueError):
+                self._forget(path)
+                self.miss_count += 1
+                return None
+            # 같은 volume 을 쓰는 다른 process 가 만든 entry 도 index 에 넣는다.
+            self._forget(path)
+            self._index[path] = size
+            self._total_bytes += size
+            self.hit_count += 1
+            return value
+
+    def _put(self, key: str, stage: str, value: dict):
+        path = self._path(key, stage)
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(temp_path, "w", encoding="UTF-8") as f:
+                    json.dump(value, f, ensure_ascii=False)
+                size = os.path.getsize(temp_path)
+                os.replace(temp_path, path)
+                self._forget(path)
+                self._index[path] = size
+                self._total_bytes += size
+                self._evict()
+            except OSError as e:
+                print(f"[TranscriptionCache] cannot write cache entry [{path}]", e)
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _forget(self, path: str):
+        size = self._index.pop(path, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._index:
+            path, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.evict_count += 1
@@ -0,0 +1,178 @@
+import json
+import os
+from typing import Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+from script.service.audio import AudioWindow, SAMPLE_RATE
+
+
+class SpeechRegion(NamedTuple):
+    start: float  # 원본 오디오 기준 시각(초)
+    end: float
+
+
+class VadSegmenter:
+    """frame 에너지 기반 VAD 로 발화 구간을 찾고, 쉬는 구간에서만 잘라 max_window_seconds 이하의 window 를 만든다.
+
+    threshold 는 가장 조용한 연속 구간(noise_window_seconds)의 평균 에너지 + margin 으로 정하고
+    min_energy_db 보다 낮아지지 않게 한다. 그런 조용한 구간이 없으면 min_energy_db 만 기준으로 쓴다.
+    max_gap_seconds 보다 긴 침묵은 window 에서 빠지므로 whisper 로 넘어가지 않는다.
+    찾은 발화가 전체의 min_speech_ratio 보다 적으면(무음 / 잡음만 있는 오디오 등) VAD 를 믿지 않고 고정 길이로 자른다.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = 30,
+                 min_energy_db: float = -50.0, noise_margin_db: float = 10.0,
+                 noise_window_seconds: float = 1.0, min_speech_ratio: float = 0.05,
+                 min_speech_seconds: float = 0.25, min_silence_seconds: float = 0.5,
+                 padding_seconds: float = 0.2, max_gap_seconds: float = 2.0,
+                 max_window_seconds: float = 120.0, block_seconds: int = 60):
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.min_energy_db = min_energy_db
+        self.noise_margin_db = noise_margin_db
+        self.noise_window_seconds = noise_window_seconds
+        self.min_speech_ratio = min_speech_ratio
+        self.min_speech_seconds = min_speech_seconds
+        self.min_silence_seconds = min_silence_seconds
+        self.padding_seconds = padding_seconds
+        self.max_gap_seconds = max_gap_seconds
+        self.max_window_seconds = max_window_seconds
+        self.block_seconds = block_seconds
+
+    def segment(self, audio: np.ndarray) -> Tuple[List[SpeechRegion], List[SpeechRegion]]:
+        # (발화 구간, window) 를 돌려준다. VAD 결과를 믿을 수 없으면 전체를 고정 길이 window 로 자른다.
+        duration = len(audio) / self.sample_rate
+        regions = self.detect(audio)
+        speech_seconds = sum(region.end - region.start for region in regions)
+        if duration > 0 and speech_seconds < duration * self.min_speech_ratio:
+            print(f"[VadSegmenter] speech {speech_seconds:.1f}s / {duration:.1f}s, fall back to fixed windows")
+            windows = self.fixed_windows(duration)
+            return windows, windows
+        return regions, self.group(regions)
+
+    def fixed_windows(self, duration: float) -> List[SpeechRegion]:
+        starts = np.arange(0.0, duration, self.max_window_seconds)
+        return [SpeechRegion(float(start), float(min(duration, start + self.max_window_seconds)))
+                for start in starts]
+
+    def detect(self, audio: np.ndarray) -> List[SpeechRegion]:
+        energy_db = self._frame_energy_db(audio)
+        if len(energy_db) == 0:
+            return []
+        threshold = self._noise_floor_db(energy_db) + self.noise_margin_db
+        if threshold > float(np.median(energy_db)):
+            # 조용한 연속 구간이 없으면(쉬지 않는 발화 등) 절대 기준 min_energy_db 만 쓴다.
+            threshold = self.min_energy_db
+        threshold = max(self.min_energy_db, threshold)
+        speech = energy_db > threshold
+
+        # speech frame 의 시작/끝 index 를 찾는다.
+        edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        regions = []
+        for start, end in zip(starts, ends):
+            # 짧은 쉼은 하나의 발화로 이어 붙인다.
+            if regions and (start - regions[-1][1]) * self.frame_samples < self.min_silence_seconds * self.sample_rate:
+                regions[-1][1] = end
+            else:
+                regions.append([start, end])
+
+        frame_seconds = self.frame_samples / self.sample_rate
+        duration = len(audio) / self.sample_rate
+        result = []
+        for start, end in regions:
+            if (end - start) * frame_seconds < self.min_speech_seconds:
+                continue
+            pieces = self._split_long(energy_db, start, end)
+            for index, (piece_start, piece_end) in enumerate(pieces):
+                # padding 은 발화 구간의 바깥 경계에만 붙인다. 긴 발화 안의 자른 지점에 붙이면 window 끼리 겹친다.
+                piece_start = piece_start * frame_seconds
+                piece_end = piece_end * frame_seconds
+                if index == 0:
+                    piece_start = max(0.0, piece_start - self.padding_seconds)
+                if index == len(pieces) - 1:
+                    piece_end = min(duration, piece_end + self.padding_seconds)
+                result.append(SpeechRegion(start=float(piece_start), end=float(piece_end)))
+        return result
+
+    def group(self, regions: List[SpeechRegion]) -> List[SpeechRegion]:
+        # 발화 구간을 window 로 묶는다. 긴 침묵이나 max_window_seconds 에서 끊고, 끊는 위치는 항상 발화 사이다.
+        windows = []
+        for region in regions:
+            start = region.start
+            if (windows and start - windows[-1].end <= self.max_gap_seconds
+                    and region.end - windows[-1].start <= self.max_window_seconds):
+                windows[-1] = SpeechRegion(windows[-1].start, region.end)
+            else:
+                windows.append(SpeechRegion(start, region.end))
+        return windows
+
+    def iter_windows(self, audio: np.ndarray, windows: List[SpeechRegion]) -> Iterator[AudioWindow]:
+        for window in windows:
+            start = int(window.start * self.sample_rate)
+            end = int(window.end * self.sample_rate)
+            yield AudioWindow(offset=start / self.sample_rate, audio=audio[start:end])
+
+    def write_index(self, path, audio: np.ndarray, regions: List[SpeechRegion],
+                    windows: List[SpeechRegion]) -> dict:
+        index = {
+            "sample_rate": self.sample_rate,
+            "total_seconds": round(len(audio) / self.sample_rate, 3),
+            "speech_seconds": round(sum(region.end - region.start for region in regions), 3),
+            "window_seconds": round(sum(window.end - window.start for window in windows), 3),
+            "regions": [[round(region.start, 3), round(region.end, 3)] for region in regions],
+            "windows": [[round(window.start, 3), round(window.end, 3)] for window in windows],
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="UTF-8") as f:
+            json.dump(index, f)
+        return index
+
+    @staticmethod
+    def read_index(path) -> dict:
+        with open(path, "r", encoding="UTF-8") as f:
+            return json.load(f)
+
+    def _split_long(self, energy_db: np.ndarray, start: int, end: int) -> List[tuple]:
+        # max_window_seconds 보다 긴 발화 구간은 뒤쪽 절반에서 가장 조용한 frame 을 골라 자른다.
+        max_frames = int((self.max_window_seconds - 2 * self.padding_seconds) * self.sample_rate / self.frame_samples)
+        pieces = []
+        while end - start > max_frames:
+            search_from = start + max_frames // 2
+            cut = search_from + int(np.argmin(energy_db[search_from:start + max_frames]))
+            pieces.append((start, cut))
+            start = cut
+        pieces.append((start, end))
+        return pieces
+
+    def _noise_floor_db(self, energy_db: np.ndarray) -> float:
+        # 짧은 쉼이 섞인 연속 발화에서 percentile 을 쓰면 발화 수준이 noise floor 가 되므로,
+        # noise_window_seconds 동안 이어지는 가장 조용한 구간의 평균 에너지를 noise floor 로 쓴다.
+        frame_seconds = self.frame_samples / self.sample_rate
+        window = int(min(len(energy_db), max(1, round(self.noise_window_seconds / frame_seconds))))
+        power = np.power(10.0, energy_db.astype(np.float64) / 10)
+        cumulative = np.concatenate(([0.0], np.cumsum(power)))
+        mean_power = (cumulative[window:] - cumulative[:-window]) / window
+        return float(10 * np.log10(np.min(mean_power) + 1e-10))
+
+    def _frame_energy_db(self, audio: np.ndarray) -> np.ndarray:
+        # memmap 전체를 한 번에 올리지 않도록 block 단위로 frame RMS 를 계산한다.
+        frames = len(audio) // self.frame_samples
+        block_frames = max(1, self.block_seconds * self.sample_rate // self.frame_samples)
+        energy = np.empty(frames, dtype=np.float32)
+        for first in range(0, frames, block_frames):
+            last = min(frames, first + block_frames)
+            block = np.asarray(audio[first * self.frame_samples:last * self.frame_samples], dtype=np.float32)
+            power = np.mean(np.square(block.reshape(last - first, self.frame_samples)), axis=1)
+            energy[first:last] = 10 * np.log10(power + 1e-10)
+        return energy
+
+
+def make_vad_segmenter(enabled: bool = True, **kwargs):
+    # 꺼져 있으면 None 을 돌려주고 PreprocessingService 는 고정 길이 window 로 자른다.
+    if not enabled:
+        return None
+    return VadSegmenter(**{key: value for key, value in kwargs.items() if value is not None})
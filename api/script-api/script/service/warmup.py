@@ -0,0 +1,71 @@
+import threading
+import time
+
+
+class ModelWarmup:
+    """모델 backend 를 component 단위로 미리 올리고 진행 상태를 기록한다.
+
+    background: 시작 시 별도 thread 에서 warm-up (API 는 바로 응답)
+    eager: 시작 시 warm-up 이 끝날 때까지 기다림
+    lazy: warm-up 하지 않고 처음 쓸 때 로딩
+
+    로딩에 실패한 component 는 retry_seconds 간격으로 max_attempts 번까지 다시 시도한다.
+    그래도 실패하면 error 상태로 남고 /readiness 는 프로세스를 재시작할 때까지 계속 503 을 돌려준다.
+    """
+
+    def __init__(self, mode: str = "background", max_attempts: int = 3, retry_seconds: float = 30):
+        self.mode = mode
+        self.max_attempts = max(1, max_attempts)
+        self.retry_seconds = retry_seconds
+        self.components = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, backend):
+        components = backend.warmup_components()
+        with self._lock:
+            initial_state = "lazy" if self.mode == "lazy" else "pending"
+            self.components = {name: {"state": initial_state} for name, _ in components}
+        if self.mode == "lazy":
+            return
+        if self.mode == "eager":
+            self._run(components)
+            return
+        self._thread = threading.Thread(target=self._run, args=(components,), name="model-warmup", daemon=True)
+        self._thread.start()
+
+    def is_ready(self) -> bool:
+        with self._lock:
+            return all(component["state"] in ("ready", "lazy") for component in self.components.values())
+
+    def progress(self) -> dict:
+        with self._lock:
+            components = {name: dict(component) for name, component in self.components.items()}
+        return {
+            "mode": self.mode,
+            "ready": all(component["state"] in ("ready", "lazy") for component in components.values()),
+            "loaded": sum(component["state"] == "ready" for component in components.values()),
+            "total": len(components),
+            "components": components,
+        }
+
+    def _run(self, components):
+        for name, load in components:
+            for attempt in range(1, self.max_attempts + 1):
+                self._set(name, state="loading", attempt=attempt)
+                started = time.perf_counter()
+                try:
+                    load()
+                except Exception as e:
+                    print(f"[ModelWarmup] cannot load {name} (attempt {attempt}/{self.max_attempts}): {e}")
+                    self._set(name, state="error", attempt=attempt,
+                              seconds=round(time.perf_counter() - started, 2), error=repr(e))
+                    if attempt < self.max_attempts:
+                        time.sleep(self.retry_seconds)
+                    continue
+                self._set(name, state="ready", attempt=attempt, seconds=round(time.perf_counter() - started, 2))
+                break
+
+    def _set(self, name: str, **values):
+        with self._lock:
+            self.components[name] = values
@@ -0,0 +1,52 @@
+import unittest
+from unittest.mock import MagicMock
+
+from script.repository.session_claim import SessionClaimRepository
+
+
+class TestSessionClaimRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.connection_manager = MagicMock()
+        self.repository = SessionClaimRepository(self.connection_manager)
+
+    def test_claim(self):
+        db_session = MagicMock()
+        db_session.execute.return_value = MagicMock(rowcount=1)
+
+        claimed = self.repository.claim(1, "script_state_id", 1, 2, db_session=db_session)
+
+        self.assertTrue(claimed)
+        stmt = str(db_session.execute.call_args.args[0])
+        # state 가 아직 from_state 인 row 만 바꾼다.
+        self.assertIn("UPDATE", stmt)
+        self.assertIn("script_state_id", stmt.split("WHERE")[1])
+        # 호출한 쪽의 transaction 은 commit 하지 않는다.
+        db_session.commit.assert_not_called()
+
+    def test_claim_taken_by_other_worker(self):
+        db_session = MagicMock()
+        db_session.execute.return_value = MagicMock(rowcount=0)
+
+        self.assertFalse(self.repository.claim(1, "encoding_state_id", 1, 2, db_session=db_session))
+
+    def test_claim_own_session(self):
+        session = self.connection_manager.make_session.return_value
+        session.execute.return_value = MagicMock(rowcount=1)
+
+        self.assertTrue(self.repository.claim(1, "encoding_state_id", 1, 2))
+        session.commit.assert_called_once()
+        session.close.assert_called_once()
+
+    def test_claim_own_session_rollback(self):
+        session = self.connection_manager.make_session.return_value
+        session.execute.side_effect = RuntimeError("deadlock")
+
+        with self.assertRaises(RuntimeError):
+            self.repository.claim(1, "encoding_state_id", 1, 2)
+        session.rollback.assert_called_once()
+        session.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
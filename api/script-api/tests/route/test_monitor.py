@@ -0,0 +1,33 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from script.route.monitor import get_readiness
+from script.service.warmup import ModelWarmup
+
+
+class TestReadiness(unittest.IsolatedAsyncioTestCase):
+
+    async def test_ready(self):
+        warmup = ModelWarmup(mode="eager")
+        warmup.start(MagicMock(warmup_components=MagicMock(return_value=[("whisper", MagicMock())])))
+
+        response = await get_readiness(model_warmup=warmup)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(json.loads(response.body)["ready"])
+
+    async def test_error_is_not_ready(self):
+        warmup = ModelWarmup(mode="eager", max_attempts=1)
+        failing = MagicMock(side_effect=RuntimeError("out of memory"))
+        warmup.start(MagicMock(warmup_components=MagicMock(return_value=[("whisper", failing)])))
+
+        response = await get_readiness(model_warmup=warmup)
+
+        self.assertEqual(response.status_code, 503)
+        body = json.loads(response.body)
+        self.assertEqual(body["components"]["whisper"]["state"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import threading
+import unittest
+
+from script.scheduler.dispatcher import JobDispatcher, SCRIPT_STAGE
+
+
+class TestJobDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.dispatcher = JobDispatcher()
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+        self.run_count = 0
+
+    def handler(self):
+        self.run_count += 1
+        self.started.release()
+        self.release.wait(5)
+
+    def test_notify_runs_handler(self):
+        self.release.set()
+        self.dispatcher.register(SCRIPT_STAGE, self.handler)
+        self.dispatcher.start()
+
+        self.dispatcher.notify(SCRIPT_STAGE)
+
+        self.assertTrue(self.started.acquire(timeout=5))
+        self.assertEqual(self.run_count, 1)
+
+    def test_coalesces_notify_while_running(self):
+        self.dispatcher.register(SCRIPT_STAGE, self.handler)
+        self.dispatcher.start()
+        self.dispatcher.notify(SCRIPT_STAGE)
+        self.assertTrue(self.started.acquire(timeout=5))
+
+        # 실행 중에 들어온 notify 는 합쳐서 한 번만 더 실행한다.
+        for _ in range(5):
+            self.dispatcher.notify(SCRIPT_STAGE)
+        self.release.set()
+
+        self.assertTrue(self.started.acquire(timeout=5))
+        self.assertFalse(self.started.acquire(timeout=0.2))
+        self.assertEqual(self.run_count, 2)
+
+    def test_handler_error_keeps_dispatcher_running(self):
+        failed = threading.Event()
+        done = threading.Event()
+
+        def handler():
+            if not failed.is_set():
+                failed.set()
+                raise RuntimeError("job failed")
+            done.set()
+
+        self.dispatcher.register(SCRIPT_STAGE, handler)
+        self.dispatcher.start()
+        self.dispatcher.notify(SCRIPT_STAGE)
+        self.assertTrue(failed.wait(5))
+        self.dispatcher.notify(SCRIPT_STAGE)
+
+        self.assertTrue(done.wait(5))
+
+    def test_notify_unknown_stage(self):
+        self.dispatcher.notify("unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
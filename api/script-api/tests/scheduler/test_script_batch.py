@@ -0,0 +1,82 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from script.scheduler.script_batch import drain, get_worker_pool
+
+
+class TestDrain(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=3)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_drains_until_no_session(self):
+        lock = threading.Lock()
+        state = {"ready": 10, "calls": 0, "threads": set()}
+
+        def job():
+            with lock:
+                state["calls"] += 1
+                state["threads"].add(threading.get_ident())
+                if state["ready"] == 0:
+                    return False
+                state["ready"] -= 1
+                return True
+
+        drain(job, self.executor, workers=3)
+
+        # 세션 10개를 처리하고, worker 마다 빈 claim 한 번으로 끝난다.
+        self.assertEqual(state["ready"], 0)
+        self.assertEqual(state["calls"], 13)
+        self.assertLessEqual(len(state["threads"]), 3)
+
+    def test_runs_workers_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        claimed = []
+
+        def job():
+            if claimed:
+                return False
+            # 두 worker 가 동시에 들어오지 않으면 barrier 가 timeout 난다.
+            barrier.wait()
+            claimed.append(True)
+            return False
+
+        drain(job, self.executor, workers=2)
+        self.assertEqual(len(claimed), 2)
+
+    def test_raises_worker_error(self):
+        def job():
+            raise RuntimeError("db error")
+
+        with self.assertRaises(RuntimeError):
+            drain(job, self.executor, workers=2)
+
+    def test_reuses_worker_threads(self):
+        threads = set()
+
+        def job():
+            threads.add(threading.get_ident())
+            return False
+
+        for _ in range(10):
+            drain(job, self.executor, workers=3)
+
+        # poll 마다 thread 를 새로 만들지 않으므로 thread 별 S3 client 도 다시 쓴다.
+        self.assertLessEqual(len(threads), 3)
+
+
+class TestWorkerPool(unittest.TestCase):
+
+    def test_one_pool_per_stage(self):
+        pool = get_worker_pool("test-stage", 2)
+        self.addCleanup(pool.shutdown)
+
+        self.assertIs(get_worker_pool("test-stage", 2), pool)
+        self.assertIsNot(get_worker_pool("test-other-stage", 2), pool)
+        get_worker_pool("test-other-stage", 2).shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
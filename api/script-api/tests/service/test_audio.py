@@ -0,0 +1,79 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from script.service.audio import AudioExtractor
+
+
+def make_process(samples: np.ndarray, returncode: int = 0):
+    process = MagicMock()
+    process.stdout = io.BytesIO((samples * 32767).astype(np.int16).tobytes())
+    process.wait.return_value = returncode
+    process.returncode = returncode
+    process.poll.return_value = returncode
+    return process
+
+
+class TestAudioExtractor(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.raw_path = os.path.join(self.directory.name, "pcm", "video.f32")
+        self.extractor = AudioExtractor(window_seconds=2, sample_rate=100, read_block_seconds=1)
+
+    @patch("script.service.audio.subprocess.Popen")
+    def test_extract_to_raw(self, popen):
+        samples = np.linspace(-1, 1, 550, dtype=np.float32)
+        process = make_process(samples)
+        popen.return_value = process
+        read = process.stdout.read
+        reads = []
+        process.stdout.read = lambda size: reads.append(size) or read(size)
+
+        audio = self.extractor.extract_to_raw("video.mp4", self.raw_path)
+
+        # read_block_seconds(100 sample * 2 byte) 씩 나눠 읽어 raw 파일에 이어 쓴다.
+        self.assertTrue(all(size <= 200 for size in reads))
+        self.assertIsInstance(audio, np.memmap)
+        self.assertEqual(len(audio), 550)
+        np.testing.assert_allclose(audio, samples, atol=1e-4)
+        command = popen.call_args.args[0]
+        self.assertIn("-ar", command)
+        self.assertEqual(command[command.index("-ar") + 1], "100")
+
+    @patch("script.service.audio.subprocess.Popen")
+    def test_iter_windows(self, popen):
+        popen.return_value = make_process(np.zeros(550, dtype=np.float32))
+        audio = self.extractor.extract_to_raw("video.mp4", self.raw_path)
+
+        windows = list(self.extractor.iter_windows(audio))
+
+        self.assertEqual([window.offset for window in windows], [0.0, 2.0, 4.0])
+        self.assertEqual([len(window.audio) for window in windows], [200, 200, 150])
+        # window 는 memmap 의 view 라 파일을 다시 읽어 복사하지 않는다.
+        self.assertTrue(all(isinstance(window.audio, np.memmap) for window in windows))
+
+    @patch("script.service.audio.subprocess.Popen")
+    def test_extract_empty_audio(self, popen):
+        popen.return_value = make_process(np.zeros(0, dtype=np.float32))
+
+        audio = self.extractor.extract_to_raw("video.mp4", self.raw_path)
+
+        self.assertEqual(len(audio), 0)
+        self.assertEqual(list(self.extractor.iter_windows(audio)), [])
+
+    @patch("script.service.audio.subprocess.Popen")
+    def test_extract_failed(self, popen):
+        popen.return_value = make_process(np.zeros(100, dtype=np.float32), returncode=1)
+
+        with self.assertRaises(RuntimeError):
+            self.extractor.extract_to_raw("video.mp4", self.raw_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from script.service.inference_profile import InferenceProfile
+
+
+class TestInferenceProfile(unittest.TestCase):
+
+    def test_resolve_compute_type_auto(self):
+        profile = InferenceProfile()
+        self.assertEqual(profile.resolve_compute_type("cuda"), "float16")
+        self.assertEqual(profile.resolve_compute_type("cpu"), "float32")
+
+    def test_resolve_compute_type_fixed(self):
+        profile = InferenceProfile.from_config({"profile": "cpu_int8"})
+        self.assertEqual(profile.resolve_compute_type("cpu"), "int8")
+        self.assertEqual(profile.resolve_compute_type("cuda"), "int8")
+        self.assertTrue(profile.quantize_speaker_models)
+
+    def test_from_config(self):
+        self.assertEqual(InferenceProfile.from_config(None), InferenceProfile())
+        profile = InferenceProfile.from_config({
+            "profile": "gpu_mixed",
+            "profiles": {"gpu_mixed": {"compute_type": "int8_float16", "batch_size": 32, "unknown": 1}},
+        })
+        self.assertEqual(profile.name, "gpu_mixed")
+        self.assertEqual(profile.resolve_compute_type("cuda"), "int8_float16")
+        self.assertEqual(profile.batch_size, 32)
+
+    def test_from_config_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            InferenceProfile.from_config({"profile": "tpu"})
+
+    def test_signature_ignores_threads(self):
+        profile = InferenceProfile.from_config({"profile": "cpu_int8"})
+        self.assertEqual(profile.signature(), profile._replace(torch_threads=8, whisper_threads=2).signature())
+        self.assertNotEqual(profile.signature(), InferenceProfile().signature())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from script.service.llm_cache import LLMResponseCache
+
+
+class TestLLMResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = LLMResponseCache(self.directory.name, ttl_seconds=60, max_entries=2)
+
+    def test_hit_and_miss(self):
+        self.assertIsNone(self.cache.get("key"))
+        self.cache.put("key", "response")
+        self.assertEqual(self.cache.get("key"), "response")
+        self.assertEqual(self.cache.stats()["hit_count"], 1)
+        self.assertEqual(self.cache.stats()["miss_count"], 1)
+
+    def test_ttl(self):
+        with patch("script.service.llm_cache.time.time", return_value=1000.0):
+            self.cache.put("key", "response")
+        with patch("script.service.llm_cache.time.time", return_value=1059.0):
+            self.assertEqual(self.cache.get("key"), "response")
+        with patch("script.service.llm_cache.time.time", return_value=1061.0):
+            self.assertIsNone(self.cache.get("key"))
+
+    def test_evicts_least_recently_used(self):
+        with patch("script.service.llm_cache.time.time", return_value=1000.0):
+            self.cache.put("a", "1")
+        with patch("script.service.llm_cache.time.time", return_value=1001.0):
+            self.cache.put("b", "2")
+        with patch("script.service.llm_cache.time.time", return_value=1002.0):
+            self.cache.get("a")
+        with patch("script.service.llm_cache.time.time", return_value=1003.0):
+            self.cache.put("c", "3")
+            self.assertEqual(self.cache.get("a"), "1")
+            self.assertIsNone(self.cache.get("b"))
+            self.assertEqual(self.cache.get("c"), "3")
+        self.assertEqual(self.cache.stats()["size"], 2)
+
+    def test_persists_across_instances(self):
+        self.cache.put("key", "response")
+        self.assertEqual(LLMResponseCache(self.directory.name).get("key"), "response")
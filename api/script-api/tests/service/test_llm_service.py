@@ -0,0 +1,141 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+from openai import RateLimitError
+from pydantic import BaseModel
+
+from script.service.llm_service import LLMService, RateLimiter
+
+
+class Answer(BaseModel):
+    answer: str
+
+
+def rate_limit_error():
+    return RateLimitError("rate limited", response=MagicMock(status_code=429), body=None)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_concurrency(self):
+        limiter = RateLimiter(max_concurrency=1, tokens_per_minute=1000)
+        self.assertEqual(limiter.try_acquire(10), 0)
+        self.assertGreater(limiter.try_acquire(10), 0)
+        limiter.release()
+        self.assertEqual(limiter.try_acquire(10), 0)
+
+    def test_token_budget_is_shared_across_event_loops(self):
+        limiter = RateLimiter(max_concurrency=10, tokens_per_minute=100)
+
+        async def acquire():
+            await limiter.aacquire(60)
+            limiter.release()
+
+        asyncio.run(acquire())
+        # 새 event loop 에서도 같은 1분 예산을 쓴다.
+        self.assertGreater(limiter.try_acquire(60), 1)
+        self.assertEqual(limiter.try_acquire(40), 0)
+
+    def test_budget_expires_after_a_minute(self):
+        limiter = RateLimiter(max_concurrency=10, tokens_per_minute=100)
+        with patch("script.service.llm_service.time.monotonic", return_value=1000.0):
+            self.assertEqual(limiter.try_acquire(100), 0)
+            self.assertAlmostEqual(limiter.try_acquire(1), 60.0)
+        with patch("script.service.llm_service.time.monotonic", return_value=1060.0):
+            self.assertEqual(limiter.try_acquire(100), 0)
+
+
+class TestLLMServiceRateLimit(unittest.TestCase):
+
+    def setUp(self):
+        self.llm_service = LLMService("model", "token", backend="stub",
+                                      stub_responses=['{"answer": "ok"}'],
+                                      tokens_per_minute=1000, max_retries=2)
+
+    def test_run_retries_rate_limit(self):
+        invoke = MagicMock(side_effect=[rate_limit_error(), MagicMock(content="ok")])
+        with patch("script.service.llm_service.time.sleep") as mock_sleep:
+            self.assertEqual(self.llm_service._invoke_once("key", "prompt", invoke), "ok")
+        self.assertEqual(invoke.call_count, 2)
+        mock_sleep.assert_called_once()
+        self.assertEqual(self.llm_service.rate_limiter.active, 0)
+
+    def test_run_uses_token_budget(self):
+        self.llm_service.run("system ", "prompt {text}", {"text": "hello"}, Answer)
+        self.assertEqual(len(self.llm_service.rate_limiter.used_tokens), 1)
+        self.assertEqual(self.llm_service.rate_limiter.active, 0)
+
+    def test_run_batch_inside_running_loop(self):
+        async def call():
+            return self.llm_service.run_batch("system ", "prompt {text}", [{"text": "a"}], Answer)
+
+        result = asyncio.run(call())
+        self.assertEqual(result, [Answer(answer="ok")])
+
+
+class TestLLMServiceCache(unittest.TestCase):
+
+    def setUp(self):
+        self.response_cache = MagicMock()
+        self.response_cache.get.return_value = None
+        self.llm_service = LLMService("model", "token", backend="stub",
+                                      stub_responses=['{"answer": "ok"}'],
+                                      response_cache=self.response_cache)
+
+    def test_openai_model_uses_temperature(self):
+        with patch("script.service.llm_service.ChatOpenAI") as mock_chat:
+            LLMService("model", "token", temperature=0.2)
+        mock_chat.assert_called_once_with(openai_api_key="token", temperature=0.2)
+
+    def test_cache_hit_skips_model(self):
+        self.response_cache.get.return_value = '{"answer": "cached"}'
+        invoke = MagicMock()
+        self.assertEqual(self.llm_service._invoke_once("key", "prompt", invoke), '{"answer": "cached"}')
+        invoke.assert_not_called()
+
+    def test_cache_miss_stores_response(self):
+        result = self.llm_service.run("system ", "prompt {text}", {"text": "hello"}, Answer)
+        self.assertEqual(result, Answer(answer="ok"))
+        key, response = self.response_cache.put.call_args.args
+        self.assertEqual(response, '{"answer": "ok"}')
+        self.response_cache.get.assert_called_once_with(key)
+
+    def test_cache_key_depends_on_temperature_and_prompt(self):
+        parser, _ = self.llm_service._get_prompt_template("system ", "prompt {text}", {"text": "a"}, Answer)
+        key = self.llm_service._cache_key("prompt a", parser)
+        self.assertEqual(key, self.llm_service._cache_key("prompt a", parser))
+        self.assertNotEqual(key, self.llm_service._cache_key("prompt b", parser))
+        self.llm_service.temperature = 0.9
+        self.assertNotEqual(key, self.llm_service._cache_key("prompt a", parser))
+
+    def test_concurrent_requests_are_coalesced(self):
+        started = asyncio.Event()
+        release = asyncio.Event()
+        calls = []
+
+        async def ainvoke():
+            calls.append(1)
+            started.set()
+            await release.wait()
+            return MagicMock(content="ok")
+
+        async def call():
+            first = asyncio.create_task(self.llm_service._ainvoke_once("key", "prompt", ainvoke))
+            await started.wait()
+            second = asyncio.create_task(self.llm_service._ainvoke_once("key", "prompt", ainvoke))
+            await asyncio.sleep(0)
+            release.set()
+            return await asyncio.gather(first, second)
+
+        self.assertEqual(asyncio.run(call()), ["ok", "ok"])
+        self.assertEqual(len(calls), 1)
+        self.response_cache.put.assert_called_once_with("key", "ok")
+        self.assertEqual(self.llm_service._inflight, {})
+
+    def test_failed_request_is_not_cached(self):
+        invoke = MagicMock(side_effect=ValueError)
+        with self.assertRaises(ValueError):
+            self.llm_service._invoke_once("key", "prompt", invoke)
+        self.response_cache.put.assert_not_called()
+        self.assertEqual(self.llm_service._inflight, {})
@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import patch
+
+from script.service.model_registry import AlignModelRegistry
+
+
+@patch("script.service.model_registry.whisperx.load_align_model")
+class TestAlignModelRegistry(unittest.TestCase):
+
+    def test_reuses_loaded_model(self, load_align_model):
+        load_align_model.side_effect = lambda language_code, device: (f"model-{language_code}", {"language": language_code})
+        registry = AlignModelRegistry(max_size=2)
+
+        self.assertEqual(registry.get("ko", "cpu"), ("model-ko", {"language": "ko"}))
+        self.assertEqual(registry.get("ko", "cpu"), ("model-ko", {"language": "ko"}))
+
+        load_align_model.assert_called_once_with(language_code="ko", device="cpu")
+        self.assertEqual(registry.stats()["load_count"], 1)
+        self.assertEqual(registry.stats()["hit_count"], 1)
+
+    def test_evicts_least_recently_used(self, load_align_model):
+        load_align_model.side_effect = lambda language_code, device: (f"model-{language_code}-{device}", {})
+        registry = AlignModelRegistry(max_size=2)
+
+        registry.get("ko", "cpu")
+        registry.get("en", "cpu")
+        # ko 를 다시 쓰면 en 이 먼저 밀려난다.
+        registry.get("ko", "cpu")
+        registry.get("ko", "cuda")
+
+        self.assertEqual(registry.stats()["models"], ["ko:cpu", "ko:cuda"])
+        registry.get("en", "cpu")
+        self.assertEqual(load_align_model.call_count, 4)
+        self.assertEqual(registry.stats()["models"], ["ko:cuda", "en:cpu"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from script.service.model_backend import RemoteModelBackend
+from script.service.model_server import ModelServer
+
+
+class FakeBackend:
+
+    def signature(self):
+        return {"whisper": "large-v2", "compute_type": "float16"}
+
+    def transcribe(self, audio):
+        return [{"text": f"{len(audio)} samples", "start": 0.0, "end": len(audio) / 16000}]
+
+    def embed(self, wavs, relative_lengths):
+        return wavs.sum(axis=1, keepdims=True) * relative_lengths[:, None]
+
+    def similarity(self, embeddings, target_embedding):
+        raise ValueError("shape mismatch")
+
+    def emotion(self, audio_path):
+        return {audio_path: []}
+
+    def stats(self):
+        return {"mode": "local"}
+
+
+class TestModelServer(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.socket_path = os.path.join(directory.name, "model.sock")
+        self.server = ModelServer(FakeBackend(), self.socket_path, "secret")
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.addCleanup(self.thread.join, 5)
+        self.addCleanup(self.server.shutdown)
+        deadline = time.monotonic() + 5
+        while not os.path.exists(self.socket_path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.backend = RemoteModelBackend(self.socket_path, "secret", connect_timeout=5)
+
+    def test_round_trip(self):
+        self.assertEqual(self.backend.signature(), {"whisper": "large-v2", "compute_type": "float16"})
+        self.assertEqual(self.backend.transcribe(np.zeros(16000, dtype=np.float64)),
+                         [{"text": "16000 samples", "start": 0.0, "end": 1.0}])
+        embeddings = self.backend.embed(np.ones((2, 4), dtype=np.float32), np.array([1.0, 0.5], dtype=np.float32))
+        np.testing.assert_allclose(embeddings, [[4.0], [2.0]])
+        self.assertEqual(self.backend.emotion("a.wav"), {"a.wav": []})
+
+        stats = self.backend.stats()
+        self.assertEqual(stats["mode"], "remote")
+        self.assertEqual(stats["server"], {"mode": "local", "request_count": 4})
+
+    def test_error_reply(self):
+        with self.assertRaises(RuntimeError) as context:
+            self.backend.similarity(np.ones((1, 2)), np.ones(2))
+        self.assertIn("similarity failed", str(context.exception))
+        self.assertIn("shape mismatch", str(context.exception))
+
+        # 오류 응답 뒤에도 같은 연결로 다음 요청을 처리한다.
+        self.assertEqual(self.backend.signature()["whisper"], "large-v2")
+
+    def test_unknown_method(self):
+        with self.assertRaises(RuntimeError) as context:
+            self.backend._call("load_model")
+        self.assertIn("unknown method", str(context.exception))
+
+    def test_signature_is_cached(self):
+        self.backend.signature()
+        self.backend.signature()
+        self.assertEqual(self.backend.stats()["server"]["request_count"], 1)
+
+    def test_reconnect_after_connection_closed(self):
+        self.backend.signature()
+        self.backend._local.connection.close()
+        # 닫힌 연결은 OSError 로 끝나고 한 번 다시 연결해서 보낸다.
+        self.assertEqual(len(self.backend.transcribe(np.zeros(10))), 1)
+
+    def test_shutdown(self):
+        self.backend.signature()
+        self.server.shutdown()
+        self.thread.join(5)
+
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_connect_timeout(self):
+        backend = RemoteModelBackend(self.socket_path + ".missing", "secret", connect_timeout=0)
+        started = time.monotonic()
+        with self.assertRaises(FileNotFoundError):
+            backend.signature()
+        self.assertLess(time.monotonic() - started, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import MagicMock
+
+from script.service.inference_profile import InferenceProfile
+from script.service.parallel_stt import ParallelTranscriber, merge_chunk_segments
+
+
+def seg(text, start, end):
+    return {"text": text, "start": start, "end": end}
+
+
+class TestMergeChunkSegments(unittest.TestCase):
+
+    def test_joins_segments_straddling_boundary(self):
+        chunks = [
+            [seg("안녕", 0.0, 5.0), seg("오늘은", 118.0, 120.0)],
+            [seg("뭐 할까", 120.1, 122.0), seg("그래", 125.0, 126.0)],
+        ]
+        embeddings = [["e0", "e1"], ["e2", "e3"]]
+
+        segments, merged_embeddings = merge_chunk_segments(chunks, embeddings, [120.0, 240.0])
+
+        self.assertEqual(segments, [
+            seg("안녕", 0.0, 5.0),
+            seg("오늘은 뭐 할까", 118.0, 122.0),
+            seg("그래", 125.0, 126.0),
+        ])
+        # 합친 segment 는 더 긴 쪽(오늘은 2.0초 < 뭐 할까 1.9초 이므로 앞쪽) embedding 을 쓴다.
+        self.assertEqual(merged_embeddings, ["e0", "e1", "e3"])
+
+    def test_keeps_segments_apart_from_boundary(self):
+        chunks = [[seg("a", 0.0, 100.0)], [seg("b", 120.1, 121.0)]]
+        segments, embeddings = merge_chunk_segments(chunks, [["e0"], ["e1"]], [120.0, 240.0])
+        self.assertEqual(segments, [seg("a", 0.0, 100.0), seg("b", 120.1, 121.0)])
+        self.assertEqual(embeddings, ["e0", "e1"])
+
+    def test_keeps_segments_with_large_gap(self):
+        chunks = [[seg("a", 110.0, 119.8)], [seg("b", 121.0, 122.0)]]
+        segments, _ = merge_chunk_segments(chunks, [["e0"], ["e1"]], [120.0, 240.0])
+        self.assertEqual(len(segments), 2)
+
+    def test_skips_empty_middle_chunk(self):
+        # VAD window 처럼 chunk 사이가 비어 있고, 가운데 chunk 에서 segment 가 나오지 않은 경우
+        chunks = [[seg("오늘은", 10.0, 20.0)], [], [seg("뭐 할까", 20.2, 22.0)]]
+        boundaries = [20.0, 20.1, 30.0]
+
+        segments, embeddings = merge_chunk_segments(chunks, [["e0"], [], ["e1"]], boundaries)
+
+        self.assertEqual(segments, [seg("오늘은 뭐 할까", 10.0, 22.0)])
+        self.assertEqual(embeddings, ["e0"])
+
+    def test_empty_first_chunk(self):
+        chunks = [[], [seg("a", 120.0, 121.0)], [seg("b", 240.1, 241.0)]]
+        segments, embeddings = merge_chunk_segments(chunks, [[], ["e0"], ["e1"]], [120.0, 240.0, 360.0])
+        self.assertEqual(segments, [seg("a", 120.0, 121.0), seg("b", 240.1, 241.0)])
+        self.assertEqual(embeddings, ["e0", "e1"])
+
+    def test_uses_embedding_of_longer_part(self):
+        chunks = [[seg("a", 119.5, 120.0)], [seg("b", 120.0, 123.0)]]
+        _, embeddings = merge_chunk_segments(chunks, [["e0"], ["e1"]], [120.0, 240.0])
+        self.assertEqual(embeddings, ["e1"])
+
+
+class TestParallelTranscriber(unittest.TestCase):
+
+    def test_signature(self):
+        profile = InferenceProfile.from_config({"profile": "cpu_int8"})
+        transcriber = ParallelTranscriber(workers=3, batch_size=8, profile=profile)
+        self.assertEqual(transcriber.signature(), {
+            "parallel_workers": 3,
+            "parallel_model": "large-v2",
+            "parallel_compute_type": "int8",
+            "parallel_batch_size": 8,
+            "parallel_language": "ko",
+        })
+        # auto 는 CPU 에서 float32 로 정해진다.
+        transcriber = ParallelTranscriber(profile=InferenceProfile())
+        self.assertEqual(transcriber.signature()["parallel_compute_type"], "float32")
+
+    def test_imap_bounds_items_in_flight(self):
+        transcriber = ParallelTranscriber(workers=2)
+        submitted = []
+        executor = MagicMock()
+
+        def submit(func, source):
+            submitted.append(source)
+            future = MagicMock()
+            future.result.return_value = [seg(source, 0.0, 1.0)]
+            return future
+
+        executor.submit.side_effect = submit
+        transcriber._executor = executor
+        pulled = []
+
+        def items():
+            for index in range(10):
+                pulled.append(index)
+                yield {"audio": f"window{index}"}
+
+        results = transcriber.imap(items(), source=lambda item: item["audio"], max_in_flight=3)
+        first_item, first_segments = next(results)
+
+        # 첫 결과를 받기 전까지 max_in_flight 개만 꺼내서 넘긴다.
+        self.assertEqual(len(pulled), 3)
+        self.assertEqual(first_item, {"audio": "window0"})
+        self.assertEqual(first_segments, [seg("window0", 0.0, 1.0)])
+        rest = list(results)
+        self.assertEqual([item["audio"] for item, _ in rest], [f"window{index}" for index in range(1, 10)])
+        self.assertEqual(submitted, [f"window{index}" for index in range(10)])
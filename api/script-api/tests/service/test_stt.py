@@ -0,0 +1,170 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from script.service.audio import AudioWindow
+from script.service.parallel_stt import ParallelTranscriber
+from script.service.stt import SttService
+from script.service.transcription_cache import TranscriptionCache
+
+
+def make_stt_service(**kwargs) -> SttService:
+    llm_service = MagicMock(model_name="gpt-4o", temperature=0.5)
+    model_backend = MagicMock(mode="local")
+    model_backend.signature.return_value = {"whisper_model": "large-v3"}
+    return SttService(llm_service=llm_service, model_backend=model_backend,
+                      audio_extractor=MagicMock(window_seconds=120), **kwargs)
+
+
+class TestSttServiceCacheKey(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.stt_service = make_stt_service(transcription_cache=TranscriptionCache(self.directory.name))
+
+    def test_no_cache(self):
+        self.assertIsNone(make_stt_service()._cache_key("digest"))
+        self.assertIsNone(self.stt_service._cache_key(None))
+
+    def test_key_changes_with_temperature(self):
+        key = self.stt_service._cache_key("digest")
+        self.assertEqual(key, self.stt_service._cache_key("digest"))
+
+        self.stt_service.llm_service.temperature = 0.0
+        self.assertNotEqual(key, self.stt_service._cache_key("digest"))
+
+    def test_key_changes_with_prompt(self):
+        key = self.stt_service._cache_key("digest")
+        with patch("script.service.stt.SPEAKER_DETECT_SYSTEM_PROMPT", "identify the SPEAKER_0 is therapist"):
+            self.assertNotEqual(key, self.stt_service._cache_key("digest"))
+
+    def test_key_separates_parallel_path(self):
+        key = self.stt_service._cache_key("digest")
+        parallel = make_stt_service(transcription_cache=self.stt_service.transcription_cache,
+                                    transcriber=ParallelTranscriber(workers=2, compute_type="int8"))
+        parallel_key = parallel._cache_key("digest")
+        self.assertNotEqual(key, parallel_key)
+
+        parallel.transcriber.workers = 4
+        self.assertNotEqual(parallel_key, parallel._cache_key("digest"))
+        parallel.transcriber.workers = 2
+        parallel.transcriber.compute_type = "float32"
+        self.assertNotEqual(parallel_key, parallel._cache_key("digest"))
+        parallel.transcriber.compute_type = "int8"
+        parallel.audio_extractor.window_seconds = 60
+        self.assertNotEqual(parallel_key, parallel._cache_key("digest"))
+
+    def test_key_ignores_disabled_transcriber(self):
+        sequential = make_stt_service(transcription_cache=self.stt_service.transcription_cache,
+                                      transcriber=ParallelTranscriber(workers=0))
+        self.assertEqual(self.stt_service._cache_key("digest"), sequential._cache_key("digest"))
+
+
+class TestSttServiceSpeakerVerification(unittest.TestCase):
+
+    def setUp(self):
+        self.stt_service = make_stt_service(verification_batch_size=2)
+        # segment 길이(초)를 embedding 으로 돌려준다.
+        self.stt_service.model_backend.embed.side_effect = \
+            lambda wavs, lengths: [np.array([length * wavs.shape[1] / 10]) for length in lengths]
+
+    def test_encode_segments_batched(self):
+        signal = np.zeros(100, dtype=np.float32)
+        segments = [
+            {"start": 0.0, "end": 1.0},
+            {"start": 1.0, "end": 1.0},  # 길이 0
+            {"start": 1.0, "end": 3.0},
+            {"start": 3.0, "end": 6.0},
+            {"start": 6.0, "end": 10.0},
+        ]
+
+        embeddings = self.stt_service._encode_segments_batched(signal, 10, segments)
+
+        # 길이 0 인 segment 를 빼고 2개씩 encode 한다.
+        self.assertEqual(self.stt_service.model_backend.embed.call_count, 2)
+        first_wavs, first_lengths = self.stt_service.model_backend.embed.call_args_list[0].args
+        self.assertEqual(first_wavs.shape, (2, 20))
+        np.testing.assert_allclose(first_lengths, [0.5, 1.0])
+        self.assertIsNone(embeddings[1])
+        self.assertEqual([float(embedding[0]) for idx, embedding in enumerate(embeddings) if idx != 1],
+                         [1.0, 2.0, 3.0, 4.0])
+
+    def test_encode_segments_batched_failed_batch(self):
+        self.stt_service.model_backend.embed.side_effect = [RuntimeError("out of memory"), [np.ones(1)]]
+        signal = np.zeros(100, dtype=np.float32)
+        segments = [{"start": 0.0, "end": 1.0}, {"start": 1.0, "end": 2.0}, {"start": 2.0, "end": 3.0}]
+
+        embeddings = self.stt_service._encode_segments_batched(signal, 10, segments)
+
+        # 실패한 batch 의 segment 만 None 이 된다.
+        self.assertIsNone(embeddings[0])
+        self.assertIsNone(embeddings[1])
+        self.assertIsNotNone(embeddings[2])
+
+    def test_verify_speakers(self):
+        self.stt_service.model_backend.similarity.return_value = np.array([0.9, 0.6, 0.1])
+        target = np.ones(4)
+        embeddings = [np.ones(4), None, np.ones(4), np.ones(4)]
+
+        speakers = self.stt_service._verify_speakers(target, embeddings)
+
+        self.assertEqual(speakers, ["SPEAKER_0", "SPEAKER_0", "SPEAKER_1", "SPEAKER_1"])
+        # embedding 이 있는 segment 만 한 번에 비교한다.
+        stacked, compared_target = self.stt_service.model_backend.similarity.call_args.args
+        self.assertEqual(stacked.shape, (3, 4))
+        self.assertIs(compared_target, target)
+
+    def test_verify_speakers_without_target(self):
+        speakers = self.stt_service._verify_speakers(None, [np.ones(4), None])
+        self.assertEqual(speakers, ["SPEAKER_0", "SPEAKER_0"])
+        self.stt_service.model_backend.similarity.assert_not_called()
+
+
+class TestSttServiceWindows(unittest.TestCase):
+
+    def setUp(self):
+        self.stt_service = make_stt_service()
+        self.stt_service._make_final_script = MagicMock()
+        self.stt_service.model_backend.embed.side_effect = lambda wavs, lengths: [np.ones(2) for _ in lengths]
+        self.stt_service.model_backend.similarity.side_effect = lambda stacked, target: np.ones(len(stacked))
+
+    def test_make_script_from_windows_reads_windows_lazily(self):
+        pulled = []
+
+        def windows():
+            for index in range(3):
+                pulled.append(index)
+                yield AudioWindow(offset=index * 2.0, audio=np.zeros(2 * 16000, dtype=np.float32))
+
+        def transcribe(audio):
+            # 전사할 때는 지금 window 까지만 꺼내져 있어야 한다.
+            self.assertEqual(len(pulled), self.stt_service.model_backend.transcribe.call_count)
+            return [{"text": "a", "start": 0.0, "end": 1.0}]
+
+        self.stt_service.model_backend.transcribe.side_effect = transcribe
+
+        self.stt_service.make_script_from_windows(windows())
+
+        self.assertEqual(self.stt_service.model_backend.transcribe.call_count, 3)
+        segments, speakers = self.stt_service._make_final_script.call_args.args
+        self.assertEqual([seg["start"] for seg in segments], [0.0, 2.0, 4.0])
+
+    def test_make_script_from_windows_parallel(self):
+        transcriber = MagicMock(workers=2)
+        transcriber.imap.side_effect = lambda windows, source: (
+            (window, [{"text": "a", "start": 0.0, "end": 1.0}]) for window in windows)
+        self.stt_service.transcriber = transcriber
+        windows = (AudioWindow(offset=index * 2.0, audio=np.zeros(2 * 16000, dtype=np.float32)) for index in range(2))
+
+        self.stt_service.make_script_from_windows(windows)
+
+        transcriber.map.assert_not_called()
+        segments, _ = self.stt_service._make_final_script.call_args.args
+        self.assertEqual([seg["start"] for seg in segments], [0.0, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
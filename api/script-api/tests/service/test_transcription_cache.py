@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from script.service.transcription_cache import TranscriptionCache
+
+
+class TestTranscriptionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = TranscriptionCache(self.directory.name, max_size_mb=1)
+
+    def test_hit_and_miss(self):
+        key = TranscriptionCache.make_key("digest", {"model": "large-v3"})
+        self.assertIsNone(self.cache.get_segments(key))
+
+        self.cache.put_segments(key, [{"text": "안녕", "start": 0.0, "end": 1.0}], ["SPEAKER_0"])
+        self.cache.put_script(key, {"scripts": []})
+
+        self.assertEqual(self.cache.get_segments(key)["speakers"], ["SPEAKER_0"])
+        self.assertEqual(self.cache.get_script(key), {"scripts": []})
+        stats = self.cache.stats()
+        self.assertEqual(stats["hit_count"], 2)
+        self.assertEqual(stats["miss_count"], 1)
+        self.assertEqual(stats["entry_count"], 2)
+
+    def test_key_depends_on_signature(self):
+        key = TranscriptionCache.make_key("digest", {"model": "large-v3", "llm_temperature": 0.5})
+        self.assertEqual(key, TranscriptionCache.make_key("digest", {"llm_temperature": 0.5, "model": "large-v3"}))
+        self.assertNotEqual(key, TranscriptionCache.make_key("digest", {"model": "large-v3", "llm_temperature": 0.0}))
+        self.assertNotEqual(key, TranscriptionCache.make_key("other", {"model": "large-v3", "llm_temperature": 0.5}))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.max_bytes = 2500
+        value = {"scripts": ["x" * 1000]}
+        self.cache.put_script("a" * 64, value)
+        self.cache.put_script("b" * 64, value)
+        # a 를 읽으면 최근 항목이 되어 b 가 먼저 지워진다.
+        self.assertIsNotNone(self.cache.get_script("a" * 64))
+        self.cache.put_script("c" * 64, value)
+
+        self.assertIsNone(self.cache.get_script("b" * 64))
+        self.assertIsNotNone(self.cache.get_script("a" * 64))
+        self.assertIsNotNone(self.cache.get_script("c" * 64))
+        stats = self.cache.stats()
+        self.assertEqual(stats["evict_count"], 1)
+        self.assertLessEqual(stats["size_bytes"], 2500)
+
+    def test_put_does_not_walk_cache_dir(self):
+        with patch("script.service.transcription_cache.os.walk") as walk:
+            self.cache.put_script("a" * 64, {"scripts": []})
+            self.cache.stats()
+        walk.assert_not_called()
+
+    def test_index_rebuilt_from_volume(self):
+        self.cache.put_script("a" * 64, {"scripts": []})
+        self.cache.put_script("a" * 64, {"scripts": ["updated"]})
+
+        cache = TranscriptionCache(self.directory.name, max_size_mb=1)
+
+        self.assertEqual(cache.stats()["entry_count"], 1)
+        self.assertEqual(cache.stats()["size_bytes"], self.cache.stats()["size_bytes"])
+        self.assertEqual(cache.get_script("a" * 64), {"scripts": ["updated"]})
+
+    def test_removed_entry_is_forgotten(self):
+        self.cache.put_script("a" * 64, {"scripts": []})
+        os.remove(self.cache._path("a" * 64, "script"))
+
+        self.assertIsNone(self.cache.get_script("a" * 64))
+        self.assertEqual(self.cache.stats()["entry_count"], 0)
+        self.assertEqual(self.cache.stats()["size_bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from script.service.vad import SpeechRegion, VadSegmenter, make_vad_segmenter
+
+SR = 16000
+
+
+def tone(seconds, amplitude=0.3):
+    return (amplitude * np.sin(np.arange(int(seconds * SR)) * 0.05)).astype(np.float32)
+
+
+def silence(seconds, amplitude=0.001, seed=0):
+    return np.random.default_rng(seed).normal(0, amplitude, int(seconds * SR)).astype(np.float32)
+
+
+class TestVadSegmenter(unittest.TestCase):
+
+    def setUp(self):
+        self.segmenter = VadSegmenter(max_window_seconds=120)
+
+    def assert_no_overlap(self, regions):
+        for previous, current in zip(regions, regions[1:]):
+            self.assertLessEqual(previous.end, current.start)
+
+    def test_detect_continuous_tone(self):
+        audio = tone(60)
+        regions = self.segmenter.detect(audio)
+        self.assertEqual(len(regions), 1)
+        self.assertAlmostEqual(regions[0].start, 0.0, places=2)
+        self.assertAlmostEqual(regions[0].end, 60.0, places=1)
+
+    def test_detect_silence_only(self):
+        self.assertEqual(self.segmenter.detect(np.zeros(SR * 30, dtype=np.float32)), [])
+        self.assertEqual(self.segmenter.detect(silence(30)), [])
+
+    def test_detect_mostly_speech(self):
+        audio = np.concatenate([tone(57), silence(3), tone(40)])
+        regions = self.segmenter.detect(audio)
+        self.assertEqual(len(regions), 2)
+        self.assertAlmostEqual(regions[0].end, 57.2, delta=0.1)
+        self.assertAlmostEqual(regions[1].start, 59.8, delta=0.1)
+
+    def test_detect_speech_silence_alternation(self):
+        audio = np.concatenate([silence(5), tone(10), silence(20, seed=1), tone(5), silence(5, seed=2)])
+        regions = self.segmenter.detect(audio)
+        self.assertEqual(len(regions), 2)
+        self.assertAlmostEqual(regions[0].start, 4.8, delta=0.1)
+        self.assertAlmostEqual(regions[0].end, 15.2, delta=0.1)
+        self.assertAlmostEqual(regions[1].start, 34.8, delta=0.1)
+        self.assertAlmostEqual(regions[1].end, 40.2, delta=0.1)
+
+        windows = self.segmenter.group(regions)
+        # 20초 침묵은 max_gap_seconds 보다 길어서 window 에서 빠진다.
+        self.assertEqual(windows, regions)
+
+    def test_detect_short_pause_is_joined(self):
+        audio = np.concatenate([silence(5), tone(3), silence(0.3, seed=1), tone(3), silence(5, seed=2)])
+        regions = self.segmenter.detect(audio)
+        self.assertEqual(len(regions), 1)
+
+    def test_detect_region_longer_than_max_window(self):
+        audio = np.concatenate([silence(5), tone(300), silence(5, seed=1)])
+        audio[int(185 * SR):int(185.2 * SR)] *= 0.01
+        regions = self.segmenter.detect(audio)
+
+        self.assertGreater(len(regions), 2)
+        for region in regions:
+            self.assertLessEqual(region.end - region.start, 120)
+        # 긴 발화 안에서 자른 지점에는 padding 을 붙이지 않아 window 가 겹치지 않는다.
+        self.assert_no_overlap(regions)
+        for previous, current in zip(regions, regions[1:]):
+            self.assertAlmostEqual(previous.end, current.start, places=6)
+        self.assertAlmostEqual(regions[0].start, 4.8, delta=0.1)
+        self.assertAlmostEqual(regions[-1].end, 305.2, delta=0.1)
+        # 가장 조용한 frame 에서 자른다.
+        self.assertIn(round(regions[1].end, 1), (185.0, 185.1, 185.2))
+
+    def test_group_cuts_between_regions(self):
+        regions = [SpeechRegion(0, 50), SpeechRegion(51, 100), SpeechRegion(101, 150)]
+        windows = self.segmenter.group(regions)
+        self.assertEqual(windows, [SpeechRegion(0, 100), SpeechRegion(101, 150)])
+
+    def test_segment_falls_back_to_fixed_windows(self):
+        regions, windows = self.segmenter.segment(silence(300))
+        self.assertEqual(windows, [SpeechRegion(0.0, 120.0), SpeechRegion(120.0, 240.0),
+                                   SpeechRegion(240.0, 300.0)])
+        self.assertEqual(regions, windows)
+
+    def test_iter_windows_keeps_offset(self):
+        audio = np.concatenate([silence(10), tone(5), silence(10, seed=1)])
+        regions, windows = self.segmenter.segment(audio)
+        chunks = list(self.segmenter.iter_windows(audio, windows))
+        self.assertEqual(len(chunks), 1)
+        self.assertAlmostEqual(chunks[0].offset, 9.8, delta=0.1)
+        self.assertEqual(len(chunks[0].audio), int(windows[0].end * SR) - int(windows[0].start * SR))
+
+    def test_write_and_read_index(self):
+        audio = np.concatenate([silence(10), tone(5), silence(10, seed=1)])
+        regions, windows = self.segmenter.segment(audio)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "speech_index.json")
+            index = self.segmenter.write_index(path, audio, regions, windows)
+            self.assertEqual(VadSegmenter.read_index(path), json.loads(json.dumps(index)))
+        self.assertEqual(index["total_seconds"], 25.0)
+        self.assertEqual(len(index["windows"]), 1)
+
+    def test_make_vad_segmenter(self):
+        self.assertIsNone(make_vad_segmenter(enabled=False))
+        segmenter = make_vad_segmenter(max_window_seconds=60, min_energy_db=None)
+        self.assertEqual(segmenter.max_window_seconds, 60)
+        self.assertEqual(segmenter.min_energy_db, -50.0)
@@ -0,0 +1,88 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from script.service.warmup import ModelWarmup
+
+
+def make_backend(*components):
+    backend = MagicMock()
+    backend.warmup_components.return_value = list(components)
+    return backend
+
+
+class TestModelWarmup(unittest.TestCase):
+
+    def test_eager(self):
+        warmup = ModelWarmup(mode="eager")
+        load = MagicMock()
+
+        warmup.start(make_backend(("whisper", load), ("align", load)))
+
+        self.assertTrue(warmup.is_ready())
+        progress = warmup.progress()
+        self.assertEqual(progress["loaded"], 2)
+        self.assertEqual(progress["components"]["whisper"]["state"], "ready")
+        self.assertEqual(load.call_count, 2)
+
+    def test_lazy(self):
+        warmup = ModelWarmup(mode="lazy")
+        load = MagicMock()
+
+        warmup.start(make_backend(("whisper", load)))
+
+        self.assertTrue(warmup.is_ready())
+        self.assertEqual(warmup.progress()["components"], {"whisper": {"state": "lazy"}})
+        load.assert_not_called()
+
+    def test_background_state_changes(self):
+        warmup = ModelWarmup(mode="background")
+        loading = threading.Event()
+        release = threading.Event()
+
+        def load():
+            loading.set()
+            release.wait(5)
+
+        warmup.start(make_backend(("whisper", load), ("align", MagicMock())))
+
+        self.assertTrue(loading.wait(5))
+        progress = warmup.progress()
+        self.assertFalse(progress["ready"])
+        self.assertEqual(progress["components"]["whisper"]["state"], "loading")
+        self.assertEqual(progress["components"]["align"]["state"], "pending")
+
+        release.set()
+        warmup._thread.join(5)
+        self.assertTrue(warmup.is_ready())
+
+    def test_retry_after_error(self):
+        warmup = ModelWarmup(mode="eager", max_attempts=3, retry_seconds=0)
+        load = MagicMock(side_effect=[OSError("model server not ready"), None])
+
+        warmup.start(make_backend(("model_server", load)))
+
+        self.assertTrue(warmup.is_ready())
+        component = warmup.progress()["components"]["model_server"]
+        self.assertEqual(component["state"], "ready")
+        self.assertEqual(component["attempt"], 2)
+
+    def test_error_after_max_attempts(self):
+        warmup = ModelWarmup(mode="eager", max_attempts=2, retry_seconds=0)
+        failing = MagicMock(side_effect=RuntimeError("out of memory"))
+        load = MagicMock()
+
+        warmup.start(make_backend(("whisper", failing), ("align", load)))
+
+        # 실패한 component 가 있으면 나머지가 올라가도 ready 가 아니고, 더 시도하지 않는다.
+        self.assertEqual(failing.call_count, 2)
+        self.assertFalse(warmup.is_ready())
+        progress = warmup.progress()
+        self.assertEqual(progress["components"]["whisper"]["state"], "error")
+        self.assertIn("out of memory", progress["components"]["whisper"]["error"])
+        self.assertEqual(progress["components"]["align"]["state"], "ready")
+        self.assertEqual(progress["loaded"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""VideoService encoder backend 별 wall time / peak RSS benchmark.
+
+backend 마다 별도 프로세스에서 같은 sample clip 을 encode 하고,
+python 프로세스와 자식(ffmpeg) 프로세스의 최대 RSS 를 따로 기록한다.
+
+    cd package/object-package
+    poetry run python -m benchmark.encoder --input sample.mp4 --backends ffmpeg moviepy
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+from object.service.encoder import EncodingProfile, make_encoder
+
+
+def run_backend(backend: str, input_path: str, profile: EncodingProfile, queue):
+    encoder = make_encoder(backend, profile)
+    encoded_path = os.path.join(tempfile.mkdtemp(), f"encoded_{backend}.mp4")
+    started = time.perf_counter()
+    error = None
+    try:
+        encoder.encode(input_path, encoded_path)
+    except Exception as e:
+        error = str(e)
+    elapsed = time.perf_counter() - started
+
+    # linux 의 ru_maxrss 단위는 KB
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    size = os.path.getsize(encoded_path) if os.path.exists(encoded_path) else 0
+    queue.put((backend, elapsed, self_rss, children_rss, size, error))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", required=True)
+    parser.add_argument("--backends", nargs="+", default=["ffmpeg", "moviepy"])
+    parser.add_argument("--fps", type=int, default=24)
+    parser.add_argument("--bitrate", default="96k")
+    parser.add_argument("--preset", default="ultrafast")
+    args = parser.parse_args()
+
+    profile = EncodingProfile(fps=args.fps, bitrate=args.bitrate, preset=args.preset)
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+
+    print(f"{'backend':<10}{'wall(s)':>10}{'python RSS(MB)':>16}{'child RSS(MB)':>15}{'output(MB)':>12}")
+    for backend in args.backends:
+        process = context.Process(target=run_backend, args=(backend, args.input, profile, queue))
+        process.start()
+        backend, elapsed, self_rss, children_rss, size, error = queue.get()
+        process.join()
+        if error:
+            print(f"{backend:<10} failed: {error}")
+            continue
+        print(f"{backend:<10}{elapsed:>10.2f}{self_rss / 1024:>16.1f}{children_rss / 1024:>15.1f}{size / 1024 / 1024:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
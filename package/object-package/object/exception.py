@@ -22,3 +22,14 @@ class DownloadFailed(ServiceException):
         self.status_code = 400
         self.error_code = 1001
         super().__init__(self.message)
+
+
+class RangeNotSatisfiable(ServiceException):
+    """Range Not Satisfiable"""
+
+    def __init__(self, file: str, object_size: int):
+        self.message = f"File [{file}] Requested range not satisfiable."
+        self.status_code = 416
+        self.error_code = 1002
+        self.object_size = object_size
+        super().__init__(self.message)
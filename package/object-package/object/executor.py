@@ -0,0 +1,22 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BoundedExecutor:
+    """blocking 호출(boto3, SQLAlchemy 등)을 크기가 정해진 전용 thread pool 로 넘겨 event loop 를 막지 않게 한다."""
+
+    def __init__(self, max_workers: int = 16, thread_name_prefix: str = ""):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,9 @@
+from object.executor import BoundedExecutor
+
+
+class AsyncRepository(BoundedExecutor):
+    """blocking boto3 repository 호출을 전용 thread pool 로 넘겨 event loop 를 막지 않게 한다."""
+
+    def __init__(self, repository, max_workers: int = 16):
+        super().__init__(max_workers, thread_name_prefix=type(repository).__name__)
+        self.repository = repository
@@ -0,0 +1,21 @@
+from object.repository.async_base import AsyncRepository
+from object.repository.script import ScriptRepository
+
+
+class AsyncScriptRepository(AsyncRepository):
+    def __init__(self, repository: ScriptRepository, max_workers: int = 16):
+        super().__init__(repository, max_workers)
+
+    async def get_json(self, object_name: str):
+        return await self.run(self.repository.get_json, object_name)
+
+    async def upload_json(self, script: bytes, object_name: str):
+        return await self.run(self.repository.upload_json, script, object_name)
+
+    async def get_object_list(self, file_path: str):
+        return await self.run(self.repository.get_object_list, file_path)
+
+    async def get_presigned_download_url(self, object_name: str, expires_in: int = 300):
+        return await self.run(
+            self.repository.get_presigned_download_url, object_name, expires_in
+        )
@@ -0,0 +1,47 @@
+from object.repository.async_base import AsyncRepository
+from object.repository.video import VideoRepository
+
+
+class AsyncVideoRepository(AsyncRepository):
+    def __init__(self, repository: VideoRepository, max_workers: int = 16):
+        super().__init__(repository, max_workers)
+
+    async def upload_obj(self, file, object_name: str):
+        return await self.run(self.repository.upload_obj, file, object_name)
+
+    async def get_object(self, object_name: str, byte_range: str = None):
+        return await self.run(self.repository.get_object, object_name, byte_range)
+
+    async def delete(self, object_name: str):
+        return await self.run(self.repository.delete, object_name)
+
+    async def get_object_list(self):
+        return await self.run(self.repository.get_object_list)
+
+    async def get_presigned_url(self, file_path: str):
+        return await self.run(self.repository.get_presigned_url, file_path)
+
+    async def get_presigned_download_url(self, object_name: str, expires_in: int = 300):
+        return await self.run(
+            self.repository.get_presigned_download_url, object_name, expires_in
+        )
+
+    async def create_multipart_upload(self, object_name: str):
+        return await self.run(self.repository.create_multipart_upload, object_name)
+
+    async def upload_part(
+        self, object_name: str, upload_id: str, part_number: int, body: bytes
+    ):
+        return await self.run(
+            self.repository.upload_part, object_name, upload_id, part_number, body
+        )
+
+    async def complete_multipart_upload(self, object_name: str, upload_id: str, parts: list):
+        return await self.run(
+            self.repository.complete_multipart_upload, object_name, upload_id, parts
+        )
+
+    async def abort_multipart_upload(self, object_name: str, upload_id: str):
+        return await self.run(
+            self.repository.abort_multipart_upload, object_name, upload_id
+        )
@@ -1,6 +1,10 @@
+from botocore.exceptions import ClientError
+
+from object.exception import RangeNotSatisfiable
 from object.storage.client import ClientManager
 import traceback
 import os
+from typing import Iterator
 
 class VideoRepository:
     def __init__(self, bucket: str, client_manager: ClientManager):
@@ -11,7 +15,12 @@ class VideoRepository:
     def upload(self, file_name: str, object_name: str):
         try:
             client = self.client_manager.get_client()
-            client.upload_file(file_name, self.bucket, self.path + object_name)
+            client.upload_file(
+                file_name,
+                self.bucket,
+                self.path + object_name,
+                Config=self.client_manager.get_transfer_config(),
+            )
             return object_name
         except Exception as e:
             print(f"Cannot upload file: '{object_name}' to S3.", e)
@@ -20,12 +29,68 @@ class VideoRepository:
     def upload_obj(self, file, object_name: str):
         try:
             client = self.client_manager.get_client()
-            client.upload_fileobj(file, self.bucket, self.path + object_name)
+            client.upload_fileobj(
+                file,
+                self.bucket,
+                self.path + object_name,
+                Config=self.client_manager.get_transfer_config(),
+            )
             return object_name
         except Exception as e:
             print(f"Cannot upload file: '{object_name}' to S3.", e)
             return None
 
+    def create_multipart_upload(self, object_name: str):
+        try:
+            client = self.client_manager.get_client()
+            response = client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.path + object_name
+            )
+            return response["UploadId"]
+        except Exception as e:
+            print(f"Cannot create multipart upload: '{object_name}' to S3.", e)
+            return None
+
+    def upload_part(self, object_name: str, upload_id: str, part_number: int, body: bytes):
+        try:
+            client = self.client_manager.get_client()
+            response = client.upload_part(
+                Bucket=self.bucket,
+                Key=self.path + object_name,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )
+            return response["ETag"]
+        except Exception as e:
+            print(f"Cannot upload part {part_number}: '{object_name}' to S3.", e)
+            return None
+
+    def complete_multipart_upload(self, object_name: str, upload_id: str, parts: list):
+        try:
+            client = self.client_manager.get_client()
+            client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.path + object_name,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+            return object_name
+        except Exception as e:
+            print(f"Cannot complete multipart upload: '{object_name}' to S3.", e)
+            return None
+
+    def abort_multipart_upload(self, object_name: str, upload_id: str):
+        try:
+            client = self.client_manager.get_client()
+            client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.path + object_name, UploadId=upload_id
+            )
+            return object_name
+        except Exception as e:
+            print(f"Cannot abort multipart upload: '{object_name}' to S3.", e)
+            return None
+
     def download(self, object_name: str, file_name: str):
         try:
             client = self.client_manager.get_client()
@@ -34,7 +99,12 @@ class VideoRepository:
             if not os.path.exists(file_dir):
                 os.makedirs(file_dir, exist_ok=True)
 
-            client.download_file(self.bucket, self.path + object_name, file_name)
+            client.download_file(
+                self.bucket,
+                self.path + object_name,
+                file_name,
+                Config=self.client_manager.get_transfer_config(),
+            )
             return file_name
         except Exception as e:
             # test
@@ -44,14 +114,32 @@ class VideoRepository:
             print(f"Cannot download file: '{object_name}' from S3.")
             return None
 
-    def get_object(self, object_name: str):
+    def get_object(self, object_name: str, byte_range: str = None):
         try:
             client = self.client_manager.get_client()
+            if byte_range:
+                return client.get_object(
+                    Bucket=self.bucket, Key=self.path + object_name, Range=byte_range
+                )
             return client.get_object(Bucket=self.bucket, Key=self.path + object_name)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "InvalidRange":
+                # 파일 크기를 넘는 range 는 다운로드 실패가 아니라 416 으로 응답해야 한다.
+                raise RangeNotSatisfiable(object_name, self._invalid_range_size(e, object_name))
+            print(f"Cannot download file: '{object_name}' from S3.")
+            return None
         except Exception as e:
             print(f"Cannot download file: '{object_name}' from S3.")
             return None
 
+    def _invalid_range_size(self, error: ClientError, object_name: str) -> int:
+        # S3 는 InvalidRange 응답에 ActualObjectSize 를 넣어 준다. 없으면 HEAD 로 확인한다.
+        size = error.response.get("Error", {}).get("ActualObjectSize")
+        if size is not None:
+            return int(size)
+        client = self.client_manager.get_client()
+        return client.head_object(Bucket=self.bucket, Key=self.path + object_name)["ContentLength"]
+
     def delete(self, object_name: str):
         try:
             client = self.client_manager.get_client()
@@ -69,6 +157,38 @@ class VideoRepository:
             print(f"Cannot get object list in '{self.path}' from S3.")
             return None
         
+    def case_prefix(self, case_id: int, env: str = None) -> str:
+        env = env or os.getenv("PHASE", "LOCAL")
+        return f"{env}/{case_id}/"
+
+    def session_prefix(self, case_id: int, session_id: int, env: str = None) -> str:
+        return f"{self.case_prefix(case_id, env)}{session_id}/"
+
+    def iter_objects(self, prefix: str = "", delimiter: str = None, page_size: int = None) -> Iterator[dict]:
+        # paginator 로 1000개 단위 page 를 이어받으며 object 를 하나씩 흘려준다. (prefix 는 video/ 기준)
+        # 목록이 중간에 끊긴 채로 정리 작업이 진행되지 않도록 실패는 예외로 올린다.
+        for page in self._paginate(prefix, delimiter, page_size):
+            yield from page.get("Contents", [])
+
+    def iter_prefixes(self, prefix: str = "", delimiter: str = "/", page_size: int = None) -> Iterator[str]:
+        # delimiter 아래 한 단계의 하위 prefix(case, session 등)를 video/ 기준 경로로 흘려준다.
+        for page in self._paginate(prefix, delimiter, page_size):
+            for common_prefix in page.get("CommonPrefixes", []):
+                yield common_prefix["Prefix"][len(self.path):]
+
+    def _paginate(self, prefix: str, delimiter: str = None, page_size: int = None):
+        kwargs = {"Bucket": self.bucket, "Prefix": self.path + prefix}
+        if delimiter:
+            kwargs["Delimiter"] = delimiter
+        if page_size:
+            kwargs["PaginationConfig"] = {"PageSize": page_size}
+        try:
+            client = self.client_manager.get_client()
+            yield from client.get_paginator("list_objects_v2").paginate(**kwargs)
+        except Exception as e:
+            print(f"Cannot get object list in '{self.path + prefix}' from S3.")
+            raise
+
     def get_presigned_url(self, file_path: str):
         try:
             client = self.client_manager.get_client()
@@ -85,4 +205,19 @@ class VideoRepository:
 
         except Exception as e:
             print(f"Cannot get pre-sigend url to upload {file_path}")
-            return None
\ No newline at end of file
+            return None
+
+    def get_presigned_download_url(self, object_name: str, expires_in: int = 300):
+        try:
+            client = self.client_manager.get_client()
+            return client.generate_presigned_url(
+                'get_object',
+                Params={
+                    'Bucket': self.bucket,
+                    'Key': self.path + object_name,
+                },
+                ExpiresIn=expires_in
+            )
+        except Exception as e:
+            print(f"Cannot get pre-signed url to download {object_name}")
+            return None
@@ -0,0 +1,136 @@
+import os
+import shutil
+import subprocess
+from typing import NamedTuple
+
+
+class EncodingProfile(NamedTuple):
+    fps: int = 24
+    codec: str = "libx264"
+    bitrate: str = "96k"
+    audio_codec: str = "aac"
+    audio_bitrate: str = "72k"
+    preset: str = "ultrafast"
+    threads: int = None  # None 이면 cpu 수 - 1
+
+    def thread_count(self) -> int:
+        return self.threads or os.cpu_count() - 1
+
+
+class VideoEncoder:
+    name = "base"
+
+    def __init__(self, profile: EncodingProfile = None):
+        self.profile = profile or EncodingProfile()
+
+    def encode(self, file_name: str, encoded_path: str) -> str:
+        raise NotImplementedError
+
+
+class MoviePyEncoder(VideoEncoder):
+    """moviepy 로 frame 을 decode 해서 다시 ffmpeg 으로 넘기는 기존 방식."""
+
+    name = "moviepy"
+
+    def encode(self, file_name: str, encoded_path: str) -> str:
+        # moviepy 는 import 가 느려서 이 module 을 불러오는 서버 기동 시간에 넣지 않고 실제로 쓸 때 불러온다.
+        from moviepy.editor import VideoFileClip
+
+        clip = VideoFileClip(file_name)
+        try:
+            clip.write_videofile(
+                encoded_path,
+                fps=self.profile.fps,
+                threads=self.profile.thread_count(),
+                codec=self.profile.codec,
+                bitrate=self.profile.bitrate,
+                audio_codec=self.profile.audio_codec,
+                logger=None,
+                audio_bitrate=self.profile.audio_bitrate,
+                preset=self.profile.preset,
+            )
+        finally:
+            clip.close()
+        return encoded_path
+
+
+class FFmpegEncoder(VideoEncoder):
+    """ffmpeg 프로세스가 파일을 직접 transcode 한다. frame 이 python 으로 올라오지 않는다."""
+
+    name = "ffmpeg"
+
+    def __init__(self, profile: EncodingProfile = None, ffmpeg_binary: str = "ffmpeg"):
+        super().__init__(profile)
+        self.ffmpeg_binary = ffmpeg_binary
+
+    def is_available(self) -> bool:
+        return shutil.which(self.ffmpeg_binary) is not None
+
+    def build_command(self, file_name: str, encoded_path: str) -> list:
+        return [
+            self.ffmpeg_binary, "-y", "-nostdin", "-loglevel", "error",
+            "-i", str(file_name),
+            *self._codec_args(),
+            "-movflags", "+faststart",
+            str(encoded_path),
+        ]
+
+    def build_stream_command(self) -> list:
+        # stdin 으로 원본을 받아 fragmented MP4 를 stdout 으로 쓴다.
+        # moov 를 맨 앞에 두고 fragment 단위로 출력하므로 seek 없이 앞에서부터 바로 업로드할 수 있다.
+        return [
+            self.ffmpeg_binary, "-y", "-loglevel", "error",
+            "-i", "pipe:0",
+            *self._codec_args(),
+            "-movflags", "frag_keyframe+empty_moov+default_base_moof",
+            "-f", "mp4", "pipe:1",
+        ]
+
+    def open_stream(self, stderr) -> subprocess.Popen:
+        return subprocess.Popen(
+            self.build_stream_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+        )
+
+    def _codec_args(self) -> list:
+        return [
+            "-r", str(self.profile.fps),
+            "-c:v", self.profile.codec,
+            "-b:v", self.profile.bitrate,
+            "-preset", self.profile.preset,
+            "-pix_fmt", "yuv420p",
+            "-threads", str(self.profile.thread_count()),
+            "-c:a", self.profile.audio_codec,
+            "-b:a", self.profile.audio_bitrate,
+        ]
+
+    def encode(self, file_name: str, encoded_path: str) -> str:
+        result = subprocess.run(
+            self.build_command(file_name, encoded_path),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        if result.returncode != 0:
+            message = result.stderr.decode("utf-8", errors="replace")[-1000:]
+            raise RuntimeError(f"ffmpeg exit code {result.returncode}: {message}")
+        return encoded_path
+
+
+def make_encoder(backend: str = "moviepy", profile: EncodingProfile = None, ffmpeg_binary: str = "ffmpeg") -> VideoEncoder:
+    # auto: ffmpeg 이 설치되어 있으면 ffmpeg, 없으면 moviepy
+    if backend in ("ffmpeg", "auto"):
+        encoder = FFmpegEncoder(profile, ffmpeg_binary=ffmpeg_binary)
+        if backend == "ffmpeg" or encoder.is_available():
+            return encoder
+    elif backend != "moviepy":
+        raise ValueError(f"Unknown encoder backend: '{backend}'")
+    return MoviePyEncoder(profile)
+
+
+def make_fallback_encoder(encoder: VideoEncoder, profile: EncodingProfile = None):
+    # 기본 encoder 가 이미 moviepy 이면 실패한 encode 를 같은 방식으로 다시 돌리지 않는다.
+    if isinstance(encoder, MoviePyEncoder):
+        return None
+    return MoviePyEncoder(profile)
@@ -1,11 +1,59 @@
 from object.repository.video import VideoRepository
-from moviepy.editor import VideoFileClip
+from object.service.encoder import VideoEncoder, MoviePyEncoder, FFmpegEncoder
 from object.exception import UploadFailed
 import os
+import tempfile
+import threading
+
+MIN_PART_SIZE = 5 * 1024 * 1024  # S3 multipart 의 마지막 part 를 제외한 최소 크기
+
+
+def is_streamable_head(head: bytes) -> bool:
+    """파일 앞부분만 보고 ffmpeg 이 pipe 로 읽으면서 decode 할 수 있는지 판단한다.
+
+    MP4/MOV 는 moov box 가 mdat 보다 앞에 있어야(faststart) 하고, 그 외 container 는 순차로 읽을 수 있다고 본다.
+    """
+    if len(head) < 8 or head[4:8] != b"ftyp":
+        return True
+    offset = 0
+    while offset + 8 <= len(head):
+        size = int.from_bytes(head[offset:offset + 4], "big")
+        box_type = head[offset + 4:offset + 8]
+        if box_type == b"moov":
+            return True
+        if box_type == b"mdat":
+            return False
+        if size == 1:
+            if offset + 16 > len(head):
+                return False
+            size = int.from_bytes(head[offset + 8:offset + 16], "big")
+        if size < 8:
+            return False
+        offset += size
+    # probe 범위 안에서 moov 를 찾지 못했다.
+    return False
+
 
 class VideoService:
-    def __init__(self, video_repository: VideoRepository):
+    def __init__(
+        self,
+        video_repository: VideoRepository,
+        encoder: VideoEncoder = None,
+        fallback_encoder: VideoEncoder = None,
+        pipeline: bool = False,
+        part_size: int = 8 * 1024 * 1024,
+        read_chunk_size: int = 1024 * 1024,
+        probe_size: int = 64 * 1024,
+    ):
         self.video_repository = video_repository
+        self.encoder = encoder or MoviePyEncoder()
+        # encoder 가 실패하면 한 번 더 시도할 backend (예: ffmpeg 실패 시 moviepy)
+        self.fallback_encoder = fallback_encoder
+        # pipeline: 다운로드 / 인코딩 / 업로드를 동시에 진행한다. (ffmpeg encoder 일 때만)
+        self.pipeline = pipeline
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.read_chunk_size = read_chunk_size
+        self.probe_size = probe_size
 
     def upload_origin_video(self, file_name: str, object_name: str):
         url_result = self.video_repository.upload(file_name, object_name)
@@ -16,19 +64,151 @@ class VideoService:
     def upload_encode_video(
         self, object_name: str, file_name: str, encoded_path: str
     ):
-        encoded_path = self.download_and_encode_video(
-            object_name, file_name, encoded_path
-        )
+        downloaded = False
+        if (self.pipeline and isinstance(self.encoder, FFmpegEncoder)
+                and self._is_streamable(object_name)):
+            url_result, downloaded = self.pipeline_encode_video(object_name, file_name)
+            if url_result:
+                return url_result
+            print(f"[ObjectService] pipeline failed, fall back to sequential encoding: '{object_name}'.")
 
-        encoded_video_url = object_name.split('/')
-        encoded_video_url[-1] = "encoded_"+encoded_video_url[-1]
+        if downloaded:
+            # 원본은 이미 받아두었으니 다시 다운로드하지 않는다.
+            encoded_path = self.encode_video(file_name, encoded_path)
+        else:
+            encoded_path = self.download_and_encode_video(
+                object_name, file_name, encoded_path
+            )
 
         url_result = self.video_repository.upload(
-            encoded_path, '/'.join(encoded_video_url)
+            encoded_path, self._encoded_object_name(object_name)
         )
         if not url_result:
             raise UploadFailed(encoded_path)
         return url_result
+
+    def pipeline_encode_video(self, object_name: str, file_name: str):
+        """원본을 받는 동안 ffmpeg 으로 encode 하고, 나오는 fragmented MP4 를 part 단위로 바로 업로드한다.
+
+        원본은 script 단계에서 쓰도록 file_name 에 저장하고, encode 결과는 디스크에 쓰지 않는다.
+        (업로드된 object 이름, 원본 다운로드 완료 여부) 를 반환하고 실패하면 object 이름은 None 이다.
+        """
+        encoded_object_name = self._encoded_object_name(object_name)
+        response = self.video_repository.get_object(object_name)
+        if not response:
+            return None, False
+        upload_id = self.video_repository.create_multipart_upload(encoded_object_name)
+        if not upload_id:
+            response["Body"].close()
+            return None, False
+
+        file_dir = os.path.dirname(file_name)
+        if file_dir and not os.path.exists(file_dir):
+            os.makedirs(file_dir, exist_ok=True)
+
+        with tempfile.TemporaryFile() as stderr:
+            process = self.encoder.open_stream(stderr)
+            feed_result = {}
+            feeder = threading.Thread(
+                target=self._feed_origin,
+                args=(response["Body"], file_name, process.stdin, feed_result),
+                daemon=True,
+            )
+            feeder.start()
+            try:
+                parts = []
+                while True:
+                    body = self._read_exactly(process.stdout, self.part_size)
+                    if not body:
+                        break
+                    part_number = len(parts) + 1
+                    etag = self.video_repository.upload_part(
+                        encoded_object_name, upload_id, part_number, body
+                    )
+                    if not etag:
+                        raise UploadFailed(encoded_object_name)
+                    parts.append({"PartNumber": part_number, "ETag": etag})
+
+                # 다운로드가 중간에 끊겨도 ffmpeg 은 정상 종료할 수 있으므로 feeder 결과를 먼저 확인한다.
+                feeder.join()
+                if "error" in feed_result:
+                    raise feed_result["error"]
+                if process.wait() != 0:
+                    stderr.seek(0)
+                    message = stderr.read().decode("utf-8", errors="replace")[-1000:]
+                    raise RuntimeError(f"ffmpeg exit code {process.returncode}: {message}")
+                if not parts:
+                    raise RuntimeError("ffmpeg produced no output")
+                if not self.video_repository.complete_multipart_upload(
+                    encoded_object_name, upload_id, parts
+                ):
+                    raise UploadFailed(encoded_object_name)
+                print(f"[ObjectService] end pipelined encoding: '{encoded_object_name}' ({len(parts)} parts).")
+                return encoded_object_name, True
+            except Exception as e:
+                print(f"Cannot encode video (pipeline): '{object_name}'. Error: {e}")
+                self.video_repository.abort_multipart_upload(encoded_object_name, upload_id)
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                # ffmpeg 이 죽어도 feeder 는 원본을 끝까지 저장하므로 sequential 로 이어서 처리할 수 있다.
+                feeder.join()
+                return None, feed_result.get("downloaded", False)
+            finally:
+                process.stdout.close()
+
+    def _is_streamable(self, object_name: str) -> bool:
+        # moov 가 끝에 있는 일반 업로드는 pipe 로 decode 할 수 없어서 다 받은 뒤에야 실패하므로,
+        # 앞부분만 range GET 으로 받아 확인하고 pipeline 을 쓸지 정한다.
+        response = self.video_repository.get_object(object_name, f"bytes=0-{self.probe_size - 1}")
+        if not response:
+            return False
+        try:
+            head = response["Body"].read()
+        finally:
+            response["Body"].close()
+        if not is_streamable_head(head):
+            print(f"[ObjectService] moov atom is not at the head, skip pipeline: '{object_name}'.")
+            return False
+        return True
+
+    def _feed_origin(self, body, file_name: str, stdin, result: dict):
+        encoder_open = True
+        try:
+            with open(file_name, "wb") as f:
+                for chunk in body.iter_chunks(self.read_chunk_size):
+                    f.write(chunk)
+                    if encoder_open:
+                        try:
+                            stdin.write(chunk)
+                        except OSError:
+                            encoder_open = False
+            result["downloaded"] = True
+        except Exception as e:
+            result["error"] = e
+        finally:
+            try:
+                stdin.close()
+            except OSError:
+                pass
+            body.close()
+
+    @staticmethod
+    def _read_exactly(stream, size: int) -> bytes:
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            data = stream.read(remaining)
+            if not data:
+                break
+            chunks.append(data)
+            remaining -= len(data)
+        return b"".join(chunks)
+
+    def _encoded_object_name(self, object_name: str) -> str:
+        encoded_video_url = object_name.split('/')
+        encoded_video_url[-1] = "encoded_"+encoded_video_url[-1]
+        return '/'.join(encoded_video_url)
     
         
     def download_and_encode_video(self, object_name: str, file_name: str, encoded_path: str):
@@ -41,6 +221,7 @@ class VideoService:
                 print(f"[ObjectService] start encoding: '{file_name}'.")
                 print(f"Encoding video: {object_name}")
                 encoded_path = self.encode_video(downloaded_file, encoded_path)
+                return encoded_path
             else:
                 print(f"[ObjectService] no download file: '{file_name}'.")
                 return None
@@ -49,25 +230,17 @@ class VideoService:
             return None
         
     def encode_video(self, file_name: str, encoded_path: str):
-        try:
-            file_dir = os.path.dirname(encoded_path)
-            if not os.path.exists(file_dir):
-                os.makedirs(file_dir, exist_ok=True)
-
-            clip = VideoFileClip(file_name)
-            clip.write_videofile(
-                encoded_path,
-                fps=24,
-                threads=os.cpu_count()-1,
-                codec="libx264",
-                bitrate="96k",
-                audio_codec="aac",
-                logger=None,
-                audio_bitrate="72k",
-                preset="ultrafast",
-            )
-            print(f"[ObjectService] end encoding: '{encoded_path}'.")
-            return encoded_path
-        except Exception as e:
-            print(f"Cannot encode video: '{file_name}'. Error: {e}")
-            return None
\ No newline at end of file
+        file_dir = os.path.dirname(encoded_path)
+        if file_dir and not os.path.exists(file_dir):
+            os.makedirs(file_dir, exist_ok=True)
+
+        for encoder in (self.encoder, self.fallback_encoder):
+            if encoder is None:
+                continue
+            try:
+                encoder.encode(file_name, encoded_path)
+                print(f"[ObjectService] end encoding ({encoder.name}): '{encoded_path}'.")
+                return encoded_path
+            except Exception as e:
+                print(f"Cannot encode video ({encoder.name}): '{file_name}'. Error: {e}")
+        return None
@@ -9,19 +9,65 @@ logging.getLogger("s3transfer").setLevel(logging.CRITICAL)
 logging.getLogger("urllib3").setLevel(logging.CRITICAL)
 
 from abc import ABC
+import threading
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+MB = 1024 * 1024
 
 
 class ClientManager(ABC):
     def __init__(
-        self, aws_access_key_id: str, aws_secret_access_key: str, region_name: str
+        self,
+        aws_access_key_id: str,
+        aws_secret_access_key: str,
+        region_name: str,
+        multipart_threshold: int = 8 * MB,
+        multipart_chunksize: int = 8 * MB,
+        max_concurrency: int = 10,
+        max_pool_connections: int = 10,
+        max_attempts: int = 3,
+        retry_mode: str = "standard",
+        per_thread_client: bool = False,
     ):
-        self.client = boto3.client(
+        self.aws_access_key_id = aws_access_key_id
+        self.aws_secret_access_key = aws_secret_access_key
+        self.region_name = region_name
+        # transfer 동시성만큼 connection 이 필요하므로 pool 은 max_concurrency 이상으로 잡는다.
+        self.client_config = Config(
+            max_pool_connections=max(max_pool_connections, max_concurrency),
+            retries={"max_attempts": max_attempts, "mode": retry_mode},
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=max_concurrency,
+        )
+        self.per_thread_client = per_thread_client
+        self._local = threading.local()
+        self.client = self._create_client()
+
+    def _create_client(self):
+        # session 은 thread-safe 하지 않으므로 client 마다 새 session 을 만든다.
+        session = boto3.session.Session()
+        return session.client(
             "s3",
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            region_name=region_name,
+            aws_access_key_id=self.aws_access_key_id,
+            aws_secret_access_key=self.aws_secret_access_key,
+            region_name=self.region_name,
+            config=self.client_config,
         )
 
     def get_client(self):
-        return self.client
+        if not self.per_thread_client:
+            return self.client
+        # scheduler worker thread 별로 client 와 connection pool 을 따로 쓴다.
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._create_client()
+            self._local.client = client
+        return client
+
+    def get_transfer_config(self) -> TransferConfig:
+        return self.transfer_config
@@ -0,0 +1,40 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+from object.repository.video import VideoRepository
+from object.repository.async_video import AsyncVideoRepository
+
+
+class TestAsyncVideoRepository(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.video_repo = MagicMock(spec=VideoRepository)
+        self.async_video_repo = AsyncVideoRepository(self.video_repo, max_workers=2)
+
+    def tearDown(self):
+        self.async_video_repo.shutdown()
+
+    async def test_get_object(self):
+        caller_threads = []
+        self.video_repo.get_object.side_effect = lambda *args: (
+            caller_threads.append(threading.current_thread()) or {"Body": "body"}
+        )
+        result = await self.async_video_repo.get_object("object_name", "bytes=0-1")
+
+        self.video_repo.get_object.assert_called_once_with("object_name", "bytes=0-1")
+        self.assertEqual(result, {"Body": "body"})
+        self.assertIsNot(caller_threads[0], threading.current_thread())
+
+    async def test_upload_part(self):
+        self.video_repo.upload_part.return_value = "etag"
+        result = await self.async_video_repo.upload_part("object_name", "upload_id", 1, b"data")
+        self.video_repo.upload_part.assert_called_once_with(
+            "object_name", "upload_id", 1, b"data"
+        )
+        self.assertEqual(result, "etag")
+
+    async def test_get_presigned_download_url(self):
+        self.video_repo.get_presigned_download_url.return_value = "https://presigned"
+        result = await self.async_video_repo.get_presigned_download_url("object_name", 60)
+        self.video_repo.get_presigned_download_url.assert_called_once_with("object_name", 60)
+        self.assertEqual(result, "https://presigned")
@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import MagicMock, patch
 from boto3 import client
+from botocore.exceptions import ClientError
+from object.exception import RangeNotSatisfiable
 from object.storage.client import ClientManager
 from object.repository.video import VideoRepository
 
@@ -18,7 +20,10 @@ class TestVideoRepository(unittest.TestCase):
         self.client_manager.get_client.return_value = s3_client
         result = self.video_repo.upload(file_name, object_name)
         s3_client.upload_file.assert_called_once_with(
-            file_name, "bucket", "video/object_name"
+            file_name,
+            "bucket",
+            "video/object_name",
+            Config=self.client_manager.get_transfer_config.return_value,
         )
         self.assertEqual(result, object_name)
 
@@ -30,10 +35,59 @@ class TestVideoRepository(unittest.TestCase):
         self.client_manager.get_client.return_value = s3_client
         result = self.video_repo.upload(file_name, object_name)
         s3_client.upload_file.assert_called_once_with(
-            file_name, "bucket", "video/object_name"
+            file_name,
+            "bucket",
+            "video/object_name",
+            Config=self.client_manager.get_transfer_config.return_value,
         )
         self.assertIsNone(result)
 
+    def test_multipart_upload(self):
+        object_name = "object_name"
+        s3_client = MagicMock(spec=client("s3"))
+        s3_client.create_multipart_upload.return_value = {"UploadId": "upload_id"}
+        s3_client.upload_part.return_value = {"ETag": "etag"}
+        self.client_manager.get_client.return_value = s3_client
+
+        upload_id = self.video_repo.create_multipart_upload(object_name)
+        etag = self.video_repo.upload_part(object_name, upload_id, 1, b"data")
+        parts = [{"PartNumber": 1, "ETag": etag}]
+        result = self.video_repo.complete_multipart_upload(object_name, upload_id, parts)
+
+        s3_client.create_multipart_upload.assert_called_once_with(
+            Bucket="bucket", Key="video/object_name"
+        )
+        s3_client.upload_part.assert_called_once_with(
+            Bucket="bucket",
+            Key="video/object_name",
+            UploadId="upload_id",
+            PartNumber=1,
+            Body=b"data",
+        )
+        s3_client.complete_multipart_upload.assert_called_once_with(
+            Bucket="bucket",
+            Key="video/object_name",
+            UploadId="upload_id",
+            MultipartUpload={"Parts": [{"PartNumber": 1, "ETag": "etag"}]},
+        )
+        self.assertEqual(result, object_name)
+
+    def test_upload_part_exception(self):
+        s3_client = MagicMock(spec=client("s3"))
+        s3_client.upload_part.side_effect = Exception
+        self.client_manager.get_client.return_value = s3_client
+        result = self.video_repo.upload_part("object_name", "upload_id", 1, b"data")
+        self.assertIsNone(result)
+
+    def test_abort_multipart_upload(self):
+        s3_client = MagicMock(spec=client("s3"))
+        self.client_manager.get_client.return_value = s3_client
+        result = self.video_repo.abort_multipart_upload("object_name", "upload_id")
+        s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="bucket", Key="video/object_name", UploadId="upload_id"
+        )
+        self.assertEqual(result, "object_name")
+
     def test_download(self):
         object_name = "object_name"
         file_name = "file_name"
@@ -46,7 +100,10 @@ class TestVideoRepository(unittest.TestCase):
             result = self.video_repo.download(object_name, file_name)
 
             s3_client.download_file.assert_called_once_with(
-                "bucket", "video/object_name", file_name
+                "bucket",
+                "video/object_name",
+                file_name,
+                Config=self.client_manager.get_transfer_config.return_value,
             )
             self.assertEqual(result, file_name)
             mock_makedirs.assert_called_once_with("dir_name", exist_ok=True)
@@ -65,11 +122,65 @@ class TestVideoRepository(unittest.TestCase):
             result = self.video_repo.download(object_name, file_name)
 
             s3_client.download_file.assert_called_once_with(
-                "bucket", "video/object_name", file_name
+                "bucket",
+                "video/object_name",
+                file_name,
+                Config=self.client_manager.get_transfer_config.return_value,
             )
             mock_makedirs.assert_called_once_with("dir_name", exist_ok=True)
             self.assertIsNone(result)
 
+    def test_get_object(self):
+        object_name = "object_name"
+        s3_client = MagicMock(spec=client("s3"))
+        self.client_manager.get_client.return_value = s3_client
+        result = self.video_repo.get_object(object_name)
+        s3_client.get_object.assert_called_once_with(
+            Bucket="bucket", Key="video/object_name"
+        )
+        self.assertEqual(result, s3_client.get_object.return_value)
+
+    def test_get_object_range(self):
+        object_name = "object_name"
+        s3_client = MagicMock(spec=client("s3"))
+        self.client_manager.get_client.return_value = s3_client
+        result = self.video_repo.get_object(object_name, byte_range="bytes=0-1023")
+        s3_client.get_object.assert_called_once_with(
+            Bucket="bucket", Key="video/object_name", Range="bytes=0-1023"
+        )
+        self.assertEqual(result, s3_client.get_object.return_value)
+
+    def test_get_object_exception(self):
+        object_name = "object_name"
+        s3_client = MagicMock(spec=client("s3"))
+        s3_client.get_object.side_effect = Exception
+        self.client_manager.get_client.return_value = s3_client
+        result = self.video_repo.get_object(object_name, byte_range="bytes=0-1023")
+        self.assertIsNone(result)
+
+    def test_get_object_invalid_range(self):
+        s3_client = MagicMock(spec=client("s3"))
+        s3_client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "InvalidRange", "ActualObjectSize": "1024"}}, "GetObject"
+        )
+        self.client_manager.get_client.return_value = s3_client
+        with self.assertRaises(RangeNotSatisfiable) as context:
+            self.video_repo.get_object("object_name", byte_range="bytes=2048-4095")
+        self.assertEqual(context.exception.object_size, 1024)
+        self.assertEqual(context.exception.status_code, 416)
+
+    def test_get_object_invalid_range_without_size(self):
+        s3_client = MagicMock(spec=client("s3"))
+        s3_client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "InvalidRange"}}, "GetObject"
+        )
+        s3_client.head_object.return_value = {"ContentLength": 512}
+        self.client_manager.get_client.return_value = s3_client
+        with self.assertRaises(RangeNotSatisfiable) as context:
+            self.video_repo.get_object("object_name", byte_range="bytes=2048-4095")
+        s3_client.head_object.assert_called_once_with(Bucket="bucket", Key="video/object_name")
+        self.assertEqual(context.exception.object_size, 512)
+
     def test_delete(self):
         object_name = "object_name"
         s3_client = MagicMock(spec=client("s3"))
@@ -104,3 +215,65 @@ class TestVideoRepository(unittest.TestCase):
         self.client_manager.get_client.return_value = s3_client
         result = self.video_repo.get_object_list()
         self.assertIsNone(result)
+
+    def test_iter_objects(self):
+        s3_client = MagicMock(spec=client("s3"))
+        self.client_manager.get_client.return_value = s3_client
+        paginator = s3_client.get_paginator.return_value
+        paginator.paginate.return_value = iter([
+            {"Contents": [{"Key": "video/LOCAL/1/1/a.mp4"}, {"Key": "video/LOCAL/1/1/b.mp4"}]},
+            {"Contents": [{"Key": "video/LOCAL/1/2/c.mp4"}]},
+            {"KeyCount": 0},
+        ])
+        result = list(self.video_repo.iter_objects("LOCAL/1/", page_size=2))
+        s3_client.get_paginator.assert_called_once_with("list_objects_v2")
+        paginator.paginate.assert_called_once_with(
+            Bucket="bucket", Prefix="video/LOCAL/1/", PaginationConfig={"PageSize": 2}
+        )
+        self.assertEqual(
+            [obj["Key"] for obj in result],
+            ["video/LOCAL/1/1/a.mp4", "video/LOCAL/1/1/b.mp4", "video/LOCAL/1/2/c.mp4"],
+        )
+
+    def test_iter_objects_exception(self):
+        s3_client = MagicMock(spec=client("s3"))
+        s3_client.get_paginator.return_value.paginate.side_effect = Exception
+        self.client_manager.get_client.return_value = s3_client
+        with self.assertRaises(Exception):
+            list(self.video_repo.iter_objects("LOCAL/1/"))
+
+    def test_iter_prefixes(self):
+        s3_client = MagicMock(spec=client("s3"))
+        self.client_manager.get_client.return_value = s3_client
+        paginator = s3_client.get_paginator.return_value
+        paginator.paginate.return_value = iter([
+            {"CommonPrefixes": [{"Prefix": "video/LOCAL/1/1/"}]},
+            {"CommonPrefixes": [{"Prefix": "video/LOCAL/1/2/"}]},
+        ])
+        result = list(self.video_repo.iter_prefixes(self.video_repo.case_prefix(1, env="LOCAL")))
+        paginator.paginate.assert_called_once_with(
+            Bucket="bucket", Prefix="video/LOCAL/1/", Delimiter="/"
+        )
+        self.assertEqual(result, ["LOCAL/1/1/", "LOCAL/1/2/"])
+
+    def test_session_prefix(self):
+        self.assertEqual(self.video_repo.session_prefix(1, 2, env="LOCAL"), "LOCAL/1/2/")
+
+    def test_get_presigned_download_url(self):
+        s3_client = MagicMock(spec=client("s3"))
+        s3_client.generate_presigned_url.return_value = "https://presigned"
+        self.client_manager.get_client.return_value = s3_client
+        result = self.video_repo.get_presigned_download_url("object_name", expires_in=60)
+        s3_client.generate_presigned_url.assert_called_once_with(
+            "get_object",
+            Params={"Bucket": "bucket", "Key": "video/object_name"},
+            ExpiresIn=60,
+        )
+        self.assertEqual(result, "https://presigned")
+
+    def test_get_presigned_download_url_exception(self):
+        s3_client = MagicMock(spec=client("s3"))
+        s3_client.generate_presigned_url.side_effect = Exception
+        self.client_manager.get_client.return_value = s3_client
+        result = self.video_repo.get_presigned_download_url("object_name")
+        self.assertIsNone(result)
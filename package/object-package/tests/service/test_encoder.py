@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from object.service.encoder import (
+    EncodingProfile,
+    FFmpegEncoder,
+    MoviePyEncoder,
+    make_encoder,
+    make_fallback_encoder,
+)
+
+
+class TestEncoder(unittest.TestCase):
+
+    def setUp(self):
+        self.profile = EncodingProfile(fps=30, bitrate="500k", preset="veryfast", threads=2)
+
+    def test_ffmpeg_build_command(self):
+        encoder = FFmpegEncoder(self.profile)
+        command = encoder.build_command("in.mp4", "out.mp4")
+        self.assertEqual(command[0], "ffmpeg")
+        self.assertEqual(command[command.index("-i") + 1], "in.mp4")
+        self.assertEqual(command[command.index("-r") + 1], "30")
+        self.assertEqual(command[command.index("-b:v") + 1], "500k")
+        self.assertEqual(command[command.index("-preset") + 1], "veryfast")
+        self.assertEqual(command[command.index("-threads") + 1], "2")
+        self.assertEqual(command[-1], "out.mp4")
+
+    @patch("object.service.encoder.subprocess.run")
+    def test_ffmpeg_encode(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stderr=b"")
+        result = FFmpegEncoder(self.profile).encode("in.mp4", "out.mp4")
+        mock_run.assert_called_once()
+        self.assertEqual(result, "out.mp4")
+
+    @patch("object.service.encoder.subprocess.run")
+    def test_ffmpeg_encode_exception(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=1, stderr=b"invalid data")
+        with self.assertRaises(RuntimeError):
+            FFmpegEncoder(self.profile).encode("in.mp4", "out.mp4")
+
+    @patch("moviepy.editor.VideoFileClip")
+    def test_moviepy_encode(self, mock_video_clip):
+        result = MoviePyEncoder(self.profile).encode("in.mp4", "out.mp4")
+        mock_clip = mock_video_clip.return_value
+        mock_clip.write_videofile.assert_called_once_with(
+            "out.mp4",
+            fps=30,
+            threads=2,
+            codec="libx264",
+            bitrate="500k",
+            audio_codec="aac",
+            logger=None,
+            audio_bitrate="72k",
+            preset="veryfast",
+        )
+        mock_clip.close.assert_called_once()
+        self.assertEqual(result, "out.mp4")
+
+    @patch("object.service.encoder.shutil.which", return_value=None)
+    def test_make_encoder(self, mock_which):
+        self.assertIsInstance(make_encoder("ffmpeg"), FFmpegEncoder)
+        self.assertIsInstance(make_encoder("moviepy"), MoviePyEncoder)
+        self.assertIsInstance(make_encoder("auto"), MoviePyEncoder)
+        with self.assertRaises(ValueError):
+            make_encoder("unknown")
+
+    def test_make_fallback_encoder(self):
+        fallback = make_fallback_encoder(FFmpegEncoder(self.profile), self.profile)
+        self.assertIsInstance(fallback, MoviePyEncoder)
+        self.assertEqual(fallback.profile, self.profile)
+        self.assertIsNone(make_fallback_encoder(MoviePyEncoder(self.profile), self.profile))
+
+
+if __name__ == "__main__":
+    unittest.main()
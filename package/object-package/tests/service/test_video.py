@@ -1,9 +1,20 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from object.repository.video import VideoRepository
-from object.service.video import VideoService
+from object.service.video import VideoService, is_streamable_head
+from object.service.encoder import VideoEncoder, FFmpegEncoder
 from moviepy.editor import VideoFileClip
+import io
 import os
+import tempfile
+
+
+def mp4_box(box_type: bytes, payload: bytes = b"") -> bytes:
+    return (8 + len(payload)).to_bytes(4, "big") + box_type + payload
+
+
+FASTSTART_HEAD = mp4_box(b"ftyp", b"isom") + mp4_box(b"moov", b"\0" * 8) + mp4_box(b"mdat", b"\0" * 8)
+MOOV_AT_END_HEAD = mp4_box(b"ftyp", b"isom") + mp4_box(b"free") + mp4_box(b"mdat", b"\0" * 8)
 
 
 class TestVideoService(unittest.TestCase):
@@ -12,10 +23,22 @@ class TestVideoService(unittest.TestCase):
         self.video_repo = MagicMock(spec=VideoRepository)
         self.video_service = VideoService(self.video_repo)
     
-    def test_encode_video(self, video_file, encoded_path):
-        self.video_service.encode_video(video_file, encoded_path)
+    def test_encode_video_fallback(self):
+        encoder = MagicMock(spec=VideoEncoder)
+        encoder.name = "ffmpeg"
+        encoder.encode.side_effect = Exception
+        fallback_encoder = MagicMock(spec=VideoEncoder)
+        fallback_encoder.name = "moviepy"
+        video_service = VideoService(self.video_repo, encoder, fallback_encoder)
+
+        with patch("os.path.exists", return_value=True):
+            result = video_service.encode_video("video_file", "dir_name/encoded_path")
 
-    @patch("object.service.video.VideoFileClip")
+        encoder.encode.assert_called_once_with("video_file", "dir_name/encoded_path")
+        fallback_encoder.encode.assert_called_once_with("video_file", "dir_name/encoded_path")
+        self.assertEqual(result, "dir_name/encoded_path")
+
+    @patch("moviepy.editor.VideoFileClip")
     def test_download_and_encode_video(self, mock_video_clip):
         object_name = "object_name"
         file_name = "file_name"
@@ -48,7 +71,7 @@ class TestVideoService(unittest.TestCase):
             )
             self.assertEqual(result, encoded_path)
 
-    @patch("object.service.video.VideoFileClip")
+    @patch("moviepy.editor.VideoFileClip")
     def test_download_and_encode_video_exception(self, mock_video_clip):
         object_name = "object_name"
         file_name = "file_name"
@@ -81,3 +104,98 @@ class TestVideoService(unittest.TestCase):
                 preset="ultrafast",
             )
             self.assertIsNone(result)
+
+    def _make_pipeline_service(self, returncode, output):
+        encoder = MagicMock(spec=FFmpegEncoder)
+        encoder.name = "ffmpeg"
+        process = MagicMock()
+        process.stdin = io.BytesIO()
+        process.stdin.close = MagicMock()
+        process.stdout = io.BytesIO(output)
+        process.wait.return_value = returncode
+        process.returncode = returncode
+        process.poll.return_value = returncode
+        encoder.open_stream.return_value = process
+
+        body = MagicMock()
+        body.iter_chunks.return_value = iter([b"origin-", b"video"])
+        self.video_repo.get_object.side_effect = [
+            {"Body": io.BytesIO(FASTSTART_HEAD)},
+            {"Body": body},
+        ]
+        self.video_repo.create_multipart_upload.return_value = "upload_id"
+        self.video_repo.upload_part.return_value = "etag"
+        self.video_repo.complete_multipart_upload.return_value = "dir/encoded_video.mp4"
+        return VideoService(self.video_repo, encoder, pipeline=True), process
+
+    def test_upload_encode_video_pipeline(self):
+        video_service, process = self._make_pipeline_service(0, b"encoded")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_name = os.path.join(temp_dir, "origin.mp4")
+            result = video_service.upload_encode_video("dir/video.mp4", file_name, "encoded_path")
+            with open(file_name, "rb") as f:
+                self.assertEqual(f.read(), b"origin-video")
+
+        self.assertEqual(process.stdin.getvalue(), b"origin-video")
+        self.video_repo.upload_part.assert_called_once_with(
+            "dir/encoded_video.mp4", "upload_id", 1, b"encoded"
+        )
+        self.video_repo.complete_multipart_upload.assert_called_once_with(
+            "dir/encoded_video.mp4", "upload_id", [{"PartNumber": 1, "ETag": "etag"}]
+        )
+        self.video_repo.download.assert_not_called()
+        self.assertEqual(result, "dir/encoded_video.mp4")
+
+    def test_upload_encode_video_pipeline_fallback(self):
+        video_service, _ = self._make_pipeline_service(1, b"")
+        self.video_repo.upload.return_value = "dir/encoded_video.mp4"
+        with tempfile.TemporaryDirectory() as temp_dir, patch.object(
+            video_service, "encode_video", return_value="encoded_path"
+        ) as mock_encode_video:
+            file_name = os.path.join(temp_dir, "origin.mp4")
+            result = video_service.upload_encode_video("dir/video.mp4", file_name, "encoded_path")
+
+        self.video_repo.abort_multipart_upload.assert_called_once_with(
+            "dir/encoded_video.mp4", "upload_id"
+        )
+        # 원본은 pipeline 에서 이미 받았으므로 다시 다운로드하지 않는다.
+        self.video_repo.download.assert_not_called()
+        mock_encode_video.assert_called_once_with(file_name, "encoded_path")
+        self.video_repo.upload.assert_called_once_with("encoded_path", "dir/encoded_video.mp4")
+        self.assertEqual(result, "dir/encoded_video.mp4")
+
+    def test_upload_encode_video_pipeline_skips_moov_at_end(self):
+        video_service, process = self._make_pipeline_service(0, b"encoded")
+        self.video_repo.get_object.side_effect = [{"Body": io.BytesIO(MOOV_AT_END_HEAD)}]
+        self.video_repo.upload.return_value = "dir/encoded_video.mp4"
+        with patch.object(
+            video_service, "download_and_encode_video", return_value="encoded_path"
+        ) as mock_download_and_encode:
+            result = video_service.upload_encode_video("dir/video.mp4", "origin.mp4", "encoded_path")
+
+        # 앞부분만 range GET 으로 확인하고 pipeline 없이 sequential 로 처리한다.
+        self.video_repo.get_object.assert_called_once_with("dir/video.mp4", "bytes=0-65535")
+        video_service.encoder.open_stream.assert_not_called()
+        self.video_repo.create_multipart_upload.assert_not_called()
+        mock_download_and_encode.assert_called_once_with("dir/video.mp4", "origin.mp4", "encoded_path")
+        self.assertEqual(result, "dir/encoded_video.mp4")
+
+    def test_is_streamable_head(self):
+        self.assertTrue(is_streamable_head(FASTSTART_HEAD))
+        self.assertFalse(is_streamable_head(MOOV_AT_END_HEAD))
+        # probe 범위 안에서 moov 를 찾지 못하면 pipeline 을 쓰지 않는다.
+        self.assertFalse(is_streamable_head(mp4_box(b"ftyp", b"isom") + (1024).to_bytes(4, "big") + b"free"))
+        # MP4 가 아닌 container 는 순차로 읽을 수 있다고 본다.
+        self.assertTrue(is_streamable_head(b"\x1a\x45\xdf\xa3" + b"\0" * 16))
+
+    def test_encode_video_without_directory(self):
+        encoder = MagicMock(spec=VideoEncoder)
+        encoder.name = "ffmpeg"
+        video_service = VideoService(self.video_repo, encoder)
+
+        with patch("os.makedirs") as mock_makedirs:
+            result = video_service.encode_video("video_file", "encoded.mp4")
+
+        mock_makedirs.assert_not_called()
+        encoder.encode.assert_called_once_with("video_file", "encoded.mp4")
+        self.assertEqual(result, "encoded.mp4")
@@ -0,0 +1,73 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from object.storage.client import ClientManager
+
+
+def make_client_manager(**kwargs) -> ClientManager:
+    return ClientManager(
+        aws_access_key_id="access-key",
+        aws_secret_access_key="secret-key",
+        region_name="ap-northeast-2",
+        **kwargs,
+    )
+
+
+@patch("object.storage.client.boto3.session.Session")
+class TestClientManager(unittest.TestCase):
+
+    def test_shared_client(self, session):
+        session.side_effect = lambda: MagicMock()
+        client_manager = make_client_manager()
+
+        clients = set()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for client in executor.map(lambda _: client_manager.get_client(), range(20)):
+                clients.add(id(client))
+
+        self.assertEqual(clients, {id(client_manager.client)})
+        self.assertEqual(session.call_count, 1)
+
+    def test_per_thread_client_is_reused_by_thread(self, session):
+        session.side_effect = lambda: MagicMock()
+        client_manager = make_client_manager(per_thread_client=True)
+        barrier = threading.Barrier(3, timeout=5)
+
+        def get_clients(_):
+            # 세 thread 가 모두 한 번씩 가져가도록 맞춘다.
+            barrier.wait()
+            return threading.get_ident(), client_manager.get_client(), client_manager.get_client()
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(get_clients, range(3)))
+            # 같은 thread 를 다시 쓰면 client 도 다시 만들지 않는다.
+            results += list(executor.map(get_clients, range(3)))
+
+        clients_by_thread = {}
+        for thread_id, first, second in results:
+            self.assertIs(first, second)
+            clients_by_thread.setdefault(thread_id, set()).add(id(first))
+        self.assertEqual(len(clients_by_thread), 3)
+        self.assertTrue(all(len(clients) == 1 for clients in clients_by_thread.values()))
+        # 생성자에서 만든 공용 client 1개 + thread 별 3개
+        self.assertEqual(session.call_count, 4)
+
+    def test_client_config(self, session):
+        client_manager = make_client_manager(max_concurrency=20, max_pool_connections=10, max_attempts=5)
+
+        self.assertEqual(client_manager.client_config.max_pool_connections, 20)
+        self.assertEqual(client_manager.client_config.retries, {"max_attempts": 5, "mode": "standard"})
+        self.assertEqual(client_manager.get_transfer_config().max_request_concurrency, 20)
+        session.return_value.client.assert_called_once_with(
+            "s3",
+            aws_access_key_id="access-key",
+            aws_secret_access_key="secret-key",
+            region_name="ap-northeast-2",
+            config=client_manager.client_config,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
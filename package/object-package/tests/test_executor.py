@@ -0,0 +1,28 @@
+import threading
+import unittest
+
+from object.executor import BoundedExecutor
+
+
+class TestBoundedExecutor(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.executor = BoundedExecutor(max_workers=2, thread_name_prefix="test-executor")
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    async def test_run_in_worker_thread(self):
+        result = await self.executor.run(
+            lambda value, suffix="": (threading.current_thread().name, value + suffix), "a", suffix="b"
+        )
+        thread_name, value = result
+        self.assertTrue(thread_name.startswith("test-executor"))
+        self.assertEqual(value, "ab")
+
+    async def test_propagates_exception(self):
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            await self.executor.run(fail)